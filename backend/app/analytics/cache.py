@@ -0,0 +1,61 @@
+"""
+In-process cache for analytics results
+
+Results are keyed by the user's data version, so stale entries are never
+served: any change to the user's data produces a new key and old entries
+simply age out of the LRU.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable
+
+from app.utils.telemetry import analytics_cache_requests_total
+
+
+class AnalyticsCache:
+    """Thread-safe LRU cache"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, computing and storing it on a miss
+
+        Args:
+            key: Hashable cache key (should include the data version)
+            compute: Zero-argument function producing the value
+
+        Returns:
+            Cached or freshly computed value
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                analytics_cache_requests_total.inc("hit")
+                return self._entries[key]
+
+        analytics_cache_requests_total.inc("miss")
+        value = compute()
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return value
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+analytics_cache = AnalyticsCache()
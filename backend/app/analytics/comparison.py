@@ -0,0 +1,53 @@
+"""
+Period-over-period comparison ("this month vs last month")
+
+Compares two blocks of rows of the day × metric matrix for every metric
+at once: means, delta, Cohen's d and Welch's t-test p-value.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.analytics.effect_size import nan_moments, cohens_d, welch_t_test
+
+
+@dataclass
+class PeriodComparison:
+    """Column-wise comparison of two periods (one array element per metric)"""
+    current_count: np.ndarray
+    current_mean: np.ndarray
+    previous_count: np.ndarray
+    previous_mean: np.ndarray
+    delta: np.ndarray
+    effect_size: np.ndarray
+    t_statistic: np.ndarray
+    p_value: np.ndarray
+
+
+def compare_periods(current: np.ndarray, previous: np.ndarray) -> PeriodComparison:
+    """
+    Compare two periods for all metrics in one pass
+
+    Args:
+        current: Rows of the current period, shape (n_current_days, n_metrics)
+        previous: Rows of the previous period, shape (n_previous_days, n_metrics)
+
+    Returns:
+        PeriodComparison with one entry per metric column
+    """
+    n1, mean1, var1 = nan_moments(current, axis=0)
+    n2, mean2, var2 = nan_moments(previous, axis=0)
+
+    t, _, p_value = welch_t_test(n1, mean1, var1, n2, mean2, var2)
+
+    return PeriodComparison(
+        current_count=n1,
+        current_mean=mean1,
+        previous_count=n2,
+        previous_mean=mean2,
+        delta=mean1 - mean2,
+        effect_size=cohens_d(n1, mean1, var1, n2, mean2, var2),
+        t_statistic=t,
+        p_value=p_value
+    )
@@ -11,6 +11,8 @@ import numpy as np
 from scipy import stats
 from dataclasses import dataclass
 
+from app.analytics.profiling import Trace
+
 
 @dataclass
 class CorrelationResult:
@@ -32,16 +34,25 @@ class CorrelationResult:
 class CorrelationEngine:
     """Correlation analysis engine"""
 
-    def __init__(self, min_significance: float = 0.05, min_sample_size: int = 7):
+    def __init__(
+        self,
+        min_significance: float = 0.05,
+        min_sample_size: int = 7,
+        trace: Optional[Trace] = None
+    ):
         """
         Initialize correlation engine
 
         Args:
             min_significance: P-value threshold for significance (default 0.05)
             min_sample_size: Minimum number of data points required (default 7)
+            trace: Trace receiving compute (coefficient and p-value, which
+                scipy computes together) and rank spans, and
+                pairs_evaluated/lags_tested/pairs_skipped counters
         """
         self.min_significance = min_significance
         self.min_sample_size = min_sample_size
+        self.trace = trace if trace is not None else Trace()
 
     def calculate_correlation(
         self,
@@ -74,14 +85,16 @@ class CorrelationEngine:
         if len(x_clean) < self.min_sample_size:
             raise ValueError(f"Insufficient valid data points after cleaning (min {self.min_sample_size} required)")
 
-        if algorithm == 'pearson':
-            coefficient, p_value = stats.pearsonr(x_clean, y_clean)
-        elif algorithm == 'spearman':
-            coefficient, p_value = stats.spearmanr(x_clean, y_clean)
-        elif algorithm == 'kendall':
-            coefficient, p_value = stats.kendalltau(x_clean, y_clean)
-        else:
-            raise ValueError(f"Unknown algorithm: {algorithm}")
+        self.trace.count('lags_tested')
+        with self.trace.span('compute'):
+            if algorithm == 'pearson':
+                coefficient, p_value = stats.pearsonr(x_clean, y_clean)
+            elif algorithm == 'spearman':
+                coefficient, p_value = stats.spearmanr(x_clean, y_clean)
+            elif algorithm == 'kendall':
+                coefficient, p_value = stats.kendalltau(x_clean, y_clean)
+            else:
+                raise ValueError(f"Unknown algorithm: {algorithm}")
 
         return float(coefficient), float(p_value)
 
@@ -107,16 +120,18 @@ class CorrelationEngine:
         best_correlation = 0.0
         best_p_value = 1.0
         best_lag = 0
+        tested = 0
 
         # Test lag 0 (no delay)
         try:
             coef, p_val = self.calculate_correlation(x, y, algorithm)
+            tested += 1
             if abs(coef) > abs(best_correlation):
                 best_correlation = coef
                 best_p_value = p_val
                 best_lag = 0
         except ValueError:
-            pass
+            self.trace.count('lags_skipped')
 
         # Test positive lags (x predicts future y)
         for lag in range(1, max_lag + 1):
@@ -129,13 +144,19 @@ class CorrelationEngine:
 
             try:
                 coef, p_val = self.calculate_correlation(x_lagged, y_lagged, algorithm)
+                tested += 1
                 if abs(coef) > abs(best_correlation):
                     best_correlation = coef
                     best_p_value = p_val
                     best_lag = lag
             except ValueError:
+                self.trace.count('lags_skipped')
                 continue
 
+        # Not enough overlapping samples at any lag
+        if tested == 0:
+            self.trace.count('pairs_skipped')
+
         return best_correlation, best_p_value, best_lag
 
     def classify_strength(self, coefficient: float) -> str:
@@ -251,6 +272,7 @@ class CorrelationEngine:
         # Analyze all unique pairs
         for i, id1 in enumerate(metric_ids):
             for id2 in metric_ids[i + 1:]:
+                self.trace.count('pairs_evaluated')
                 result = self.analyze_metric_pair(
                     metric_1_id=id1,
                     metric_1_name=metrics_data[id1]['name'],
@@ -268,7 +290,8 @@ class CorrelationEngine:
                     results.append(result)
 
         # Sort by absolute coefficient (strongest first)
-        results.sort(key=lambda r: abs(r.coefficient), reverse=True)
+        with self.trace.span('rank'):
+            results.sort(key=lambda r: abs(r.coefficient), reverse=True)
 
         return results
 
@@ -0,0 +1,58 @@
+"""
+Largest-Triangle-Three-Buckets (LTTB) downsampling
+
+Reduces a time series to a fixed number of points while preserving its
+visual shape (Steinarsson, 2013). The first and last points are always
+kept; every bucket in between contributes the point forming the largest
+triangle with the previously selected point and the next bucket's mean.
+"""
+
+import numpy as np
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Select the indices of the points to keep
+
+    Args:
+        x: Monotonically increasing x values (e.g. day ordinals)
+        y: Values, same length as x
+        threshold: Maximum number of points to return (>= 3)
+
+    Returns:
+        Sorted integer array of selected indices
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # Bucket boundaries for the n - 2 inner points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+
+        # Average of the next bucket (the last point for the final bucket)
+        next_start, next_stop = stop, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_stop].mean()
+        avg_y = y[next_start:next_stop].mean()
+
+        bucket_x = x[start:stop]
+        bucket_y = y[start:stop]
+        areas = np.abs(
+            (x[previous] - avg_x) * (bucket_y - y[previous])
+            - (x[previous] - bucket_x) * (avg_y - y[previous])
+        )
+
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+
+    return selected
@@ -0,0 +1,113 @@
+"""
+Vectorized two-sample statistics
+
+All functions take per-group sample sizes, means and variances as arrays
+and evaluate every comparison at once. Entries without enough data
+(fewer than 2 samples per group, zero variance) come back as NaN.
+"""
+
+from typing import Tuple
+
+import numpy as np
+from scipy import stats
+
+
+def nan_moments(values: np.ndarray, axis: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Count, mean and sample variance (ddof=1) ignoring NaN
+
+    Args:
+        values: Array with NaN for missing observations
+        axis: Axis to reduce over
+
+    Returns:
+        Tuple of (count, mean, variance) arrays
+    """
+    mask = ~np.isnan(values)
+    count = mask.sum(axis=axis)
+    filled = np.where(mask, values, 0.0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = filled.sum(axis=axis) / count
+        centered = np.where(mask, values - np.expand_dims(mean, axis), 0.0)
+        variance = (centered ** 2).sum(axis=axis) / (count - 1)
+
+    mean = np.where(count > 0, mean, np.nan)
+    variance = np.where(count > 1, variance, np.nan)
+    return count, mean, variance
+
+
+def moments_from_sums(
+    count: np.ndarray,
+    total: np.ndarray,
+    total_sq: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mean and sample variance (ddof=1) from count, sum and sum of squares
+
+    Args:
+        count: Number of observations
+        total: Sum of observations
+        total_sq: Sum of squared observations
+
+    Returns:
+        Tuple of (mean, variance) arrays
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / count
+        variance = (total_sq - count * mean ** 2) / (count - 1)
+
+    mean = np.where(count > 0, mean, np.nan)
+    variance = np.where(count > 1, np.maximum(variance, 0.0), np.nan)
+    return mean, variance
+
+
+def cohens_d(
+    n1: np.ndarray,
+    mean1: np.ndarray,
+    var1: np.ndarray,
+    n2: np.ndarray,
+    mean2: np.ndarray,
+    var2: np.ndarray
+) -> np.ndarray:
+    """
+    Cohen's d using the pooled standard deviation
+
+    Returns:
+        (mean1 - mean2) / pooled_sd, NaN where undefined
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        pooled = ((n1 - 1) * var1 + (n2 - 1) * var2) / (n1 + n2 - 2)
+        d = (mean1 - mean2) / np.sqrt(pooled)
+
+    return np.where(np.isfinite(d), d, np.nan)
+
+
+def welch_t_test(
+    n1: np.ndarray,
+    mean1: np.ndarray,
+    var1: np.ndarray,
+    n2: np.ndarray,
+    mean2: np.ndarray,
+    var2: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Welch's unequal-variance t-test (two-sided)
+
+    Returns:
+        Tuple of (t_statistic, degrees_of_freedom, p_value) arrays
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        se1 = var1 / n1
+        se2 = var2 / n2
+        se = se1 + se2
+        t = (mean1 - mean2) / np.sqrt(se)
+        df = se ** 2 / (se1 ** 2 / (n1 - 1) + se2 ** 2 / (n2 - 1))
+        p_value = 2.0 * stats.t.sf(np.abs(t), df)
+
+    valid = np.isfinite(t) & np.isfinite(df)
+    return (
+        np.where(valid, t, np.nan),
+        np.where(valid, df, np.nan),
+        np.where(valid, p_value, np.nan)
+    )
@@ -0,0 +1,79 @@
+"""
+Event-study analysis
+
+Aligns every event day (e.g. alcohol, a missed medication) and averages
+the surrounding ±k days of every metric into a mean response curve with
+confidence bands. Windows are strided views over the padded day × metric
+matrix, and all event types are reduced together with einsum.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import stats
+
+from app.analytics.effect_size import moments_from_sums
+
+
+@dataclass
+class EventResponses:
+    """Response curves indexed by [event, metric, offset]"""
+    offsets: np.ndarray  # -window..window
+    event_count: np.ndarray  # (n_events,)
+    count: np.ndarray
+    mean: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+
+
+def event_windows(
+    events: np.ndarray,
+    values: np.ndarray,
+    window: int,
+    confidence: float = 0.95
+) -> EventResponses:
+    """
+    Mean response of every metric around the days each event occurred
+
+    Args:
+        events: Boolean event indicators (1.0 = event day), shape (n_days, n_events)
+        values: Metric values with NaN for missing, shape (n_days, n_metrics)
+        window: Days before and after each event (k)
+        confidence: Confidence level of the bands
+
+    Returns:
+        EventResponses with curves of length 2 * window + 1
+    """
+    width = 2 * window + 1
+
+    padded = np.pad(values, ((window, window), (0, 0)), constant_values=np.nan)
+    observed = ~np.isnan(padded)
+    filled = np.where(observed, padded, 0.0)
+
+    # (n_days, n_metrics, width) views: row t covers days t-window .. t+window
+    valid_windows = sliding_window_view(observed.astype(np.float64), width, axis=0)
+    value_windows = sliding_window_view(filled, width, axis=0)
+    square_windows = sliding_window_view(filled ** 2, width, axis=0)
+
+    weights = (events == 1).astype(np.float64)
+    count = np.einsum('te,tmo->emo', weights, valid_windows)
+    total = np.einsum('te,tmo->emo', weights, value_windows)
+    total_sq = np.einsum('te,tmo->emo', weights, square_windows)
+
+    mean, variance = moments_from_sums(count, total, total_sq)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        critical = stats.t.ppf(0.5 + confidence / 2, count - 1)
+        margin = critical * np.sqrt(variance / count)
+
+    margin = np.where(np.isfinite(margin), margin, np.nan)
+
+    return EventResponses(
+        offsets=np.arange(-window, window + 1),
+        event_count=weights.sum(axis=0).astype(np.int64),
+        count=count.astype(np.int64),
+        mean=mean,
+        lower=mean - margin,
+        upper=mean + margin
+    )
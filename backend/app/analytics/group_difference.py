@@ -0,0 +1,81 @@
+"""
+Conditional "with vs without" analysis
+
+For every boolean metric × numeric metric pair and every lag, compares the
+numeric metric on days following a "yes" with days following a "no"
+("your mood is 1.4 points higher on days you exercise"). All pairs of a
+lag are evaluated together with masked matrix products.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.analytics.effect_size import moments_from_sums, cohens_d, welch_t_test
+
+
+@dataclass
+class GroupDifferences:
+    """Arrays of shape (n_lags, n_conditions, n_outcomes)"""
+    with_count: np.ndarray
+    with_mean: np.ndarray
+    without_count: np.ndarray
+    without_mean: np.ndarray
+    difference: np.ndarray
+    effect_size: np.ndarray
+    p_value: np.ndarray
+
+
+def group_differences(
+    conditions: np.ndarray,
+    outcomes: np.ndarray,
+    max_lag: int = 0
+) -> GroupDifferences:
+    """
+    Compare outcomes on days with vs without each condition
+
+    For lag L, the condition on day t is paired with the outcome on day t + L.
+
+    Args:
+        conditions: Boolean metrics as 1.0 / 0.0 / NaN, shape (n_days, n_conditions)
+        outcomes: Numeric metrics with NaN for missing, shape (n_days, n_outcomes)
+        max_lag: Largest lag in days
+
+    Returns:
+        GroupDifferences indexed by [lag, condition, outcome]
+    """
+    n_days = conditions.shape[0]
+    shape = (max_lag + 1, conditions.shape[1], outcomes.shape[1])
+
+    counts = {group: np.zeros(shape) for group in ('with', 'without')}
+    sums = {group: np.zeros(shape) for group in ('with', 'without')}
+    sums_sq = {group: np.zeros(shape) for group in ('with', 'without')}
+
+    observed = ~np.isnan(outcomes)
+    filled = np.where(observed, outcomes, 0.0)
+
+    for lag in range(min(max_lag, n_days - 1) + 1):
+        condition_rows = conditions[:n_days - lag]
+        valid = observed[lag:].astype(np.float64)
+        values = filled[lag:]
+
+        for group, flag in (('with', 1.0), ('without', 0.0)):
+            weights = (condition_rows == flag).astype(np.float64)
+            counts[group][lag] = weights.T @ valid
+            sums[group][lag] = weights.T @ values
+            sums_sq[group][lag] = weights.T @ (values ** 2)
+
+    n1, n2 = counts['with'], counts['without']
+    mean1, var1 = moments_from_sums(n1, sums['with'], sums_sq['with'])
+    mean2, var2 = moments_from_sums(n2, sums['without'], sums_sq['without'])
+    _, _, p_value = welch_t_test(n1, mean1, var1, n2, mean2, var2)
+
+    return GroupDifferences(
+        with_count=n1.astype(np.int64),
+        with_mean=mean1,
+        without_count=n2.astype(np.int64),
+        without_mean=mean2,
+        difference=mean1 - mean2,
+        effect_size=cohens_d(n1, mean1, var1, n2, mean2, var2),
+        p_value=p_value
+    )
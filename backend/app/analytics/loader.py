@@ -0,0 +1,150 @@
+"""
+Columnar data access for analytics
+
+Fetches (entry_date, metric_id, value) observations with a single Core
+SELECT ... JOIN and streams the rows straight into NumPy arrays. No ORM
+instances are created and numeric values are cast to float in SQL, so
+there is no per-value Decimal conversion either.
+"""
+
+from datetime import date
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import Float, case, cast, func, select
+from sqlalchemy.orm import Session
+
+from app.models.entry import Entry, EntryValue
+from app.analytics.matrix import MetricMatrix, build_metric_matrix
+from app.analytics.profiling import Trace
+
+entries_table = Entry.__table__
+values_table = EntryValue.__table__
+
+# Rows fetched from the cursor per partition
+CHUNK_SIZE = 10_000
+
+
+def observations_query(
+    user_id: int,
+    metric_ids: Sequence[int],
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None
+):
+    """
+    Build the SELECT returning (entry_date, metric_id, value) rows
+
+    Booleans come back as 1.0 / 0.0, text values as NULL.
+    """
+    value = func.coalesce(
+        cast(values_table.c.value_numeric, Float),
+        case(
+            (values_table.c.value_boolean == True, 1.0),
+            (values_table.c.value_boolean == False, 0.0),
+        )
+    )
+
+    stmt = select(
+        entries_table.c.entry_date,
+        values_table.c.metric_id,
+        value.label('value')
+    ).select_from(
+        entries_table.join(values_table, values_table.c.entry_id == entries_table.c.id)
+    ).where(
+        entries_table.c.user_id == user_id,
+        values_table.c.metric_id.in_(list(metric_ids))
+    )
+
+    if date_from:
+        stmt = stmt.where(entries_table.c.entry_date >= date_from)
+    if date_to:
+        stmt = stmt.where(entries_table.c.entry_date <= date_to)
+
+    return stmt
+
+
+def load_observations(
+    db: Session,
+    user_id: int,
+    metric_ids: Sequence[int],
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    order_by_date: bool = False
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Load observations as parallel NumPy arrays using one query
+
+    Args:
+        db: Database session
+        user_id: User ID
+        metric_ids: Metrics to load
+        date_from: Start date
+        date_to: End date
+        order_by_date: Return rows sorted by entry date
+
+    Returns:
+        Tuple of (dates as datetime64[D], metric IDs as int64, values as float64)
+    """
+    date_chunks: List[np.ndarray] = [np.empty(0, dtype='datetime64[D]')]
+    id_chunks: List[np.ndarray] = [np.empty(0, dtype=np.int64)]
+    value_chunks: List[np.ndarray] = [np.empty(0, dtype=np.float64)]
+
+    if not metric_ids:
+        return date_chunks[0], id_chunks[0], value_chunks[0]
+
+    stmt = observations_query(user_id, metric_ids, date_from, date_to)
+    if order_by_date:
+        stmt = stmt.order_by(entries_table.c.entry_date)
+
+    result = db.execute(stmt.execution_options(yield_per=CHUNK_SIZE))
+
+    for partition in result.partitions():
+        dates, ids, values = zip(*partition)
+        date_chunks.append(np.array(dates, dtype='datetime64[D]'))
+        id_chunks.append(np.array(ids, dtype=np.int64))
+        value_chunks.append(np.array(values, dtype=np.float64))  # None -> NaN
+
+    return (
+        np.concatenate(date_chunks),
+        np.concatenate(id_chunks),
+        np.concatenate(value_chunks)
+    )
+
+
+def load_metric_matrix(
+    db: Session,
+    user_id: int,
+    metrics: Sequence,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    trace: Optional[Trace] = None
+) -> Optional[MetricMatrix]:
+    """
+    Load the calendar-aligned day × metric matrix for the given metrics
+
+    Args:
+        db: Database session
+        user_id: User ID
+        metrics: Metric objects defining the matrix columns
+        date_from: First day (default: earliest observation)
+        date_to: Last day (default: latest observation)
+        trace: Trace receiving 'load' (query) and 'pivot' (matrix) spans
+
+    Returns:
+        MetricMatrix, or None if there is nothing to analyze
+    """
+    if not metrics:
+        return None
+
+    trace = trace if trace is not None else Trace()
+
+    with trace.span('load'):
+        dates, metric_ids, values = load_observations(
+            db, user_id, [m.id for m in metrics], date_from, date_to
+        )
+
+    with trace.span('pivot'):
+        return build_metric_matrix(
+            dates, metric_ids, values, metrics,
+            date_from=date_from, date_to=date_to
+        )
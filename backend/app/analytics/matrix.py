@@ -0,0 +1,146 @@
+"""
+Calendar-aligned day × metric matrix
+
+Vectorized analytics operate on a dense float matrix with one row per
+calendar day and one column per metric. Missing observations are NaN,
+boolean metrics are stored as 1.0 / 0.0.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Optional, Sequence
+import os
+
+import numpy as np
+
+# Widest date range an analysis covers; longer histories are cut to the
+# most recent ANALYTICS_MAX_RANGE_DAYS (+1) days
+ANALYTICS_MAX_RANGE_DAYS = int(os.getenv("ANALYTICS_MAX_RANGE_DAYS", "3660"))
+
+
+@dataclass
+class MetricMatrix:
+    """Dense day × metric matrix for a contiguous date range"""
+    dates: np.ndarray  # datetime64[D], one row per calendar day
+    metric_ids: List[int]
+    metric_names: List[str]
+    value_types: List[str]
+    values: np.ndarray  # float64, shape (n_days, n_metrics), NaN = missing
+
+    @property
+    def n_days(self) -> int:
+        return self.values.shape[0]
+
+    @property
+    def n_metrics(self) -> int:
+        return self.values.shape[1]
+
+    def column_index(self, metric_id: int) -> int:
+        """Return the column index of a metric"""
+        return self.metric_ids.index(metric_id)
+
+    def column(self, metric_id: int) -> np.ndarray:
+        """Return the values of a single metric (view, one value per day)"""
+        return self.values[:, self.column_index(metric_id)]
+
+    def rows_between(self, date_from: date, date_to: date) -> np.ndarray:
+        """
+        Return the rows for an inclusive date range as a view
+
+        Args:
+            date_from: First day (inclusive)
+            date_to: Last day (inclusive)
+
+        Returns:
+            Array of shape (n_days_in_range, n_metrics)
+        """
+        start = np.searchsorted(self.dates, np.datetime64(date_from, 'D'), side='left')
+        stop = np.searchsorted(self.dates, np.datetime64(date_to, 'D'), side='right')
+        return self.values[start:stop]
+
+    def columns_of_type(self, *value_types: str) -> List[int]:
+        """Return column indices of metrics with one of the given value types"""
+        return [i for i, t in enumerate(self.value_types) if t in value_types]
+
+    def observed_days(self) -> int:
+        """Number of days with at least one observation"""
+        return int(np.sum(~np.all(np.isnan(self.values), axis=1)))
+
+
+def build_metric_matrix(
+    entry_dates: np.ndarray,
+    metric_ids: np.ndarray,
+    values: np.ndarray,
+    metrics: Sequence,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None
+) -> Optional[MetricMatrix]:
+    """
+    Scatter (date, metric_id, value) observations into a MetricMatrix
+
+    Args:
+        entry_dates: datetime64[D] array of observation dates
+        metric_ids: Integer array of metric IDs (same length)
+        values: Float array of observation values (same length)
+        metrics: Metric objects defining the columns, in output order
+        date_from: Start of the requested range (default: earliest observation)
+        date_to: End of the requested range (default: latest observation)
+
+    Rows span the observed days within the requested range only: days
+    before the first or after the last observation would be all NaN, and
+    sizing the matrix to the request would let an arbitrarily wide range
+    allocate millions of rows. Every consumer treats days outside the
+    matrix like NaN rows (rows_between, padded windows). The resulting
+    range is further cut to the last ANALYTICS_MAX_RANGE_DAYS, so a single
+    stray old entry cannot blow up an analysis without explicit bounds.
+
+    Returns:
+        MetricMatrix (with no rows if nothing was observed in range),
+        or None if the date range is empty
+    """
+    entry_dates = np.asarray(entry_dates, dtype='datetime64[D]')
+    metric_ids = np.asarray(metric_ids, dtype=np.int64)
+    values = np.asarray(values, dtype=np.float64)
+
+    if date_from is None:
+        if len(entry_dates) == 0:
+            return None
+        start = entry_dates.min()
+    else:
+        start = np.datetime64(date_from, 'D')
+
+    if date_to is None:
+        if len(entry_dates) == 0:
+            return None
+        stop = entry_dates.max()
+    else:
+        stop = np.datetime64(date_to, 'D')
+
+    if stop < start:
+        return None
+
+    if len(entry_dates):
+        start = max(start, entry_dates.min())
+        stop = min(stop, entry_dates.max())
+        start = max(start, stop - np.timedelta64(ANALYTICS_MAX_RANGE_DAYS, 'D'))
+
+    column_ids = np.array([m.id for m in metrics], dtype=np.int64)
+    order = np.argsort(column_ids)
+    sorted_ids = column_ids[order]
+
+    n_days = max(int((stop - start).astype(np.int64)) + 1, 0) if len(entry_dates) else 0
+    matrix = np.full((n_days, len(column_ids)), np.nan)
+
+    if len(entry_dates) and len(column_ids):
+        rows = (entry_dates - start).astype(np.int64)
+        positions = np.clip(np.searchsorted(sorted_ids, metric_ids), 0, len(sorted_ids) - 1)
+        keep = (rows >= 0) & (rows < n_days) & (sorted_ids[positions] == metric_ids)
+        matrix[rows[keep], order[positions[keep]]] = values[keep]
+
+    return MetricMatrix(
+        dates=start + np.arange(n_days),
+        metric_ids=[m.id for m in metrics],
+        metric_names=[m.name_key for m in metrics],
+        value_types=[m.value_type for m in metrics],
+        values=matrix
+    )
@@ -0,0 +1,81 @@
+"""
+Phase-level timing for analytics pipelines
+
+A Trace collects the time spent in named phases (load, pivot, compute,
+...) and work counters (pairs evaluated, lags tested, ...) of one
+analysis. Spans with the same name accumulate, so a phase entered once
+per metric pair reports its total. Opening a span costs two
+perf_counter() calls.
+
+record_trace() publishes a finished trace to /metrics and the log;
+analyses slower than ANALYTICS_SLOW_LOG_SECONDS are logged at INFO.
+"""
+from contextlib import contextmanager
+from typing import Dict, Iterator
+import logging
+import os
+import time
+
+from app.utils.telemetry import analytics_phase_seconds, analytics_work_total
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_SLOW_LOG_SECONDS = float(os.getenv("ANALYTICS_SLOW_LOG_SECONDS", "1.0"))
+
+
+class Trace:
+    """Accumulated phase durations (seconds) and counters of one analysis"""
+
+    def __init__(self):
+        self.spans: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Add the duration of the block to phase `name`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans[name] = self.spans.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Increment counter `name`"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    @property
+    def total(self) -> float:
+        """Time spent in all phases, in seconds"""
+        return sum(self.spans.values())
+
+    def as_dict(self) -> Dict[str, Dict]:
+        """Phases in milliseconds and counters, for responses and logs"""
+        return {
+            "spans_ms": {name: round(seconds * 1000, 3) for name, seconds in self.spans.items()},
+            "counters": dict(self.counters),
+        }
+
+    def summary(self) -> str:
+        """One-line description for logs"""
+        spans = " ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in self.spans.items())
+        counters = " ".join(f"{name}={value}" for name, value in self.counters.items())
+        return f"{spans} {counters}".strip()
+
+
+def record_trace(operation: str, trace: Trace, user_id: int) -> None:
+    """
+    Export a finished trace as metrics and log it
+
+    Args:
+        operation: Analysis name, e.g. 'correlations'
+        trace: Finished trace
+        user_id: User the analysis ran for
+    """
+    for phase, seconds in trace.spans.items():
+        analytics_phase_seconds.observe(seconds, operation, phase)
+    for name, value in trace.counters.items():
+        analytics_work_total.inc(operation, name, amount=value)
+
+    level = logging.INFO if trace.total >= ANALYTICS_SLOW_LOG_SECONDS else logging.DEBUG
+    if logger.isEnabledFor(level):
+        logger.log(level, f"[ANALYTICS] {operation} for user {user_id}: {trace.summary()}")
@@ -0,0 +1,94 @@
+"""
+Seasonality profiles for the day × metric matrix
+
+Day-of-week / month-of-year means are grouped reductions done with a
+single np.bincount over a flattened (group, metric) index. Autocorrelation
+is computed for all metrics at once via FFT, with missing days masked out.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+
+def weekday_index(dates: np.ndarray) -> np.ndarray:
+    """Day of week for datetime64[D] dates (Monday = 0 ... Sunday = 6)"""
+    # 1970-01-01 was a Thursday
+    return (dates.astype('datetime64[D]').astype(np.int64) + 3) % 7
+
+
+def month_index(dates: np.ndarray) -> np.ndarray:
+    """Month of year for datetime64[D] dates (January = 0 ... December = 11)"""
+    return dates.astype('datetime64[M]').astype(np.int64) % 12
+
+
+def grouped_means(
+    values: np.ndarray,
+    groups: np.ndarray,
+    n_groups: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-group count and mean of every column, ignoring NaN
+
+    Args:
+        values: Array of shape (n_days, n_metrics)
+        groups: Group index per row, values in [0, n_groups)
+        n_groups: Number of groups
+
+    Returns:
+        Tuple of (counts, means), each of shape (n_groups, n_metrics)
+    """
+    n_metrics = values.shape[1]
+    mask = ~np.isnan(values)
+    flat_index = (groups[:, None] * n_metrics + np.arange(n_metrics)).ravel()
+    size = n_groups * n_metrics
+
+    counts = np.bincount(flat_index, weights=mask.ravel(), minlength=size)
+    sums = np.bincount(flat_index, weights=np.where(mask, values, 0.0).ravel(), minlength=size)
+
+    counts = counts.reshape(n_groups, n_metrics)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums.reshape(n_groups, n_metrics) / counts
+
+    return counts.astype(np.int64), means
+
+
+def autocorrelation(values: np.ndarray, max_lag: int, min_pairs: int = 3) -> np.ndarray:
+    """
+    Autocorrelation of every column for lags 0..max_lag, tolerating gaps
+
+    Missing days contribute neither to the lagged products nor to the
+    pair counts, so each lag is normalized by the number of day pairs
+    where both values were observed.
+
+    Args:
+        values: Calendar-aligned array of shape (n_days, n_metrics)
+        max_lag: Largest lag in days
+        min_pairs: Minimum observed pairs for a lag to be reported
+
+    Returns:
+        Array of shape (max_lag + 1, n_metrics), NaN where undefined
+    """
+    n_days = values.shape[0]
+    mask = ~np.isnan(values)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.where(mask, values, 0.0).sum(axis=0) / mask.sum(axis=0)
+    centered = np.where(mask, values - np.nan_to_num(means), 0.0)
+    observed = mask.astype(np.float64)
+
+    # Zero-pad to avoid circular wrap-around
+    size = 1 << int(np.ceil(np.log2(max(2 * n_days, 2))))
+    spectrum = np.fft.rfft(centered, n=size, axis=0)
+    mask_spectrum = np.fft.rfft(observed, n=size, axis=0)
+
+    lagged_products = np.fft.irfft(spectrum * np.conj(spectrum), n=size, axis=0)[:max_lag + 1]
+    pair_counts = np.rint(np.fft.irfft(mask_spectrum * np.conj(mask_spectrum), n=size, axis=0)[:max_lag + 1])
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        covariance = lagged_products / pair_counts
+        acf = covariance / covariance[0]
+
+    acf[pair_counts < min_pairs] = np.nan
+    acf[~np.isfinite(acf)] = np.nan
+    return acf
@@ -7,6 +7,9 @@ from .metrics import router as metrics_router
 from .entries import router as entries_router
 from .analytics import router as analytics_router
 from .demo_data import router as demo_data_router
+from .sync import router as sync_router
+from .data_import import router as import_router
+from .export import router as export_router
 
 __all__ = [
     "auth_router",
@@ -15,4 +18,7 @@ __all__ = [
     "entries_router",
     "analytics_router",
     "demo_data_router",
+    "sync_router",
+    "import_router",
+    "export_router",
 ]
@@ -2,25 +2,61 @@
 Analytics API endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import date
 
 from app.utils.database import get_db
+from app.utils.http_cache import conditional_get
 from app.security.dependencies import get_current_user
 from app.models.user import User
 from app.services.analytics_service import AnalyticsService
+from app.analytics.matrix import ANALYTICS_MAX_RANGE_DAYS
+from app.analytics.profiling import Trace, record_trace
 from app.schemas.analytics import (
+    AnalyticsDebug,
     CorrelationRequest,
     CorrelationResponse,
     CorrelationResultSchema,
     StatisticsResponse,
-    MetricStatistics
+    MetricStatistics,
+    PeriodComparisonRequest,
+    PeriodComparisonResponse,
+    MetricComparison,
+    SeasonalityResponse,
+    SeasonalityProfile,
+    TimeSeriesResponse,
+    GroupDifferenceRequest,
+    GroupDifferenceResponse,
+    GroupDifferenceSchema,
+    EventStudyRequest,
+    EventStudyResponse,
+    EventStudySchema
 )
 
 router = APIRouter()
 
 
+def _check_date_range(date_from: Optional[date], date_to: Optional[date]) -> None:
+    """Reject explicit date ranges wider than ANALYTICS_MAX_RANGE_DAYS"""
+    if date_from and date_to and (date_to - date_from).days > ANALYTICS_MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date range too wide (max {ANALYTICS_MAX_RANGE_DAYS} days)"
+        )
+
+
+def _parse_metric_ids(metric_ids: Optional[str]) -> Optional[List[int]]:
+    """Parse a comma-separated list of metric IDs from a query parameter"""
+    if not metric_ids:
+        return None
+    try:
+        return [int(id.strip()) for id in metric_ids.split(',')]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid metric_ids format")
+
+
 @router.post("/correlations", response_model=CorrelationResponse)
 def calculate_correlations(
     request: CorrelationRequest,
@@ -38,6 +74,7 @@ def calculate_correlations(
     - Statistical significance testing
     - Filtering by metric IDs and date range
     - Minimum 7 data points required
+    - "debug": true adds per-phase timings and work counters
 
     Example:
         POST /api/v1/analytics/correlations
@@ -47,7 +84,10 @@ def calculate_correlations(
             "only_significant": true
         }
     """
+    _check_date_range(request.date_from, request.date_to)
+
     service = AnalyticsService(db)
+    trace = Trace()
 
     try:
         results = service.get_correlations(
@@ -58,27 +98,31 @@ def calculate_correlations(
             algorithm=request.algorithm,
             max_lag=request.max_lag,
             min_significance=request.min_significance,
-            only_significant=request.only_significant
+            only_significant=request.only_significant,
+            trace=trace
         )
 
         # Convert CorrelationResult objects to response schema
-        correlation_schemas = [
-            CorrelationResultSchema(
-                metric_1_id=r.metric_1_id,
-                metric_1_name=r.metric_1_name,
-                metric_2_id=r.metric_2_id,
-                metric_2_name=r.metric_2_name,
-                coefficient=r.coefficient,
-                p_value=r.p_value,
-                lag=r.lag,
-                strength=r.strength,
-                significant=r.significant,
-                direction=r.direction,
-                sample_size=r.sample_size,
-                algorithm=r.algorithm
-            )
-            for r in results
-        ]
+        with trace.span('serialize'):
+            correlation_schemas = [
+                CorrelationResultSchema(
+                    metric_1_id=r.metric_1_id,
+                    metric_1_name=r.metric_1_name,
+                    metric_2_id=r.metric_2_id,
+                    metric_2_name=r.metric_2_name,
+                    coefficient=r.coefficient,
+                    p_value=r.p_value,
+                    lag=r.lag,
+                    strength=r.strength,
+                    significant=r.significant,
+                    direction=r.direction,
+                    sample_size=r.sample_size,
+                    algorithm=r.algorithm
+                )
+                for r in results
+            ]
+
+        record_trace('correlations', trace, current_user.id)
 
         return CorrelationResponse(
             correlations=correlation_schemas,
@@ -87,7 +131,8 @@ def calculate_correlations(
                 'from': str(request.date_from) if request.date_from else None,
                 'to': str(request.date_to) if request.date_to else None
             },
-            total_correlations=len(correlation_schemas)
+            total_correlations=len(correlation_schemas),
+            debug=AnalyticsDebug(**trace.as_dict()) if request.debug else None
         )
 
     except ValueError as e:
@@ -96,7 +141,11 @@ def calculate_correlations(
         raise HTTPException(status_code=500, detail=f"Correlation analysis failed: {str(e)}")
 
 
-@router.get("/statistics", response_model=StatisticsResponse)
+@router.get(
+    "/statistics",
+    response_model=StatisticsResponse,
+    dependencies=[Depends(conditional_get())]
+)
 def get_statistics(
     metric_ids: str = None,
     date_from: str = None,
@@ -119,13 +168,7 @@ def get_statistics(
     """
     service = AnalyticsService(db)
 
-    # Parse metric_ids if provided
-    parsed_metric_ids = None
-    if metric_ids:
-        try:
-            parsed_metric_ids = [int(id.strip()) for id in metric_ids.split(',')]
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid metric_ids format")
+    parsed_metric_ids = _parse_metric_ids(metric_ids)
 
     # Parse dates if provided
     from datetime import datetime
@@ -144,6 +187,8 @@ def get_statistics(
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid date_to format (use YYYY-MM-DD)")
 
+    _check_date_range(parsed_date_from, parsed_date_to)
+
     try:
         stats = service.get_statistics(
             user_id=current_user.id,
@@ -162,3 +207,251 @@ def get_statistics(
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Statistics calculation failed: {str(e)}")
+
+
+@router.post("/comparison", response_model=PeriodComparisonResponse)
+def compare_periods(
+    request: PeriodComparisonRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Compare two periods for every metric ("this month vs last month")
+
+    Returns both periods' means, the delta, Cohen's d and a Welch t-test
+    p-value per metric. If the previous period is omitted, the window of
+    the same length right before the current period is used.
+
+    Example:
+        POST /api/v1/analytics/comparison
+        {
+            "current_from": "2024-06-01",
+            "current_to": "2024-06-30"
+        }
+    """
+    _check_date_range(request.current_from, request.current_to)
+    if request.previous_from and request.previous_to:
+        _check_date_range(
+            min(request.current_from, request.previous_from),
+            max(request.current_to, request.previous_to)
+        )
+
+    service = AnalyticsService(db)
+
+    try:
+        result = service.compare_periods(
+            user_id=current_user.id,
+            current_from=request.current_from,
+            current_to=request.current_to,
+            previous_from=request.previous_from,
+            previous_to=request.previous_to,
+            metric_ids=request.metric_ids,
+            min_significance=request.min_significance
+        )
+
+        return PeriodComparisonResponse(
+            comparisons=[MetricComparison(**c) for c in result['comparisons']],
+            current_period=result['current_period'],
+            previous_period=result['previous_period']
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Period comparison failed: {str(e)}")
+
+
+@router.get(
+    "/seasonality",
+    response_model=SeasonalityResponse,
+    dependencies=[Depends(conditional_get())]
+)
+def get_seasonality(
+    metric_ids: Optional[str] = Query(None, description="Comma-separated list of metric IDs"),
+    date_from: Optional[date] = Query(None, description="Start date (YYYY-MM-DD)"),
+    date_to: Optional[date] = Query(None, description="End date (YYYY-MM-DD)"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get weekday and month-of-year profiles for metrics
+
+    Returns per-metric means and counts for each day of the week and each
+    month, plus the autocorrelation at lag 7 days (strength of the weekly
+    rhythm). Results are cached until the user's data changes.
+
+    Example:
+        GET /api/v1/analytics/seasonality?metric_ids=1,2&date_from=2024-01-01
+    """
+    service = AnalyticsService(db)
+    parsed_metric_ids = _parse_metric_ids(metric_ids)
+
+    _check_date_range(date_from, date_to)
+
+    try:
+        profiles = service.get_seasonality(
+            user_id=current_user.id,
+            metric_ids=parsed_metric_ids,
+            date_from=date_from,
+            date_to=date_to
+        )
+
+        return SeasonalityResponse(
+            profiles=[SeasonalityProfile(**p) for p in profiles],
+            date_range={
+                'from': str(date_from) if date_from else None,
+                'to': str(date_to) if date_to else None
+            }
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Seasonality analysis failed: {str(e)}")
+
+
+@router.get(
+    "/timeseries/{metric_id}",
+    response_model=TimeSeriesResponse,
+    dependencies=[Depends(conditional_get())]
+)
+def get_timeseries(
+    metric_id: int,
+    date_from: Optional[date] = Query(None, description="Start date (YYYY-MM-DD)"),
+    date_to: Optional[date] = Query(None, description="End date (YYYY-MM-DD)"),
+    max_points: Optional[int] = Query(
+        None, ge=3, le=10000,
+        description="Downsample to at most this many points (LTTB)"
+    ),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get a metric's values as columnar dates[] / values[] arrays for charts
+
+    With max_points, long histories are downsampled server-side using
+    Largest-Triangle-Three-Buckets, which keeps peaks and troughs visible.
+
+    Example:
+        GET /api/v1/analytics/timeseries/3?max_points=300
+    """
+    service = AnalyticsService(db)
+
+    _check_date_range(date_from, date_to)
+
+    try:
+        series = service.get_timeseries(
+            user_id=current_user.id,
+            metric_id=metric_id,
+            date_from=date_from,
+            date_to=date_to,
+            max_points=max_points
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if series is None:
+        raise HTTPException(status_code=404, detail="Metric not found")
+
+    return TimeSeriesResponse(**series)
+
+
+@router.post("/group-differences", response_model=GroupDifferenceResponse)
+def calculate_group_differences(
+    request: GroupDifferenceRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Compare numeric metrics on days with vs without each boolean metric
+
+    For every boolean metric (exercise, alcohol, medication...) and every
+    numeric metric, reports both group means, the difference, Cohen's d
+    and a Welch t-test p-value, for lags 0..max_lag days. Results are
+    ranked by absolute effect size.
+
+    Example:
+        POST /api/v1/analytics/group-differences
+        {
+            "max_lag": 1,
+            "only_significant": true
+        }
+    """
+    service = AnalyticsService(db)
+
+    _check_date_range(request.date_from, request.date_to)
+
+    try:
+        results = service.get_group_differences(
+            user_id=current_user.id,
+            metric_ids=request.metric_ids,
+            date_from=request.date_from,
+            date_to=request.date_to,
+            max_lag=request.max_lag,
+            min_group_size=request.min_group_size,
+            min_significance=request.min_significance,
+            only_significant=request.only_significant
+        )
+
+        return GroupDifferenceResponse(
+            differences=[GroupDifferenceSchema(**r) for r in results],
+            date_range={
+                'from': str(request.date_from) if request.date_from else None,
+                'to': str(request.date_to) if request.date_to else None
+            },
+            total_differences=len(results)
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Group difference analysis failed: {str(e)}")
+
+
+@router.post("/event-study", response_model=EventStudyResponse)
+def calculate_event_study(
+    request: EventStudyRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Show how metrics behave in the days around boolean events
+
+    Every day on which an event metric (alcohol, missed medication, ...)
+    has event_value is aligned, and the ±window days of every other metric
+    are averaged into a mean response curve with confidence bands.
+
+    Example:
+        POST /api/v1/analytics/event-study
+        {
+            "event_metric_ids": [12],
+            "window": 3
+        }
+    """
+    service = AnalyticsService(db)
+
+    _check_date_range(request.date_from, request.date_to)
+
+    try:
+        events = service.get_event_study(
+            user_id=current_user.id,
+            event_metric_ids=request.event_metric_ids,
+            metric_ids=request.metric_ids,
+            date_from=request.date_from,
+            date_to=request.date_to,
+            window=request.window,
+            event_value=request.event_value,
+            confidence=request.confidence,
+            min_events=request.min_events
+        )
+
+        return EventStudyResponse(
+            events=[EventStudySchema(**e) for e in events],
+            date_range={
+                'from': str(request.date_from) if request.date_from else None,
+                'to': str(request.date_to) if request.date_to else None
+            }
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Event study failed: {str(e)}")
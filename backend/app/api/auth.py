@@ -7,13 +7,14 @@ from sqlalchemy.orm import Session
 from app.utils.database import get_db
 from app.schemas import UserRegister, UserLogin, RefreshTokenRequest, AuthResponse, UserResponse, TokenResponse
 from app.services import UserService
-from app.security import create_access_token, create_refresh_token
+from app.security import create_access_token, create_refresh_token, verify_token
+from app.security.refresh_tokens import TokenRevokedError, refresh_token_registry
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
 @router.post("/register", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
-async def register(
+def register(
     user_data: UserRegister,
     db: Session = Depends(get_db)
 ):
@@ -47,7 +48,7 @@ async def register(
 
 
 @router.post("/login", response_model=AuthResponse)
-async def login(
+def login(
     credentials: UserLogin,
     db: Session = Depends(get_db)
 ):
@@ -97,13 +98,17 @@ async def login(
 
 
 @router.post("/refresh", response_model=TokenResponse)
-async def refresh_token(
+def refresh_token(
     request: RefreshTokenRequest,
     db: Session = Depends(get_db)
 ):
     """
     Refresh access token using refresh token.
 
+    The refresh token is rotated: it is exchanged for a new one and cannot
+    be used again. Reusing an already rotated token revokes all tokens
+    of the same login.
+
     Args:
         request: Refresh token request containing refresh_token
         db: Database session
@@ -112,10 +117,8 @@ async def refresh_token(
         New authentication tokens
 
     Raises:
-        401: If refresh token is invalid
+        401: If refresh token is invalid, revoked or already used
     """
-    from app.security import verify_token
-
     # Verify refresh token
     payload = verify_token(request.refresh_token, token_type="refresh")
     if not payload:
@@ -124,6 +127,15 @@ async def refresh_token(
             detail="Invalid refresh token"
         )
 
+    # Each refresh token can be exchanged once
+    try:
+        family = refresh_token_registry.consume(payload)
+    except TokenRevokedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e)
+        )
+
     user_id = payload.get("sub")
     user = UserService.get_user_by_id(db, user_id)
 
@@ -135,9 +147,26 @@ async def refresh_token(
 
     # Generate new tokens
     new_access_token = create_access_token(data={"sub": user.id})
-    new_refresh_token = create_refresh_token(data={"sub": user.id})
+    new_refresh_token = create_refresh_token(data={"sub": user.id}, family=family)
 
     return TokenResponse(
         access_token=new_access_token,
         refresh_token=new_refresh_token
     )
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(request: RefreshTokenRequest):
+    """
+    Revoke a refresh token and every token rotated from the same login.
+
+    Args:
+        request: Refresh token request containing refresh_token
+
+    Returns:
+        204 No Content, also for tokens that are already invalid
+    """
+    payload = verify_token(request.refresh_token, token_type="refresh")
+    if payload and "fam" in payload:
+        refresh_token_registry.revoke_family(payload)
+    return None
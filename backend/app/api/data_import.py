@@ -0,0 +1,77 @@
+"""
+Bulk import API endpoints
+"""
+from dataclasses import asdict
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from sqlalchemy.orm import Session
+from typing import Optional
+import csv
+import io
+
+from app.utils.database import get_db
+from app.models import User
+from app.schemas import ImportResponse
+from app.services.import_service import ImportService, iter_csv_rows, iter_ndjson_rows
+from app.security import get_current_active_user
+
+router = APIRouter(prefix="/import", tags=["Import"])
+
+
+@router.post("", response_model=ImportResponse)
+def import_data(
+    file: UploadFile = File(..., description="CSV or NDJSON file, one row per day"),
+    format: Optional[str] = Query(
+        None, pattern="^(csv|ndjson)$",
+        description="File format (default: from the file extension)"
+    ),
+    create_missing: bool = Query(True, description="Create metrics for unknown columns"),
+    category: str = Query(
+        "wellness",
+        pattern="^(physical|psychological|triggers|medications|selfcare|wellness|notes)$",
+        description="Category of created metrics"
+    ),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Import historical data from another tracker.
+
+    Each row is one day: an entry_date (or date) column, an optional notes
+    column and one column per metric, matched to metrics by name_key.
+    The file is parsed incrementally and written in chunks; days that
+    already have an entry are skipped, so a failed import can be re-run.
+
+    Args:
+        file: Uploaded file
+        format: csv or ndjson
+        create_missing: Whether to create metrics for unknown columns
+        category: Category for created metrics
+        current_user: Currently authenticated user
+        db: Database session
+
+    Returns:
+        Import summary with per-row errors
+
+    Raises:
+        400: If the file is malformed or has no date column
+    """
+    if format is None:
+        format = "ndjson" if (file.filename or "").endswith((".ndjson", ".jsonl")) else "csv"
+
+    # Decode the spooled upload lazily instead of reading it into memory
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    rows = iter_csv_rows(stream) if format == "csv" else iter_ndjson_rows(stream)
+
+    try:
+        report = ImportService.import_rows(
+            db, current_user, rows,
+            create_missing=create_missing,
+            category=category
+        )
+    except (ValueError, csv.Error) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid {format} file: {e}"
+        )
+
+    return ImportResponse(**asdict(report))
@@ -13,7 +13,7 @@ router = APIRouter(prefix="/demo-data", tags=["Demo Data"])
 
 
 @router.post("/generate", status_code=status.HTTP_201_CREATED)
-async def generate_demo_data(
+def generate_demo_data(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -43,7 +43,7 @@ async def generate_demo_data(
 
 
 @router.delete("/clear", status_code=status.HTTP_204_NO_CONTENT)
-async def clear_user_data(
+def clear_user_data(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
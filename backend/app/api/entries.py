@@ -7,50 +7,86 @@ from datetime import date
 from typing import Optional
 
 from app.utils.database import get_db
+from app.utils.http_cache import conditional_get
 from app.models import User
-from app.schemas import EntryCreate, EntryUpdate, EntryResponse, EntryListResponse
+from app.schemas import (
+    EntryCreate,
+    EntryUpdate,
+    EntryResponse,
+    EntryListResponse,
+    EntryBatchCreate,
+    EntryBatchResult,
+    EntryBatchResponse,
+    EntryValueCreate,
+    EntryValueUpdate,
+    EntryValueResponse,
+)
 from app.services import EntryService
 from app.security import get_current_active_user
 
 router = APIRouter(prefix="/entries", tags=["Entries"])
 
 
-@router.get("", response_model=EntryListResponse)
-async def list_entries(
+@router.get(
+    "",
+    response_model=EntryListResponse,
+    dependencies=[Depends(conditional_get())]
+)
+def list_entries(
     date_from: Optional[date] = Query(None, description="Start date filter (YYYY-MM-DD)"),
     date_to: Optional[date] = Query(None, description="End date filter (YYYY-MM-DD)"),
     limit: int = Query(100, ge=1, le=500, description="Maximum number of entries"),
-    offset: int = Query(0, ge=0, description="Offset for pagination"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: Optional[bool] = Query(
+        None, description="Return the total count (default: only without cursor)"
+    ),
+    offset: int = Query(0, ge=0, deprecated=True, description="Offset for pagination (use cursor)"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
-    Get all entries for the current user with optional filters.
+    Get all entries for the current user with optional filters, newest first.
 
     Args:
         date_from: Optional start date filter
         date_to: Optional end date filter
         limit: Maximum number of entries to return (default: 100, max: 500)
-        offset: Offset for pagination (default: 0)
+        cursor: Cursor for the next page (from next_cursor)
+        include_total: Whether to count all matching entries
+        offset: Offset for pagination (deprecated, default: 0)
         current_user: Currently authenticated user
         db: Database session
 
     Returns:
         List of user's entries
+
+    Raises:
+        400: If cursor is invalid or combined with offset
     """
-    entries, total = EntryService.get_user_entries(
-        db, current_user, date_from, date_to, limit, offset
+    if cursor and offset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="cursor and offset cannot be combined"
+        )
+
+    if include_total is None:
+        include_total = cursor is None
+
+    entries, total, next_cursor = EntryService.get_user_entries(
+        db, current_user, date_from, date_to, limit, offset,
+        cursor=cursor, include_total=include_total
     )
 
     return EntryListResponse(
         entries=[EntryResponse.from_orm(e) for e in entries],
         total=total,
-        has_more=total > (offset + limit)
+        has_more=next_cursor is not None,
+        next_cursor=next_cursor
     )
 
 
 @router.post("", response_model=EntryResponse, status_code=status.HTTP_201_CREATED)
-async def create_entry(
+def create_entry(
     entry_data: EntryCreate,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -73,8 +109,45 @@ async def create_entry(
     return EntryResponse.from_orm(entry)
 
 
-@router.get("/{entry_id}", response_model=EntryResponse)
-async def get_entry(
+@router.post("/batch", response_model=EntryBatchResponse)
+def create_entries_batch(
+    batch: EntryBatchCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create many daily entries at once (e.g. backfilling several days).
+
+    Valid entries are created in a single transaction; invalid ones are
+    reported in the results and do not fail the batch.
+
+    Args:
+        batch: Entries to create
+        current_user: Currently authenticated user
+        db: Database session
+
+    Returns:
+        Per-entry results with created entry IDs or error details
+
+    Raises:
+        409: If some dates were created concurrently by another request
+    """
+    results = EntryService.create_entries(db, current_user, batch.entries)
+    created = sum(1 for r in results if r["status"] == "created")
+
+    return EntryBatchResponse(
+        created=created,
+        failed=len(results) - created,
+        results=[EntryBatchResult(**r) for r in results]
+    )
+
+
+@router.get(
+    "/{entry_id}",
+    response_model=EntryResponse,
+    dependencies=[Depends(conditional_get())]
+)
+def get_entry(
     entry_id: int,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -102,8 +175,12 @@ async def get_entry(
     return EntryResponse.from_orm(entry)
 
 
-@router.get("/date/{entry_date}", response_model=EntryResponse)
-async def get_entry_by_date(
+@router.get(
+    "/date/{entry_date}",
+    response_model=EntryResponse,
+    dependencies=[Depends(conditional_get())]
+)
+def get_entry_by_date(
     entry_date: date,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -132,7 +209,7 @@ async def get_entry_by_date(
 
 
 @router.patch("/{entry_id}", response_model=EntryResponse)
-async def update_entry(
+def update_entry(
     entry_id: int,
     entry_data: EntryUpdate,
     current_user: User = Depends(get_current_active_user),
@@ -164,8 +241,49 @@ async def update_entry(
     return EntryResponse.from_orm(updated_entry)
 
 
+@router.put("/{entry_id}/values/{metric_id}", response_model=EntryValueResponse)
+def set_entry_value(
+    entry_id: int,
+    metric_id: int,
+    value_data: EntryValueUpdate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Set a single value of an entry, e.g. for autosave.
+
+    Creates the value if the entry does not have one for this metric yet,
+    otherwise updates it in place. Repeating the same value is a no-op.
+
+    Args:
+        entry_id: Entry ID
+        metric_id: Metric ID
+        value_data: New value
+        current_user: Currently authenticated user
+        db: Database session
+
+    Returns:
+        Stored value
+
+    Raises:
+        404: If entry not found
+        400: If metric not found or archived, or value is invalid
+    """
+    entry = EntryService.get_entry_by_id(db, current_user, entry_id)
+    if not entry:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Entry not found"
+        )
+
+    value = EntryService.set_entry_value(
+        db, entry, EntryValueCreate(metric_id=metric_id, value=value_data.value)
+    )
+    return EntryValueResponse.from_orm(value)
+
+
 @router.delete("/{entry_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_entry(
+def delete_entry(
     entry_id: int,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
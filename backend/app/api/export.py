@@ -0,0 +1,58 @@
+"""
+Account export API endpoints
+"""
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.utils.database import get_db
+from app.models import User
+from app.services.export_service import ExportService, EXPORT_MEDIA_TYPES
+from app.security import get_current_active_user
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+
+@router.get("", response_class=StreamingResponse)
+def export_data(
+    format: str = Query("csv", pattern="^(csv|ndjson|parquet)$", description="Export format"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Export all of the user's metrics, entries and values.
+
+    The response is streamed while the data is read, so large histories
+    are not loaded into memory.
+
+    Args:
+        format: csv (one row per day), ndjson (metrics then entries) or
+            parquet (one row per value)
+        current_user: Currently authenticated user
+        db: Database session
+
+    Returns:
+        Streaming file download
+
+    Raises:
+        501: If parquet is requested but pyarrow is not installed
+    """
+    if format == "parquet" and not ExportService.parquet_available():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Parquet export is not available on this server"
+        )
+
+    encoders = {
+        "csv": ExportService.iter_csv,
+        "ndjson": ExportService.iter_ndjson,
+        "parquet": ExportService.iter_parquet,
+    }
+    filename = f"feelink-export-{date.today().isoformat()}.{format}"
+
+    return StreamingResponse(
+        encoders[format](db, current_user),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
 from app.utils.database import get_db
+from app.utils.http_cache import conditional_get
 from app.models import User
 from app.schemas import MetricCreate, MetricUpdate, MetricResponse, MetricListResponse
 from app.services import MetricService
@@ -13,8 +14,12 @@ from app.security import get_current_active_user
 router = APIRouter(prefix="/metrics", tags=["Metrics"])
 
 
-@router.get("", response_model=MetricListResponse)
-async def list_metrics(
+@router.get(
+    "",
+    response_model=MetricListResponse,
+    dependencies=[Depends(conditional_get())]
+)
+def list_metrics(
     include_archived: bool = Query(False, description="Include archived metrics"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -38,7 +43,7 @@ async def list_metrics(
 
 
 @router.post("", response_model=MetricResponse, status_code=status.HTTP_201_CREATED)
-async def create_metric(
+def create_metric(
     metric_data: MetricCreate,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -61,8 +66,12 @@ async def create_metric(
     return MetricResponse.from_orm(metric)
 
 
-@router.get("/{metric_id}", response_model=MetricResponse)
-async def get_metric(
+@router.get(
+    "/{metric_id}",
+    response_model=MetricResponse,
+    dependencies=[Depends(conditional_get())]
+)
+def get_metric(
     metric_id: int,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -91,7 +100,7 @@ async def get_metric(
 
 
 @router.patch("/{metric_id}", response_model=MetricResponse)
-async def update_metric(
+def update_metric(
     metric_id: int,
     metric_data: MetricUpdate,
     current_user: User = Depends(get_current_active_user),
@@ -124,7 +133,7 @@ async def update_metric(
 
 
 @router.delete("/{metric_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_metric(
+def delete_metric(
     metric_id: int,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -155,7 +164,7 @@ async def delete_metric(
 
 
 @router.post("/{metric_id}/unarchive", response_model=MetricResponse)
-async def unarchive_metric(
+def unarchive_metric(
     metric_id: int,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -0,0 +1,80 @@
+"""
+Sync API endpoints
+"""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional
+
+from app.utils.database import get_db
+from app.models import User
+from app.schemas import (
+    EntryResponse,
+    MetricResponse,
+    TombstoneResponse,
+    SyncResponse,
+    SyncUpload,
+    SyncUploadResult,
+    SyncUploadResponse,
+)
+from app.services import SyncService
+from app.security import get_current_active_user
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+
+
+@router.get("", response_model=SyncResponse)
+def get_changes(
+    since: Optional[datetime] = Query(
+        None, description="next_cursor from the previous sync (omit for a full snapshot)"
+    ),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get entries, metrics and deletions changed since the last sync.
+
+    Args:
+        since: Cursor returned by the previous sync
+        current_user: Currently authenticated user
+        db: Database session
+
+    Returns:
+        Changed metrics and entries, tombstones for deletions and the next cursor
+
+    Raises:
+        400: If since is in the future
+    """
+    changes = SyncService.get_changes(db, current_user, since)
+
+    return SyncResponse(
+        metrics=[MetricResponse.from_orm(m) for m in changes["metrics"]],
+        entries=[EntryResponse.from_orm(e) for e in changes["entries"]],
+        deleted=[TombstoneResponse.from_orm(t) for t in changes["deleted"]],
+        next_cursor=changes["next_cursor"],
+        reset=changes["reset"]
+    )
+
+
+@router.post("", response_model=SyncUploadResponse)
+def upload_changes(
+    upload: SyncUpload,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Upload a batch of changes made while offline.
+
+    Args:
+        upload: Entries to create or replace (by date) and entry dates to delete
+        current_user: Currently authenticated user
+        db: Database session
+
+    Returns:
+        Per-item results; invalid items are reported without failing the batch
+
+    Raises:
+        409: If entries were created concurrently for some of the dates
+    """
+    results = SyncService.apply_upload(db, current_user, upload)
+    return SyncUploadResponse(results=[SyncUploadResult(**r) for r in results])
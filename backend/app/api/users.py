@@ -14,7 +14,7 @@ router = APIRouter(prefix="/users", tags=["Users"])
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_profile(
+def get_current_user_profile(
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -30,7 +30,7 @@ async def get_current_user_profile(
 
 
 @router.patch("/me", response_model=UserResponse)
-async def update_current_user_profile(
+def update_current_user_profile(
     user_data: UserUpdate,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -51,7 +51,7 @@ async def update_current_user_profile(
 
 
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_current_user_account(
+def delete_current_user_account(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
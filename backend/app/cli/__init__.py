@@ -0,0 +1,6 @@
+"""
+Command-line tools
+
+Run as modules from the backend directory, e.g.
+``python -m app.cli.import_data --email user@example.com export.csv``.
+"""
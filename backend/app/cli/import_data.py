@@ -0,0 +1,102 @@
+"""
+Import historical data from a CSV or NDJSON file
+
+Usage:
+    python -m app.cli.import_data --email user@example.com data.csv
+    python -m app.cli.import_data --email user@example.com --map Mood=mood data.ndjson
+"""
+import argparse
+import sys
+
+from fastapi import HTTPException
+
+from app.utils.database import SessionLocal
+from app.models import User
+from app.services.import_service import (
+    IMPORT_CHUNK_SIZE, ImportProgress, ImportService, iter_csv_rows, iter_ndjson_rows
+)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Import historical FeelInk data")
+    parser.add_argument("path", help="CSV or NDJSON file")
+    parser.add_argument("--email", required=True, help="Email of the user to import for")
+    parser.add_argument(
+        "--format", choices=("csv", "ndjson"),
+        help="File format (default: from the file extension)"
+    )
+    parser.add_argument(
+        "--map", action="append", default=[], metavar="COLUMN=NAME_KEY",
+        help="Map a column to a metric name_key (repeatable)"
+    )
+    parser.add_argument(
+        "--no-create", action="store_true",
+        help="Ignore columns without a matching metric instead of creating one"
+    )
+    parser.add_argument(
+        "--category", default="wellness",
+        choices=("physical", "psychological", "triggers", "medications", "selfcare", "wellness", "notes"),
+        help="Category of created metrics"
+    )
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    return parser.parse_args(argv)
+
+
+def print_progress(report: ImportProgress) -> None:
+    print(
+        f"{report.rows_read} rows read, {report.entries_created} entries created, "
+        f"{report.rows_skipped} skipped, {report.error_count} errors",
+        file=sys.stderr
+    )
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    column_map = {}
+    for mapping in args.map:
+        column, sep, name_key = mapping.partition("=")
+        if not sep:
+            sys.exit(f"Invalid --map '{mapping}' (expected COLUMN=NAME_KEY)")
+        column_map[column] = name_key
+
+    file_format = args.format or (
+        "ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv"
+    )
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == args.email).first()
+        if not user:
+            sys.exit(f"No user with email {args.email}")
+
+        with open(args.path, encoding="utf-8-sig", newline="") as stream:
+            rows = iter_csv_rows(stream) if file_format == "csv" else iter_ndjson_rows(stream)
+            report = ImportService.import_rows(
+                db, user, rows,
+                column_map=column_map,
+                create_missing=not args.no_create,
+                category=args.category,
+                chunk_size=args.chunk_size,
+                progress=print_progress
+            )
+    except HTTPException as e:
+        sys.exit(f"Import failed: {e.detail}")
+    except ValueError as e:
+        sys.exit(f"Invalid {file_format} file: {e}")
+    finally:
+        db.close()
+
+    if report.metrics_created:
+        print(f"Created metrics: {', '.join(report.metrics_created)}")
+    for error in report.errors:
+        print(f"Row {error['row']}: {error['detail']}")
+    if report.error_count > len(report.errors):
+        print(f"... and {report.error_count - len(report.errors)} more errors")
+    print(f"Imported {report.entries_created} entries ({report.values_created} values)")
+
+    return 1 if report.error_count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,12 +2,28 @@
 FeelInk Backend - Main Application Entry Point
 """
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from typing import Optional
+import hmac
 import os
 
 from app.api import auth_router, users_router, metrics_router, entries_router, analytics_router
 from app.utils.database import init_db
+from app.security.password import password_executor
+from app.middleware import MetricsMiddleware, ProfilingMiddleware, QueryStatsMiddleware, RateLimitMiddleware
+from app.middleware.profiling import PROFILING_ENABLED
+from app.middleware.rate_limit import RATE_LIMIT_ENABLED
+from app.utils.telemetry import registry
+
+# Request metrics and the /metrics endpoint; set METRICS_TOKEN to require
+# "Authorization: Bearer <token>" from the scraper
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+# Server-Timing header with per-request SQL count/time and query budget warnings
+QUERY_STATS_ENABLED = os.getenv("QUERY_STATS_ENABLED", "true").lower() == "true"
 
 # Lifespan context manager for startup/shutdown events
 @asynccontextmanager
@@ -17,7 +33,7 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown: Cleanup if needed
     pass
-from app.api import auth_router, users_router, metrics_router, entries_router, analytics_router, demo_data_router
+from app.api import auth_router, users_router, metrics_router, entries_router, analytics_router, demo_data_router, sync_router, import_router, export_router
 
 # Create FastAPI application
 app = FastAPI(
@@ -29,6 +45,18 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# ?__profile=1 for PROFILING_ADMIN_IDS; not installed unless PROFILING_ENABLED
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Count the SQL statements of each request
+if QUERY_STATS_ENABLED:
+    app.add_middleware(QueryStatsMiddleware)
+
+# Rate limit expensive routes (inside CORS so 429s stay readable)
+if RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
 # Configure CORS
 origins = os.getenv("CORS_ORIGINS", "http://localhost:5173").split(",")
 
@@ -38,8 +66,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset", "Retry-After"],
 )
 
+# Outermost, so rate-limited and CORS responses are counted too
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Include API routers
 app.include_router(auth_router, prefix="/api/v1")
 app.include_router(users_router, prefix="/api/v1")
@@ -47,6 +80,9 @@ app.include_router(metrics_router, prefix="/api/v1")
 app.include_router(entries_router, prefix="/api/v1")
 app.include_router(analytics_router, prefix="/api/v1/analytics", tags=["analytics"])
 app.include_router(demo_data_router, prefix="/api/v1")
+app.include_router(sync_router, prefix="/api/v1")
+app.include_router(import_router, prefix="/api/v1")
+app.include_router(export_router, prefix="/api/v1")
 
 
 # Health check endpoint
@@ -56,10 +92,21 @@ async def health_check():
     return {
         "status": "healthy",
         "service": "FeelInk Backend",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "password_hashing": password_executor.stats()
     }
 
 
+# Prometheus scrape endpoint
+if METRICS_ENABLED:
+    @app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+    async def metrics(authorization: Optional[str] = Header(None)):
+        """Request, database pool and analytics metrics in the Prometheus text format"""
+        if METRICS_TOKEN and not hmac.compare_digest(authorization or "", f"Bearer {METRICS_TOKEN}"):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 # Hello World endpoint (STAGE 0 deliverable)
 @app.get("/")
 async def root():
@@ -83,7 +130,8 @@ async def api_root():
             "auth": "/api/v1/auth",
             "users": "/api/v1/users",
             "metrics": "/api/v1/metrics",
-            "entries": "/api/v1/entries"
+            "entries": "/api/v1/entries",
+            "sync": "/api/v1/sync"
         },
         "documentation": {
             "swagger": "/docs",
@@ -0,0 +1,14 @@
+"""
+ASGI middleware
+"""
+from .metrics import MetricsMiddleware
+from .profiling import ProfilingMiddleware
+from .query_stats import QueryStatsMiddleware
+from .rate_limit import RateLimitMiddleware
+
+__all__ = [
+    "MetricsMiddleware",
+    "ProfilingMiddleware",
+    "QueryStatsMiddleware",
+    "RateLimitMiddleware",
+]
@@ -0,0 +1,49 @@
+"""
+Request metrics: count, status and latency per route template
+
+Requests are labelled with the path template of the matched route
+(/api/v1/entries/{entry_id}), never the raw path, so the number of series
+stays bounded. Requests that match no route share the "unmatched" label.
+
+Middlewares that answer before routing (the rate limiter's 429s) can set
+scope["route_template"] to the template of the route they stand for.
+"""
+import time
+
+from app.utils.telemetry import http_requests_total, http_request_duration_seconds
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording http_requests_total and http_request_duration_seconds"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the (shared) scope
+            route = scope.get("route")
+            template = (
+                getattr(route, "path_format", None)
+                or scope.get("route_template")
+                or UNMATCHED_ROUTE
+            )
+            method = scope["method"]
+            http_request_duration_seconds.observe(time.perf_counter() - start, method, template)
+            http_requests_total.inc(method, template, str(status_code))
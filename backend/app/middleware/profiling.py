@@ -0,0 +1,156 @@
+"""
+On-demand request profiling with ?__profile=1
+
+When PROFILING_ENABLED is set, a request carrying __profile=1 from a user
+listed in PROFILING_ADMIN_IDS runs under the sampling profiler. The
+normal response is discarded and replaced by a JSON report: status and
+duration of the request, the top functions and the collapsed stacks
+(paste into speedscope, or feed to flamegraph.pl). With PROFILING_DIR set
+the collapsed stacks are also written there.
+
+Sampled threads are the event loop thread while it is busy, and the
+threadpool worker running the route's endpoint, so concurrent requests
+to other routes stay out of the profile. The flag is ignored for
+everybody else, and when PROFILING_ENABLED is unset the middleware is
+not installed at all.
+"""
+from datetime import datetime, timezone
+from typing import FrozenSet, Optional
+import json
+import os
+import re
+import threading
+import time
+
+from app.security.jwt import verify_token
+from app.utils.sampling_profiler import SamplingProfiler
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILING_ADMIN_IDS = frozenset(
+    int(user_id) for user_id in os.getenv("PROFILING_ADMIN_IDS", "").split(",") if user_id.strip()
+)
+# Seconds between samples; CPU-bound Python code only releases the GIL to
+# the sampler every sys.getswitchinterval() (5ms), so shorter intervals
+# add no resolution there
+PROFILING_INTERVAL = float(os.getenv("PROFILING_INTERVAL", "0.005"))
+PROFILING_DIR = os.getenv("PROFILING_DIR")
+
+PROFILE_FLAG = re.compile(rb"(^|&)__profile=1(&|$)")
+
+
+def _admin_id(scope: dict, admin_ids: FrozenSet[int]) -> Optional[int]:
+    """ID of the user of a valid bearer token, if it is in admin_ids"""
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer":
+                return None
+            payload = verify_token(token, token_type="access")
+            user_id = payload.get("sub") if payload else None
+            return user_id if user_id in admin_ids else None
+    return None
+
+
+def _idle(frame) -> bool:
+    """Whether the event loop is waiting for I/O"""
+    return frame.f_code.co_filename.endswith("selectors.py")
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware serving profiles for ?__profile=1 requests of admins
+
+    Args:
+        app: Wrapped ASGI application
+        admin_ids: User IDs allowed to profile; defaults to PROFILING_ADMIN_IDS
+        interval: Seconds between samples; defaults to PROFILING_INTERVAL
+        output_dir: Directory for collapsed stacks; defaults to PROFILING_DIR
+    """
+
+    def __init__(
+        self,
+        app,
+        admin_ids: Optional[FrozenSet[int]] = None,
+        interval: Optional[float] = None,
+        output_dir: Optional[str] = None
+    ):
+        self.app = app
+        self.admin_ids = PROFILING_ADMIN_IDS if admin_ids is None else frozenset(admin_ids)
+        self.interval = PROFILING_INTERVAL if interval is None else interval
+        self.output_dir = PROFILING_DIR if output_dir is None else output_dir
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or b"__profile" not in scope.get("query_string", b"")
+            or not PROFILE_FLAG.search(scope["query_string"])
+        ):
+            return await self.app(scope, receive, send)
+
+        user_id = _admin_id(scope, self.admin_ids)
+        if user_id is None:
+            return await self.app(scope, receive, send)
+
+        loop_thread = threading.get_ident()
+
+        def include(ident, frame) -> bool:
+            if ident == loop_thread:
+                return not _idle(frame)
+            # The router stores the matched endpoint in the shared scope
+            code = getattr(scope.get("endpoint"), "__code__", None)
+            while frame is not None:
+                if frame.f_code is code:
+                    return True
+                frame = frame.f_back
+            return False
+
+        status_code = 500
+
+        async def discard(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        start = time.perf_counter()
+        with SamplingProfiler(self.interval, include) as profiler:
+            await self.app(scope, receive, discard)
+        duration = time.perf_counter() - start
+
+        collapsed = profiler.collapsed()
+        path = self._save(scope, user_id, collapsed) if self.output_dir else None
+
+        body = json.dumps({
+            "profile": {
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status_code,
+                "duration_ms": round(duration * 1000, 3),
+                "interval_ms": self.interval * 1000,
+                "samples": profiler.samples,
+            },
+            "top": profiler.top(),
+            "collapsed": collapsed,
+            "file": path,
+        }).encode()
+
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"cache-control", b"no-store"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    def _save(self, scope: dict, user_id: int, collapsed: str) -> str:
+        """Write collapsed stacks to output_dir and return the file path"""
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        route = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_") or "root"
+        path = os.path.join(self.output_dir, f"{stamp}-{scope['method']}-{route}-u{user_id}.folded")
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(collapsed)
+        return path
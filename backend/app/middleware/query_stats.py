@@ -0,0 +1,58 @@
+"""
+Per-request SQL statistics: Server-Timing header and query budget warnings
+
+Every response carries "Server-Timing: db;dur=<ms>;desc="<n> queries"".
+Statements run while streaming a body are counted in the budget check
+but not in the header, which is sent first. Requests over their route's
+budget, or repeating one statement SQL_REPEAT_THRESHOLD times (the N+1
+pattern), are logged with the offending statements.
+"""
+from typing import Dict, Optional, Tuple
+import logging
+
+from app.middleware.metrics import UNMATCHED_ROUTE
+from app.utils.query_stats import SQL_QUERY_BUDGET, start_request
+from app.utils.telemetry import db_queries_per_request
+
+logger = logging.getLogger(__name__)
+
+# (method, route template) -> budget overriding SQL_QUERY_BUDGET; None disables
+# the check for routes that write in batches
+QUERY_BUDGETS: Dict[Tuple[str, str], Optional[int]] = {
+    ("POST", "/api/v1/import"): None,
+    ("POST", "/api/v1/demo-data/generate"): None,
+    ("POST", "/api/v1/sync"): None,
+}
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware recording the SQL statements of each request"""
+
+    def __init__(self, app, budgets: Optional[Dict[Tuple[str, str], Optional[int]]] = None):
+        self.app = app
+        self.budgets = QUERY_BUDGETS if budgets is None else budgets
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = start_request()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", stats.server_timing().encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            route = getattr(scope.get("route"), "path_format", None) or UNMATCHED_ROUTE
+            method = scope["method"]
+            if stats.count:
+                db_queries_per_request.observe(stats.count, method, route)
+
+            problems = stats.problems(self.budgets.get((method, route), SQL_QUERY_BUDGET))
+            if problems:
+                logger.warning(f"[SQL] {method} {route}: " + "; ".join(problems))
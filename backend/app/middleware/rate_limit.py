@@ -0,0 +1,251 @@
+"""
+Token-bucket rate limiting for expensive routes
+
+Each limited route has a bucket of `capacity` requests per client that
+refills continuously over `per_seconds`. Clients are identified by user
+when the bearer token is already in the principal cache (i.e. it was
+verified on an earlier request) and by IP address otherwise, so unknown
+or forged tokens cannot be used to get fresh buckets.
+
+Limited responses carry RateLimit-Limit, RateLimit-Remaining and
+RateLimit-Reset headers (IETF draft); rejected ones get 429 with
+Retry-After. Unlisted routes cost one dict lookup.
+
+Buckets live in process memory. Set RATE_LIMIT_REDIS_URL to share them
+between workers through Redis (one atomic script call per request).
+"""
+from dataclasses import dataclass
+from math import ceil
+from typing import Dict, List, Optional, Tuple
+import json
+import os
+import time
+
+from app.security.principal_cache import principal_cache
+from app.utils.telemetry import rate_limited_requests_total
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL")
+
+# Use the first X-Forwarded-For address as client IP (only behind a proxy
+# that sets it)
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"
+
+# In-memory store: drop refilled buckets once this many are held
+MAX_BUCKETS = 100_000
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Burst of `capacity` requests, refilled evenly over `per_seconds`"""
+    capacity: int
+    per_seconds: float
+    key: str = "user"  # "user" (falls back to IP) or "ip"
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.per_seconds
+
+
+# (method, path) -> limit
+RATE_LIMITS: Dict[Tuple[str, str], RateLimit] = {
+    ("POST", "/api/v1/auth/login"): RateLimit(10, 60, key="ip"),
+    ("POST", "/api/v1/auth/register"): RateLimit(5, 3600, key="ip"),
+    ("POST", "/api/v1/auth/refresh"): RateLimit(30, 60, key="ip"),
+    ("POST", "/api/v1/analytics/correlations"): RateLimit(20, 60),
+    ("POST", "/api/v1/analytics/comparison"): RateLimit(20, 60),
+    ("POST", "/api/v1/analytics/group-differences"): RateLimit(20, 60),
+    ("POST", "/api/v1/analytics/event-study"): RateLimit(20, 60),
+    ("POST", "/api/v1/demo-data/generate"): RateLimit(3, 600),
+    ("POST", "/api/v1/import"): RateLimit(5, 300),
+    ("GET", "/api/v1/export"): RateLimit(5, 300),
+}
+
+# Longest time any configured bucket takes to refill completely
+MAX_REFILL_SECONDS = max(limit.per_seconds for limit in RATE_LIMITS.values())
+
+
+class InMemoryBucketStore:
+    """
+    Buckets of a single process
+
+    Only used from the event loop, so updates need no lock.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[str, List[float]] = {}  # key -> [tokens, updated_at]
+
+    async def take(self, key: str, limit: RateLimit) -> Tuple[bool, float]:
+        return self.take_at(key, limit, time.monotonic())
+
+    def take_at(self, key: str, limit: RateLimit, now: float) -> Tuple[bool, float]:
+        """
+        Take one token from a bucket
+
+        Returns:
+            Tuple of (allowed, tokens left)
+        """
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= MAX_BUCKETS:
+                self._purge(now)
+            bucket = self._buckets[key] = [float(limit.capacity), now]
+        else:
+            bucket[0] = min(limit.capacity, bucket[0] + (now - bucket[1]) * limit.rate)
+            bucket[1] = now
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return True, bucket[0]
+        return False, bucket[0]
+
+    def _purge(self, now: float) -> None:
+        """Forget buckets idle long enough to have refilled"""
+        self._buckets = {
+            k: b for k, b in self._buckets.items()
+            if now - b[1] < MAX_REFILL_SECONDS
+        }
+
+    async def clear(self) -> None:
+        # Async like RedisBucketStore.clear, so callers need not know the store
+        self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - updated_at, 0) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBucketStore:
+    """Buckets shared by all workers"""
+
+    def __init__(self, client, prefix: str = "feelink:ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+        self._take = client.register_script(TAKE_SCRIPT)
+
+    async def take(self, key: str, limit: RateLimit) -> Tuple[bool, float]:
+        allowed, tokens = await self._take(
+            keys=[self.prefix + key],
+            args=[limit.capacity, limit.rate, time.time()]
+        )
+        return bool(allowed), float(tokens)
+
+    async def clear(self) -> None:
+        async for key in self.client.scan_iter(f"{self.prefix}*"):
+            await self.client.delete(key)
+
+
+def _create_store():
+    if RATE_LIMIT_REDIS_URL:
+        import redis.asyncio
+        return RedisBucketStore(redis.asyncio.Redis.from_url(RATE_LIMIT_REDIS_URL))
+    return InMemoryBucketStore()
+
+
+rate_limit_store = _create_store()
+
+
+def _client_ip(scope: dict) -> str:
+    if RATE_LIMIT_TRUST_FORWARDED:
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _user_id(scope: dict) -> Optional[int]:
+    """User of an already verified bearer token, without verifying it again"""
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                principal = principal_cache.get(token)
+                return principal.id if principal else None
+            return None
+    return None
+
+
+def rate_limit_headers(limit: RateLimit, tokens: float) -> List[Tuple[bytes, bytes]]:
+    """RateLimit-* headers for the state of a bucket"""
+    reset = ceil((limit.capacity - tokens) / limit.rate)
+    return [
+        (b"ratelimit-limit", str(limit.capacity).encode()),
+        (b"ratelimit-remaining", str(int(tokens)).encode()),
+        (b"ratelimit-reset", str(reset).encode()),
+        (b"ratelimit-policy", f"{limit.capacity};w={int(limit.per_seconds)}".encode()),
+    ]
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware applying RATE_LIMITS
+
+    Args:
+        app: Wrapped ASGI application
+        limits: (method, path) -> RateLimit; defaults to RATE_LIMITS
+        store: Bucket store; defaults to rate_limit_store
+    """
+
+    def __init__(self, app, limits: Optional[Dict[Tuple[str, str], RateLimit]] = None, store=None):
+        self.app = app
+        self.limits = RATE_LIMITS if limits is None else limits
+        self.store = rate_limit_store if store is None else store
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        limit = self.limits.get((scope["method"], scope["path"]))
+        if limit is None:
+            return await self.app(scope, receive, send)
+
+        user_id = _user_id(scope) if limit.key == "user" else None
+        client = f"user:{user_id}" if user_id is not None else f"ip:{_client_ip(scope)}"
+        key = f"{scope['method']} {scope['path']} {client}"
+
+        allowed, tokens = await self.store.take(key, limit)
+        headers = rate_limit_headers(limit, tokens)
+
+        if not allowed:
+            rate_limited_requests_total.inc(scope["method"], scope["path"])
+            # The route is never reached; limited paths are literal route templates
+            scope["route_template"] = scope["path"]
+            retry_after = ceil((1 - tokens) / limit.rate)
+            body = json.dumps({"detail": "Rate limit exceeded, please retry later"}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": headers + [
+                    (b"retry-after", str(retry_after).encode()),
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
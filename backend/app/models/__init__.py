@@ -5,6 +5,7 @@ from .base import Base
 from .user import User
 from .metric import Metric
 from .entry import Entry, EntryValue
+from .tombstone import Tombstone
 
 __all__ = [
     "Base",
@@ -12,4 +13,5 @@ __all__ = [
     "Metric",
     "Entry",
     "EntryValue",
+    "Tombstone",
 ]
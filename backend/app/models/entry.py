@@ -3,7 +3,7 @@ Entry and EntryValue models
 """
 from sqlalchemy import (
     Column, Integer, String, Text, Boolean, Numeric, Date, DateTime,
-    ForeignKey, CheckConstraint, UniqueConstraint
+    ForeignKey, CheckConstraint, UniqueConstraint, Index
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -44,6 +44,7 @@ class Entry(Base, TimestampMixin):
             "entry_date <= CURRENT_DATE",
             name="check_entry_date_not_future"
         ),
+        Index('idx_entries_user_updated', 'user_id', 'updated_at'),
     )
 
     def __repr__(self):
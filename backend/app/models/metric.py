@@ -3,7 +3,7 @@ Metric model
 """
 from sqlalchemy import (
     Column, Integer, String, Text, Boolean, Numeric,
-    ForeignKey, CheckConstraint, UniqueConstraint
+    ForeignKey, CheckConstraint, UniqueConstraint, Index
 )
 from sqlalchemy.orm import relationship
 from .base import Base, TimestampMixin
@@ -67,6 +67,7 @@ class Metric(Base, TimestampMixin):
             "(min_value IS NOT NULL AND max_value IS NOT NULL AND min_value < max_value)",
             name="check_valid_range"
         ),
+        Index('idx_metrics_user_updated', 'user_id', 'updated_at'),
     )
 
     def __repr__(self):
@@ -0,0 +1,47 @@
+"""
+Tombstone model
+"""
+from sqlalchemy import (
+    Column, Integer, String, Date, DateTime,
+    ForeignKey, CheckConstraint, Index
+)
+from sqlalchemy.sql import func
+from .base import Base
+
+
+class Tombstone(Base):
+    """Record of a deleted entry or metric, used by delta sync"""
+    __tablename__ = "tombstones"
+
+    # Primary Key
+    id = Column(Integer, primary_key=True)
+
+    # Foreign Key
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    # Deleted object
+    entity_type = Column(String(20), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    entry_date = Column(Date, nullable=True)  # Entries only
+
+    deleted_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+
+    # Constraints
+    __table_args__ = (
+        CheckConstraint(
+            "entity_type IN ('entry', 'metric')",
+            name="check_entity_type"
+        ),
+        Index('idx_tombstones_user_deleted', 'user_id', 'deleted_at'),
+    )
+
+    def __repr__(self):
+        return f"<Tombstone(entity_type={self.entity_type}, entity_id={self.entity_id})>"
@@ -1,7 +1,7 @@
 """
 User model
 """
-from sqlalchemy import Column, Integer, String, DateTime, CheckConstraint
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, CheckConstraint
 from sqlalchemy.orm import relationship
 from .base import Base, TimestampMixin
 
@@ -34,6 +34,14 @@ class User(Base, TimestampMixin):
         server_default='UTC'
     )
 
+    # Incremented on every change to the user's entries or metrics
+    data_version = Column(
+        BigInteger,
+        default=0,
+        nullable=False,
+        server_default='0'
+    )
+
     # Soft delete
     deleted_at = Column(DateTime(timezone=True), nullable=True)
 
@@ -22,7 +22,22 @@ from .entry import (
     EntryResponse,
     EntryListResponse,
     EntryValueCreate,
+    EntryValueUpdate,
     EntryValueResponse,
+    EntryBatchCreate,
+    EntryBatchResult,
+    EntryBatchResponse,
+)
+from .data_import import (
+    ImportRowError,
+    ImportResponse,
+)
+from .sync import (
+    TombstoneResponse,
+    SyncResponse,
+    SyncUpload,
+    SyncUploadResult,
+    SyncUploadResponse,
 )
 
 __all__ = [
@@ -45,5 +60,18 @@ __all__ = [
     "EntryResponse",
     "EntryListResponse",
     "EntryValueCreate",
+    "EntryValueUpdate",
     "EntryValueResponse",
+    "EntryBatchCreate",
+    "EntryBatchResult",
+    "EntryBatchResponse",
+    # Import schemas
+    "ImportRowError",
+    "ImportResponse",
+    # Sync schemas
+    "TombstoneResponse",
+    "SyncResponse",
+    "SyncUpload",
+    "SyncUploadResult",
+    "SyncUploadResponse",
 ]
@@ -3,7 +3,7 @@ Analytics API schemas
 """
 
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import date
 
 
@@ -37,6 +37,10 @@ class CorrelationRequest(BaseModel):
         False,
         description="Return only statistically significant correlations"
     )
+    debug: bool = Field(
+        False,
+        description="Include phase timings and work counters in the response"
+    )
 
     class Config:
         json_schema_extra = {
@@ -86,12 +90,26 @@ class CorrelationResultSchema(BaseModel):
         }
 
 
+class AnalyticsDebug(BaseModel):
+    """Where the time of an analysis went"""
+    spans_ms: Dict[str, float] = Field(
+        description="Milliseconds per phase: load, pivot, compute (coefficients and p-values), rank, serialize"
+    )
+    counters: Dict[str, int] = Field(
+        description="Work counters: pairs_evaluated, lags_tested, lags_skipped, pairs_skipped"
+    )
+
+
 class CorrelationResponse(BaseModel):
     """Response schema for correlation analysis"""
     correlations: List[CorrelationResultSchema]
     algorithm_used: str
     date_range: dict
     total_correlations: int
+    debug: Optional[AnalyticsDebug] = Field(
+        None,
+        description="Phase timings, present when the request sets debug"
+    )
 
     class Config:
         json_schema_extra = {
@@ -160,3 +178,340 @@ class StatisticsResponse(BaseModel):
                 }
             }
         }
+
+
+class PeriodComparisonRequest(BaseModel):
+    """Request schema for period-over-period comparison"""
+    metric_ids: Optional[List[int]] = Field(
+        None,
+        description="List of metric IDs to compare (default: all)"
+    )
+    current_from: date = Field(description="Start of the current period")
+    current_to: date = Field(description="End of the current period")
+    previous_from: Optional[date] = Field(
+        None,
+        description="Start of the previous period (default: same length, right before current period)"
+    )
+    previous_to: Optional[date] = Field(
+        None,
+        description="End of the previous period"
+    )
+    min_significance: float = Field(
+        0.05,
+        description="P-value threshold for significance"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "current_from": "2024-06-01",
+                "current_to": "2024-06-30",
+                "previous_from": "2024-05-01",
+                "previous_to": "2024-05-31"
+            }
+        }
+
+
+class MetricComparison(BaseModel):
+    """Comparison of a single metric between two periods"""
+    metric_id: int
+    metric_name: str
+    value_type: str
+    current_count: int = Field(description="Number of values in the current period")
+    current_mean: Optional[float] = Field(description="Mean in the current period")
+    previous_count: int = Field(description="Number of values in the previous period")
+    previous_mean: Optional[float] = Field(description="Mean in the previous period")
+    delta: Optional[float] = Field(description="current_mean - previous_mean")
+    effect_size: Optional[float] = Field(description="Cohen's d (pooled standard deviation)")
+    p_value: Optional[float] = Field(description="Welch's t-test p-value (two-sided)")
+    significant: bool = Field(description="Is statistically significant")
+
+
+class PeriodComparisonResponse(BaseModel):
+    """Response schema for period-over-period comparison"""
+    comparisons: List[MetricComparison]
+    current_period: dict
+    previous_period: dict
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "comparisons": [
+                    {
+                        "metric_id": 3,
+                        "metric_name": "Mood",
+                        "value_type": "range",
+                        "current_count": 28,
+                        "current_mean": 7.1,
+                        "previous_count": 30,
+                        "previous_mean": 6.4,
+                        "delta": 0.7,
+                        "effect_size": 0.52,
+                        "p_value": 0.048,
+                        "significant": True
+                    }
+                ],
+                "current_period": {"from": "2024-06-01", "to": "2024-06-30"},
+                "previous_period": {"from": "2024-05-01", "to": "2024-05-31"}
+            }
+        }
+
+
+class SeasonalityProfile(BaseModel):
+    """Day-of-week and month-of-year profile of a single metric"""
+    metric_id: int
+    metric_name: str
+    value_type: str
+    weekday_means: List[Optional[float]] = Field(description="Mean per weekday, Monday first")
+    weekday_counts: List[int] = Field(description="Number of values per weekday, Monday first")
+    month_means: List[Optional[float]] = Field(description="Mean per month, January first")
+    month_counts: List[int] = Field(description="Number of values per month, January first")
+    weekly_autocorrelation: Optional[float] = Field(description="Autocorrelation at lag 7 days")
+
+
+class SeasonalityResponse(BaseModel):
+    """Response schema for seasonality endpoint"""
+    profiles: List[SeasonalityProfile]
+    date_range: dict
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "profiles": [
+                    {
+                        "metric_id": 7,
+                        "metric_name": "stress_level",
+                        "value_type": "range",
+                        "weekday_means": [5.9, 5.4, 5.6, 5.5, 5.2, 3.6, 3.4],
+                        "weekday_counts": [22, 21, 23, 22, 20, 19, 21],
+                        "month_means": [None, None, None, None, 5.1, 5.0, 4.9, None, None, None, None, None],
+                        "month_counts": [0, 0, 0, 0, 31, 30, 28, 0, 0, 0, 0, 0],
+                        "weekly_autocorrelation": 0.41
+                    }
+                ],
+                "date_range": {
+                    "from": "2024-05-01",
+                    "to": "2024-07-31"
+                }
+            }
+        }
+
+
+class TimeSeriesResponse(BaseModel):
+    """Columnar time series of a single metric"""
+    metric_id: int
+    metric_name: str
+    value_type: str
+    dates: List[date] = Field(description="Observation dates, ascending")
+    values: List[float] = Field(description="Values aligned with dates (booleans as 0/1)")
+    total_points: int = Field(description="Number of observations before downsampling")
+    downsampled: bool = Field(description="Whether LTTB downsampling was applied")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "metric_id": 3,
+                "metric_name": "mood",
+                "value_type": "range",
+                "dates": ["2024-06-01", "2024-06-02", "2024-06-05"],
+                "values": [6.5, 7.0, 5.5],
+                "total_points": 3,
+                "downsampled": False
+            }
+        }
+
+
+class GroupDifferenceRequest(BaseModel):
+    """Request schema for with-vs-without analysis"""
+    metric_ids: Optional[List[int]] = Field(
+        None,
+        description="List of metric IDs to analyze (default: all)"
+    )
+    date_from: Optional[date] = Field(
+        None,
+        description="Start date for analysis"
+    )
+    date_to: Optional[date] = Field(
+        None,
+        description="End date for analysis"
+    )
+    max_lag: int = Field(
+        1,
+        ge=0,
+        le=14,
+        description="Maximum lag in days (0 = same day)"
+    )
+    min_group_size: int = Field(
+        3,
+        ge=2,
+        description="Minimum number of days in each group"
+    )
+    min_significance: float = Field(
+        0.05,
+        description="P-value threshold for significance"
+    )
+    only_significant: bool = Field(
+        False,
+        description="Return only statistically significant differences"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "max_lag": 1,
+                "only_significant": True
+            }
+        }
+
+
+class GroupDifferenceSchema(BaseModel):
+    """Difference of a numeric metric between days with and without a boolean metric"""
+    condition_metric_id: int
+    condition_metric_name: str
+    outcome_metric_id: int
+    outcome_metric_name: str
+    lag: int = Field(description="Outcome measured this many days after the condition")
+    with_count: int
+    with_mean: float
+    without_count: int
+    without_mean: float
+    difference: float = Field(description="with_mean - without_mean")
+    effect_size: float = Field(description="Cohen's d (pooled standard deviation)")
+    p_value: Optional[float] = Field(description="Welch's t-test p-value (two-sided)")
+    significant: bool = Field(description="Is statistically significant")
+
+
+class GroupDifferenceResponse(BaseModel):
+    """Response schema for with-vs-without analysis"""
+    differences: List[GroupDifferenceSchema]
+    date_range: dict
+    total_differences: int
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "differences": [
+                    {
+                        "condition_metric_id": 5,
+                        "condition_metric_name": "exercise",
+                        "outcome_metric_id": 3,
+                        "outcome_metric_name": "mood",
+                        "lag": 0,
+                        "with_count": 41,
+                        "with_mean": 7.6,
+                        "without_count": 97,
+                        "without_mean": 6.2,
+                        "difference": 1.4,
+                        "effect_size": 0.91,
+                        "p_value": 0.0001,
+                        "significant": True
+                    }
+                ],
+                "date_range": {"from": None, "to": None},
+                "total_differences": 1
+            }
+        }
+
+
+class EventStudyRequest(BaseModel):
+    """Request schema for event-study analysis"""
+    event_metric_ids: Optional[List[int]] = Field(
+        None,
+        description="Boolean metrics to treat as events (default: all boolean metrics)"
+    )
+    metric_ids: Optional[List[int]] = Field(
+        None,
+        description="Metrics whose response to report (default: all)"
+    )
+    date_from: Optional[date] = Field(
+        None,
+        description="Start date for analysis"
+    )
+    date_to: Optional[date] = Field(
+        None,
+        description="End date for analysis"
+    )
+    window: int = Field(
+        3,
+        ge=1,
+        le=14,
+        description="Days before and after each event"
+    )
+    event_value: bool = Field(
+        True,
+        description="Value marking an event day (false = e.g. missed medication)"
+    )
+    confidence: float = Field(
+        0.95,
+        gt=0,
+        lt=1,
+        description="Confidence level of the bands"
+    )
+    min_events: int = Field(
+        3,
+        ge=1,
+        description="Minimum number of events to report an event metric"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "event_metric_ids": [12],
+                "window": 3,
+                "event_value": True
+            }
+        }
+
+
+class EventResponseCurve(BaseModel):
+    """Mean response of one metric around the event days"""
+    metric_id: int
+    metric_name: str
+    baseline_mean: Optional[float] = Field(description="Mean over all days in the range")
+    mean: List[Optional[float]] = Field(description="Mean value per offset")
+    lower: List[Optional[float]] = Field(description="Lower confidence bound per offset")
+    upper: List[Optional[float]] = Field(description="Upper confidence bound per offset")
+    count: List[int] = Field(description="Number of observations per offset")
+
+
+class EventStudySchema(BaseModel):
+    """Response curves of all metrics around one event type"""
+    event_metric_id: int
+    event_metric_name: str
+    event_value: bool
+    event_count: int = Field(description="Number of event days")
+    offsets: List[int] = Field(description="Day offsets relative to the event (-window..window)")
+    responses: List[EventResponseCurve]
+
+
+class EventStudyResponse(BaseModel):
+    """Response schema for event-study analysis"""
+    events: List[EventStudySchema]
+    date_range: dict
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "events": [
+                    {
+                        "event_metric_id": 12,
+                        "event_metric_name": "alcohol",
+                        "event_value": True,
+                        "event_count": 24,
+                        "offsets": [-1, 0, 1],
+                        "responses": [
+                            {
+                                "metric_id": 3,
+                                "metric_name": "mood",
+                                "baseline_mean": 6.8,
+                                "mean": [6.9, 7.2, 5.9],
+                                "lower": [6.5, 6.8, 5.4],
+                                "upper": [7.3, 7.6, 6.4],
+                                "count": [23, 24, 22]
+                            }
+                        ]
+                    }
+                ],
+                "date_range": {"from": None, "to": None}
+            }
+        }
@@ -0,0 +1,21 @@
+"""
+Bulk import Pydantic schemas
+"""
+from pydantic import BaseModel
+
+
+class ImportRowError(BaseModel):
+    """A rejected row"""
+    row: int
+    detail: str
+
+
+class ImportResponse(BaseModel):
+    """Schema for bulk import summary"""
+    rows_read: int
+    entries_created: int
+    values_created: int
+    rows_skipped: int
+    error_count: int
+    errors: list[ImportRowError]
+    metrics_created: list[str]
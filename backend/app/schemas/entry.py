@@ -18,6 +18,11 @@ class EntryValueCreate(EntryValueBase):
     pass
 
 
+class EntryValueUpdate(BaseModel):
+    """Schema for setting a single entry value"""
+    value: Union[Decimal, bool, str]
+
+
 class EntryValueResponse(BaseModel):
     """Schema for entry value response"""
     id: int
@@ -73,5 +78,27 @@ class EntryResponse(BaseModel):
 class EntryListResponse(BaseModel):
     """Schema for list of entries response"""
     entries: list[EntryResponse]
-    total: int
+    total: Optional[int] = Field(None, description="Total matching entries, if requested")
     has_more: bool
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to get the next page")
+
+
+class EntryBatchCreate(BaseModel):
+    """Schema for creating many entries at once"""
+    entries: list[EntryCreate] = Field(min_length=1, max_length=366)
+
+
+class EntryBatchResult(BaseModel):
+    """Outcome of one entry in a batch"""
+    index: int
+    entry_date: date
+    status: str = Field(description="created or error")
+    entry_id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class EntryBatchResponse(BaseModel):
+    """Schema for batch create response"""
+    created: int
+    failed: int
+    results: list[EntryBatchResult]
@@ -0,0 +1,59 @@
+"""
+Delta sync Pydantic schemas
+"""
+from pydantic import BaseModel, Field
+from datetime import date, datetime
+from typing import Optional
+
+from .entry import EntryCreate, EntryResponse
+from .metric import MetricResponse
+
+
+class TombstoneResponse(BaseModel):
+    """Schema for a deleted entry or metric"""
+    entity_type: str
+    entity_id: int
+    entry_date: Optional[date]
+    deleted_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class SyncResponse(BaseModel):
+    """Schema for changes since a sync cursor"""
+    metrics: list[MetricResponse]
+    entries: list[EntryResponse]
+    deleted: list[TombstoneResponse]
+    next_cursor: datetime = Field(description="Pass as since on the next sync")
+    reset: bool = Field(
+        False,
+        description="True if this is a full snapshot and local data should be replaced"
+    )
+
+
+class SyncUpload(BaseModel):
+    """Schema for a batch of offline changes"""
+    entries: list[EntryCreate] = Field(
+        default_factory=list,
+        max_length=500,
+        description="Entries to create or replace, matched by entry_date"
+    )
+    deleted_entries: list[date] = Field(
+        default_factory=list,
+        max_length=500,
+        description="Dates of entries to delete"
+    )
+
+
+class SyncUploadResult(BaseModel):
+    """Outcome of one uploaded change"""
+    entry_date: date
+    status: str = Field(description="created, updated, deleted, not_found or error")
+    entry_id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class SyncUploadResponse(BaseModel):
+    """Schema for batch upload response"""
+    results: list[SyncUploadResult]
@@ -1,13 +1,14 @@
 """
 Security utilities for authentication and authorization
 """
-from .password import hash_password, verify_password
+from .password import hash_password, verify_password, verify_and_update_password
 from .jwt import create_access_token, create_refresh_token, verify_token
 from .dependencies import get_current_user, get_current_active_user
 
 __all__ = [
     "hash_password",
     "verify_password",
+    "verify_and_update_password",
     "create_access_token",
     "create_refresh_token",
     "verify_token",
@@ -3,24 +3,48 @@ FastAPI dependencies for authentication
 """
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 from typing import Optional
+import logging
 
 from app.utils.database import get_db
 from app.models import User
 from app.security.jwt import verify_token
+from app.security.principal_cache import Principal, principal_cache
+
+logger = logging.getLogger(__name__)
 
 # HTTP Bearer token security scheme
 security = HTTPBearer()
 
 
-async def get_current_user(
+def _user_from_principal(db: Session, principal: Principal) -> User:
+    """
+    Attach a User for a cached principal without querying.
+
+    The cached columns are populated; any other column is loaded from the
+    database on first access.
+    """
+    user = User(
+        id=principal.id,
+        language=principal.language,
+        timezone=principal.timezone,
+        deleted_at=None
+    )
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ) -> User:
     """
     Dependency to get the current authenticated user from JWT token.
 
+    Tokens that verified before are served from the principal cache
+    without decoding the JWT or querying the database.
+
     Args:
         credentials: Bearer token from Authorization header
         db: Database session
@@ -36,38 +60,47 @@ async def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    token = credentials.credentials
 
-    # Verify the token
-    import logging
-    logger = logging.getLogger(__name__)
-
-    logger.warning(f"[AUTH] Token received, preview: {credentials.credentials[:50]}...")
+    principal = principal_cache.get(token)
+    if principal is not None:
+        if principal.deleted:
+            raise credentials_exception
+        return _user_from_principal(db, principal)
 
-    payload = verify_token(credentials.credentials, token_type="access")
+    # Verify the token
+    payload = verify_token(token, token_type="access")
     if payload is None:
-        logger.error(f"[AUTH] Token verification FAILED - payload is None")
+        logger.debug("[AUTH] Token verification failed")
         raise credentials_exception
 
     # Get user ID from payload
     user_id: Optional[int] = payload.get("sub")
-    logger.warning(f"[AUTH] Token verified. Payload: {payload}, user_id: {user_id}")
-
     if user_id is None:
-        logger.error(f"[AUTH] No 'sub' claim in token payload")
+        logger.debug("[AUTH] No 'sub' claim in token payload")
         raise credentials_exception
 
     # Fetch user from database
     user = db.query(User).filter(User.id == user_id, User.deleted_at.is_(None)).first()
-    logger.warning(f"[AUTH] Database user query: found={user is not None}")
-
     if user is None:
-        logger.error(f"[AUTH] User with id {user_id} not found in database")
+        logger.debug(f"[AUTH] User with id {user_id} not found in database")
         raise credentials_exception
 
+    principal_cache.put(
+        token,
+        Principal(
+            id=user.id,
+            deleted=user.deleted_at is not None,
+            language=user.language,
+            timezone=user.timezone
+        ),
+        expires_at=payload.get("exp")
+    )
+
     return user
 
 
-async def get_current_active_user(
+def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
     """
@@ -4,7 +4,11 @@ JWT token generation and validation
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from jose import JWTError, jwt
+import logging
 import os
+import uuid
+
+logger = logging.getLogger(__name__)
 
 # Get secret key from environment
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
@@ -40,12 +44,16 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     return encoded_jwt
 
 
-def create_refresh_token(data: Dict[str, Any]) -> str:
+def create_refresh_token(data: Dict[str, Any], family: Optional[str] = None) -> str:
     """
     Create a new JWT refresh token.
 
+    Every token gets a unique ID (jti) and belongs to a family: a new one
+    on login, the family of the rotated token on refresh.
+
     Args:
         data: Payload data to encode in the token
+        family: Token family to continue (default: start a new one)
 
     Returns:
         Encoded JWT refresh token string
@@ -56,8 +64,15 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
     if "sub" in to_encode and isinstance(to_encode["sub"], int):
         to_encode["sub"] = str(to_encode["sub"])
 
-    expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "type": "refresh"})
+    now = datetime.utcnow()
+    expire = now + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    to_encode.update({
+        "exp": expire,
+        "iat": now,
+        "type": "refresh",
+        "jti": uuid.uuid4().hex,
+        "fam": family or uuid.uuid4().hex
+    })
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -93,18 +108,10 @@ def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, A
     Returns:
         Decoded payload if valid, None otherwise
     """
-    import logging
-    logger = logging.getLogger(__name__)
-
-    logger.warning(f"[JWT] Verifying token, expecting type: {token_type}")
-    logger.warning(f"[JWT] SECRET_KEY loaded: {SECRET_KEY == 'dev-secret-key-change-in-production'}")
-
     try:
         payload = decode_token(token)
-        logger.warning(f"[JWT] Token decoded successfully. Payload type: {payload.get('type')}, Expected: {token_type}")
-
         if payload.get("type") != token_type:
-            logger.error(f"[JWT] Token type mismatch: got {payload.get('type')}, expected {token_type}")
+            logger.debug(f"[JWT] Token type mismatch: got {payload.get('type')}, expected {token_type}")
             return None
 
         # Convert 'sub' back to int if it's a string
@@ -112,10 +119,10 @@ def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, A
             try:
                 payload["sub"] = int(payload["sub"])
             except ValueError:
-                logger.error(f"[JWT] Could not convert 'sub' to int: {payload['sub']}")
+                logger.debug(f"[JWT] Could not convert 'sub' to int: {payload['sub']}")
                 return None
 
         return payload
     except JWTError as e:
-        logger.error(f"[JWT] Token decode error: {str(e)}")
+        logger.debug(f"[JWT] Token decode error: {str(e)}")
         return None
@@ -1,10 +1,100 @@
 """
 Password hashing utilities using bcrypt
+
+bcrypt is deliberately slow (tens to hundreds of milliseconds of CPU per
+call). Hashing runs on a dedicated executor with one thread per core, and
+callers are turned away with 503 once too many are waiting, so a login
+storm neither oversubscribes the CPU nor ties up the request threadpool.
 """
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+import os
+import threading
+
+from app.utils.telemetry import registry
+
+# bcrypt cost factor; hashes with a different cost are upgraded on login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Hashing threads and the number of calls allowed to run or wait for one
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
 
 # Create password context with bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS
+)
+
+T = TypeVar("T")
+
+
+class BoundedExecutor:
+    """Thread pool that rejects work once max_pending calls are in flight"""
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def run(self, fn: Callable[..., T], *args) -> T:
+        """
+        Run fn on the pool and wait for the result.
+
+        Raises:
+            HTTPException: 503 if max_pending calls are already in flight
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many concurrent sign-ins, please retry",
+                    headers={"Retry-After": "1"}
+                )
+            self._pending += 1
+
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Current queue depth and lifetime counters"""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "pending": self._pending,
+                "queued": max(self._pending - self.workers, 0),
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+
+password_executor = BoundedExecutor(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
+
+registry.gauge(
+    "feelink_password_hash_pending",
+    "Password hashes running or waiting for a worker",
+    lambda: password_executor.stats()["pending"]
+)
+registry.gauge(
+    "feelink_password_hash_rejected_total",
+    "Password hashes rejected because the pool was saturated",
+    lambda: password_executor.stats()["rejected"],
+    type="counter"
+)
 
 
 def hash_password(password: str) -> str:
@@ -16,8 +106,11 @@ def hash_password(password: str) -> str:
 
     Returns:
         Hashed password string
+
+    Raises:
+        HTTPException: 503 if the hashing pool is saturated
     """
-    return pwd_context.hash(password)
+    return password_executor.run(pwd_context.hash, password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -30,5 +123,25 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
     Returns:
         True if password matches, False otherwise
+
+    Raises:
+        HTTPException: 503 if the hashing pool is saturated
+    """
+    return password_executor.run(pwd_context.verify, plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if it uses an outdated cost factor.
+
+    Args:
+        plain_password: Plaintext password to verify
+        hashed_password: Hashed password from database
+
+    Returns:
+        Tuple of (valid, new hash or None if no upgrade is needed)
+
+    Raises:
+        HTTPException: 503 if the hashing pool is saturated
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_executor.run(pwd_context.verify_and_update, plain_password, hashed_password)
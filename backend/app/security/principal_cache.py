@@ -0,0 +1,101 @@
+"""
+Cache of authenticated principals keyed by access token
+
+Verifying a JWT and loading its user on every request costs a signature
+check and a SELECT on users. A token that verified once maps to the same
+user until it expires, so the result is kept in process memory under the
+token's SHA-256 hash (raw tokens are never stored). Entries expire at the
+token's exp claim or after the TTL, whichever comes first, and
+UserService drops a user's entries when the profile changes or the
+account is deleted. The TTL bounds how long another worker process can
+keep accepting a token for an account deleted elsewhere.
+"""
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, Optional, Tuple
+import hashlib
+import os
+import time
+
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "300"))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+
+
+@dataclass(frozen=True)
+class Principal:
+    """What authentication needs to know about a user"""
+    id: int
+    deleted: bool
+    language: str
+    timezone: str
+
+
+def token_key(token: str) -> str:
+    """Cache key for a token"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class PrincipalCache:
+    """Thread-safe map of token hash -> Principal with per-entry expiry"""
+
+    def __init__(self, ttl: float = PRINCIPAL_CACHE_TTL, max_entries: int = PRINCIPAL_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[float, Principal]] = {}
+        self._lock = Lock()
+
+    def get(self, token: str) -> Optional[Principal]:
+        """
+        Get the principal of a previously verified token
+
+        Args:
+            token: Raw bearer token
+
+        Returns:
+            Principal, or None if unknown or expired
+        """
+        key = token_key(token)
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                return None
+            if cached[0] <= time.time():
+                del self._entries[key]
+                return None
+            return cached[1]
+
+    def put(self, token: str, principal: Principal, expires_at: Optional[float] = None) -> None:
+        """
+        Remember the principal of a verified token
+
+        Args:
+            token: Raw bearer token
+            principal: Authenticated principal
+            expires_at: Token expiry as a UNIX timestamp (the exp claim)
+        """
+        expiry = time.time() + self.ttl
+        if expires_at is not None:
+            expiry = min(expiry, expires_at)
+
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+            self._entries[token_key(token)] = (expiry, principal)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop all cached tokens of a user"""
+        with self._lock:
+            for key in [k for k, (_, p) in self._entries.items() if p.id == user_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+principal_cache = PrincipalCache()
@@ -0,0 +1,212 @@
+"""
+Refresh-token registry: rotation on use, reuse detection and revocation
+
+Refresh tokens stay signed JWTs, so issuing one stores nothing. Every
+token carries a unique jti and the id of its family (the chain of tokens
+descending from one login). The registry only records:
+
+- used jtis: a refresh marks the presented token as used and issues its
+  successor in the same family. Presenting a used token again means it
+  leaked, and the whole family is revoked.
+- revoked families: deny-list checked on every refresh. Kept for a full
+  refresh-token lifetime, since tokens rotated after the revoked one
+  outlive it.
+- per-user revocation time: tokens issued before it are rejected
+  (account deletion, sign-out everywhere).
+
+Tokens issued before rotation carry neither jti nor family. They are
+accepted once, keyed by user and expiry, and their successor starts a
+new family, so existing sessions survive the upgrade.
+
+Every record is a single key with a TTL no longer than the refresh-token
+lifetime, so all checks are O(1) lookups and the store never holds more
+than a month of state. Records live in process memory, or in Redis when
+REDIS_URL is set so that all workers share them.
+"""
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+import logging
+import os
+import time
+import uuid
+
+from app.security.jwt import REFRESH_TOKEN_EXPIRE_DAYS
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL")
+
+# A used token presented again within this window is rejected without
+# revoking its family: clients racing two refreshes (e.g. two tabs)
+# are not treated as token theft
+REFRESH_REUSE_GRACE_SECONDS = float(os.getenv("REFRESH_REUSE_GRACE_SECONDS", "10"))
+
+# In-memory store: purge expired records once this many are held
+MEMORY_STORE_PURGE_THRESHOLD = 100_000
+
+
+class TokenRevokedError(Exception):
+    """The refresh token was used before, or its family or user was revoked"""
+
+
+class InMemoryTokenStore:
+    """Thread-safe store for a single process"""
+
+    def __init__(self):
+        self._records: Dict[str, Tuple[float, float]] = {}  # key -> (expires_at, value)
+        self._lock = Lock()
+
+    def _purge(self, now: float) -> None:
+        if len(self._records) >= MEMORY_STORE_PURGE_THRESHOLD:
+            self._records = {k: r for k, r in self._records.items() if r[0] > now}
+
+    def _get(self, key: str, now: float) -> Optional[float]:
+        record = self._records.get(key)
+        return record[1] if record is not None and record[0] > now else None
+
+    def claim(self, key: str, value: float, ttl: float) -> Optional[float]:
+        """
+        Set key unless it exists
+
+        Returns:
+            None if the key was set, otherwise its current value
+        """
+        now = time.time()
+        with self._lock:
+            existing = self._get(key, now)
+            if existing is not None:
+                return existing
+            self._purge(now)
+            self._records[key] = (now + ttl, value)
+            return None
+
+    def set(self, key: str, value: float, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._purge(now)
+            self._records[key] = (now + ttl, value)
+
+    def get(self, key: str) -> Optional[float]:
+        with self._lock:
+            return self._get(key, time.time())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+class RedisTokenStore:
+    """Store shared by all workers; every record is one key with EX"""
+
+    def __init__(self, client, prefix: str = "feelink:refresh:"):
+        self.client = client
+        self.prefix = prefix
+
+    def claim(self, key: str, value: float, ttl: float) -> Optional[float]:
+        if self.client.set(self.prefix + key, value, nx=True, ex=max(int(ttl), 1)):
+            return None
+        existing = self.client.get(self.prefix + key)
+        return float(existing) if existing is not None else value
+
+    def set(self, key: str, value: float, ttl: float) -> None:
+        self.client.set(self.prefix + key, value, ex=max(int(ttl), 1))
+
+    def get(self, key: str) -> Optional[float]:
+        value = self.client.get(self.prefix + key)
+        return float(value) if value is not None else None
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(f"{self.prefix}*"):
+            self.client.delete(key)
+
+
+@dataclass
+class RefreshTokenRegistry:
+    """Rotation and revocation rules on top of a token store"""
+    store: Any
+    reuse_grace_seconds: float = REFRESH_REUSE_GRACE_SECONDS
+    # Longest a token of a family can still be valid after a revocation
+    family_ttl: float = REFRESH_TOKEN_EXPIRE_DAYS * 86400
+
+    @staticmethod
+    def _ttl(payload: Dict[str, Any], now: float) -> float:
+        return max(payload.get("exp", now) - now, 1)
+
+    def check(self, payload: Dict[str, Any]) -> None:
+        """
+        Reject tokens whose family or user was revoked
+
+        Args:
+            payload: Verified refresh-token payload
+
+        Raises:
+            TokenRevokedError: If the token may no longer be used
+        """
+        if self.store.get(f"family:{payload.get('fam')}") is not None:
+            raise TokenRevokedError("Refresh token family revoked")
+
+        revoked_at = self.store.get(f"user:{payload['sub']}")
+        if revoked_at is not None and payload.get("iat", 0) <= revoked_at:
+            raise TokenRevokedError("Refresh token revoked")
+
+    def consume(self, payload: Dict[str, Any]) -> str:
+        """
+        Mark a refresh token as used; it may be exchanged exactly once
+
+        Args:
+            payload: Verified refresh-token payload
+
+        Returns:
+            Family of the token, to issue its successor in; a new one for
+            tokens that predate rotation
+
+        Raises:
+            TokenRevokedError: If the token is revoked or was already used
+        """
+        self.check(payload)
+
+        legacy = "jti" not in payload or "fam" not in payload
+        jti = f"legacy:{payload['sub']}:{payload.get('exp')}" if legacy else payload["jti"]
+
+        now = time.time()
+        used_at = self.store.claim(f"used:{jti}", now, self._ttl(payload, now))
+        if used_at is None:
+            return uuid.uuid4().hex if legacy else payload["fam"]
+
+        if legacy:
+            raise TokenRevokedError("Refresh token already used")
+
+        if now - used_at > self.reuse_grace_seconds:
+            logger.warning(
+                f"[AUTH] Refresh token reuse for user {payload['sub']}, revoking family"
+            )
+            self.revoke_family(payload)
+        raise TokenRevokedError("Refresh token already used")
+
+    def revoke_family(self, payload: Dict[str, Any]) -> None:
+        """Revoke every token descending from the same login"""
+        self.store.set(f"family:{payload['fam']}", time.time(), self.family_ttl)
+
+    def revoke_user(self, user_id: int, ttl: float) -> None:
+        """
+        Revoke all refresh tokens issued to a user so far
+
+        Args:
+            user_id: User ID
+            ttl: Lifetime of the longest-lived refresh token, in seconds
+        """
+        self.store.set(f"user:{user_id}", time.time(), ttl)
+
+
+def _create_store():
+    if REDIS_URL:
+        import redis
+        return RedisTokenStore(redis.Redis.from_url(REDIS_URL))
+    return InMemoryTokenStore()
+
+
+refresh_token_registry = RefreshTokenRegistry(_create_store())
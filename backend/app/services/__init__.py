@@ -4,9 +4,19 @@ Business logic services
 from .user_service import UserService
 from .metric_service import MetricService
 from .entry_service import EntryService
+from .data_version import DataVersionService
+from .tombstone_service import TombstoneService
+from .sync_service import SyncService
+from .import_service import ImportService
+from .export_service import ExportService
 
 __all__ = [
     "UserService",
     "MetricService",
     "EntryService",
+    "DataVersionService",
+    "TombstoneService",
+    "SyncService",
+    "ImportService",
+    "ExportService",
 ]
@@ -3,22 +3,86 @@ Analytics service for correlation analysis and statistics
 """
 
 from typing import List, Optional, Dict
-from datetime import date
+from datetime import date, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
 
 from app.models.metric import Metric
-from app.models.entry import Entry, EntryValue
-from app.analytics.correlation import CorrelationEngine, prepare_metric_data, CorrelationResult
+from app.services.data_version import DataVersionService
+from app.analytics.correlation import CorrelationEngine, CorrelationResult
+from app.analytics.matrix import MetricMatrix
+from app.analytics.loader import load_metric_matrix, load_observations
+from app.analytics.comparison import compare_periods
+from app.analytics.seasonality import weekday_index, month_index, grouped_means, autocorrelation
+from app.analytics.cache import analytics_cache
+from app.analytics.downsampling import lttb
+from app.analytics.group_difference import group_differences
+from app.analytics.event_study import event_windows
+from app.analytics.effect_size import nan_moments
+from app.analytics.profiling import Trace
+from app.utils.telemetry import analytics_duration_seconds, analytics_matrix_load_seconds
 import numpy as np
 
 
+def _optional_float(value) -> Optional[float]:
+    """Convert a numpy scalar to float, mapping NaN/inf to None"""
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+
 class AnalyticsService:
     """Service for analytics operations"""
 
     def __init__(self, db: Session):
         self.db = db
 
+    def _get_metrics(
+        self,
+        user_id: int,
+        metric_ids: Optional[List[int]] = None,
+        exclude_text: bool = False
+    ) -> List[Metric]:
+        """Get the user's active metrics, optionally restricted to metric_ids"""
+        query = self.db.query(Metric).filter(
+            Metric.user_id == user_id,
+            Metric.archived == False
+        )
+
+        if metric_ids:
+            query = query.filter(Metric.id.in_(metric_ids))
+        if exclude_text:
+            query = query.filter(Metric.value_type != 'text')
+
+        return query.order_by(Metric.display_order, Metric.id).all()
+
+    def _data_version(self, user_id: int) -> int:
+        """Current data version of the user, used in cache keys"""
+        return DataVersionService.get(self.db, user_id)
+
+    def _load_matrix(
+        self,
+        user_id: int,
+        metrics: List[Metric],
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        trace: Optional[Trace] = None
+    ) -> Optional[MetricMatrix]:
+        """
+        Load the day × metric matrix for the given metrics and date range
+
+        Args:
+            user_id: User ID
+            metrics: Metrics to use as matrix columns
+            date_from: First day (default: earliest entry)
+            date_to: Last day (default: latest entry)
+            trace: Trace receiving 'load' and 'pivot' spans
+
+        Returns:
+            MetricMatrix, or None if there is nothing to analyze
+        """
+        with analytics_matrix_load_seconds.time():
+            return load_metric_matrix(self.db, user_id, metrics, date_from, date_to, trace)
+
+    @analytics_duration_seconds.time("correlations")
     def get_correlations(
         self,
         user_id: int,
@@ -28,7 +92,8 @@ class AnalyticsService:
         algorithm: str = 'pearson',
         max_lag: int = 7,
         min_significance: float = 0.05,
-        only_significant: bool = False
+        only_significant: bool = False,
+        trace: Optional[Trace] = None
     ) -> List[CorrelationResult]:
         """
         Calculate correlations between metrics
@@ -42,68 +107,39 @@ class AnalyticsService:
             max_lag: Maximum lag in days
             min_significance: P-value threshold
             only_significant: Only return significant correlations
+            trace: Trace receiving phase spans (load, pivot, compute, rank)
+                and work counters
 
         Returns:
             List of CorrelationResult objects
         """
-        # Get metrics
-        query = self.db.query(Metric).filter(
-            Metric.user_id == user_id,
-            Metric.archived == False
-        )
-
-        if metric_ids:
-            query = query.filter(Metric.id.in_(metric_ids))
+        trace = trace if trace is not None else Trace()
 
-        metrics = query.all()
+        with trace.span('load'):
+            metrics = self._get_metrics(user_id, metric_ids, exclude_text=True)
 
         if len(metrics) < 2:
             return []
 
-        # Get entries with date filtering
-        entry_query = self.db.query(Entry).filter(Entry.user_id == user_id)
-
-        if date_from:
-            entry_query = entry_query.filter(Entry.entry_date >= date_from)
-        if date_to:
-            entry_query = entry_query.filter(Entry.entry_date <= date_to)
+        matrix = self._load_matrix(user_id, metrics, date_from, date_to, trace)
 
-        entries = entry_query.order_by(Entry.entry_date).all()
-
-        if len(entries) < 7:
+        if matrix is None or matrix.observed_days() < 7:
             return []
 
-        # Prepare data for each metric
-        metrics_data = {}
-        for metric in metrics:
-            # Convert entries to dictionaries for prepare_metric_data
-            entry_dicts = []
-            for entry in entries:
-                entry_dict = {
-                    'entry_date': str(entry.entry_date),
-                    'values': [
-                        {
-                            'metric_id': v.metric_id,
-                            'value_numeric': v.value_numeric,
-                            'value_boolean': v.value_boolean,
-                            'value_text': v.value_text
-                        }
-                        for v in entry.values
-                    ]
-                }
-                entry_dicts.append(entry_dict)
-
-            data = prepare_metric_data(entry_dicts, metric.id, metric.value_type)
-
-            metrics_data[metric.id] = {
-                'name': metric.name_key,
-                'data': data
+        # Calendar-aligned columns: a lag of n rows is a lag of n days
+        metrics_data = {
+            metric_id: {
+                'name': matrix.metric_names[i],
+                'data': matrix.values[:, i]
             }
+            for i, metric_id in enumerate(matrix.metric_ids)
+        }
 
         # Run correlation analysis
         engine = CorrelationEngine(
             min_significance=min_significance,
-            min_sample_size=7
+            min_sample_size=7,
+            trace=trace
         )
 
         results = engine.analyze_all_pairs(
@@ -115,6 +151,7 @@ class AnalyticsService:
 
         return results
 
+    @analytics_duration_seconds.time("statistics")
     def get_statistics(
         self,
         user_id: int,
@@ -134,58 +171,25 @@ class AnalyticsService:
         Returns:
             Dictionary with statistics for each metric
         """
-        # Get metrics
-        query = self.db.query(Metric).filter(
-            Metric.user_id == user_id,
-            Metric.archived == False
-        )
-
-        if metric_ids:
-            query = query.filter(Metric.id.in_(metric_ids))
+        metrics = self._get_metrics(user_id, metric_ids, exclude_text=True)
+        matrix = self._load_matrix(user_id, metrics, date_from, date_to)
 
-        metrics = query.all()
-
-        # Get entries
-        entry_query = self.db.query(Entry).filter(Entry.user_id == user_id)
-
-        if date_from:
-            entry_query = entry_query.filter(Entry.entry_date >= date_from)
-        if date_to:
-            entry_query = entry_query.filter(Entry.entry_date <= date_to)
-
-        entries = entry_query.order_by(Entry.entry_date).all()
+        if matrix is None:
+            return []
 
         # Calculate statistics for each metric
         statistics = []
 
-        for metric in metrics:
-            # Convert entries to dictionaries
-            entry_dicts = []
-            for entry in entries:
-                entry_dict = {
-                    'entry_date': str(entry.entry_date),
-                    'values': [
-                        {
-                            'metric_id': v.metric_id,
-                            'value_numeric': v.value_numeric,
-                            'value_boolean': v.value_boolean
-                        }
-                        for v in entry.values
-                    ]
-                }
-                entry_dicts.append(entry_dict)
-
-            data = prepare_metric_data(entry_dicts, metric.id, metric.value_type)
-
-            # Remove NaN values
-            clean_data = [x for x in data if not np.isnan(x)]
+        for i, metric_id in enumerate(matrix.metric_ids):
+            column = matrix.values[:, i]
+            clean_data = column[~np.isnan(column)]
 
             if len(clean_data) == 0:
                 continue
 
             stats = {
-                'metric_id': metric.id,
-                'metric_name': metric.name_key,
+                'metric_id': metric_id,
+                'metric_name': matrix.metric_names[i],
                 'count': len(clean_data),
                 'mean': float(np.mean(clean_data)),
                 'median': float(np.median(clean_data)),
@@ -197,3 +201,397 @@ class AnalyticsService:
             statistics.append(stats)
 
         return statistics
+
+    @analytics_duration_seconds.time("comparison")
+    def compare_periods(
+        self,
+        user_id: int,
+        current_from: date,
+        current_to: date,
+        previous_from: Optional[date] = None,
+        previous_to: Optional[date] = None,
+        metric_ids: Optional[List[int]] = None,
+        min_significance: float = 0.05
+    ) -> Dict:
+        """
+        Compare two periods (e.g. this month vs last month) for all metrics
+
+        Both periods are cut out of a single day × metric matrix, so the
+        data is loaded once and every metric is compared in one pass.
+
+        Args:
+            user_id: User ID
+            current_from: Start of the current period
+            current_to: End of the current period
+            previous_from: Start of the previous period
+                (default: same length, right before the current period)
+            previous_to: End of the previous period
+            metric_ids: List of metric IDs (None = all)
+            min_significance: P-value threshold
+
+        Returns:
+            Dictionary with both periods and per-metric comparisons
+
+        Raises:
+            ValueError: If a period is empty or only one end of the
+                previous period is given
+        """
+        if current_from > current_to:
+            raise ValueError("current_from must not be after current_to")
+
+        if (previous_from is None) != (previous_to is None):
+            raise ValueError("previous_from and previous_to must be given together")
+
+        if previous_from is None:
+            length = current_to - current_from
+            try:
+                previous_to = current_from - timedelta(days=1)
+                previous_from = previous_to - length
+            except OverflowError:
+                raise ValueError("No previous period before current_from")
+        elif previous_from > previous_to:
+            raise ValueError("previous_from must not be after previous_to")
+
+        result = {
+            'current_period': {'from': str(current_from), 'to': str(current_to)},
+            'previous_period': {'from': str(previous_from), 'to': str(previous_to)},
+            'comparisons': []
+        }
+
+        metrics = self._get_metrics(user_id, metric_ids, exclude_text=True)
+        matrix = self._load_matrix(
+            user_id,
+            metrics,
+            date_from=min(current_from, previous_from),
+            date_to=max(current_to, previous_to)
+        )
+
+        if matrix is None:
+            return result
+
+        comparison = compare_periods(
+            matrix.rows_between(current_from, current_to),
+            matrix.rows_between(previous_from, previous_to)
+        )
+
+        for i, metric_id in enumerate(matrix.metric_ids):
+            p_value = _optional_float(comparison.p_value[i])
+            result['comparisons'].append({
+                'metric_id': metric_id,
+                'metric_name': matrix.metric_names[i],
+                'value_type': matrix.value_types[i],
+                'current_count': int(comparison.current_count[i]),
+                'current_mean': _optional_float(comparison.current_mean[i]),
+                'previous_count': int(comparison.previous_count[i]),
+                'previous_mean': _optional_float(comparison.previous_mean[i]),
+                'delta': _optional_float(comparison.delta[i]),
+                'effect_size': _optional_float(comparison.effect_size[i]),
+                'p_value': p_value,
+                'significant': p_value is not None and p_value < min_significance
+            })
+
+        return result
+
+    def get_seasonality(
+        self,
+        user_id: int,
+        metric_ids: Optional[List[int]] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None
+    ) -> List[Dict]:
+        """
+        Day-of-week and month-of-year profiles plus weekly autocorrelation
+
+        Results are cached per data version, so repeated requests are
+        served without touching entry data until something changes.
+
+        Args:
+            user_id: User ID
+            metric_ids: List of metric IDs (None = all)
+            date_from: Start date
+            date_to: End date
+
+        Returns:
+            List of per-metric seasonality profiles
+        """
+        key = (
+            'seasonality',
+            user_id,
+            self._data_version(user_id),
+            tuple(sorted(metric_ids)) if metric_ids else None,
+            date_from,
+            date_to
+        )
+
+        return analytics_cache.get_or_compute(
+            key,
+            lambda: self._compute_seasonality(user_id, metric_ids, date_from, date_to)
+        )
+
+    @analytics_duration_seconds.time("seasonality")
+    def _compute_seasonality(
+        self,
+        user_id: int,
+        metric_ids: Optional[List[int]],
+        date_from: Optional[date],
+        date_to: Optional[date]
+    ) -> List[Dict]:
+        """Compute seasonality profiles for all metrics at once"""
+        metrics = self._get_metrics(user_id, metric_ids, exclude_text=True)
+        matrix = self._load_matrix(user_id, metrics, date_from, date_to)
+
+        if matrix is None:
+            return []
+
+        weekday_counts, weekday_means = grouped_means(
+            matrix.values, weekday_index(matrix.dates), 7
+        )
+        month_counts, month_means = grouped_means(
+            matrix.values, month_index(matrix.dates), 12
+        )
+        acf = autocorrelation(matrix.values, max_lag=7)
+
+        profiles = []
+        for i, metric_id in enumerate(matrix.metric_ids):
+            if weekday_counts[:, i].sum() == 0:
+                continue
+
+            profiles.append({
+                'metric_id': metric_id,
+                'metric_name': matrix.metric_names[i],
+                'value_type': matrix.value_types[i],
+                'weekday_means': [_optional_float(v) for v in weekday_means[:, i]],
+                'weekday_counts': [int(c) for c in weekday_counts[:, i]],
+                'month_means': [_optional_float(v) for v in month_means[:, i]],
+                'month_counts': [int(c) for c in month_counts[:, i]],
+                'weekly_autocorrelation': _optional_float(acf[7, i])
+            })
+
+        return profiles
+
+    @analytics_duration_seconds.time("timeseries")
+    def get_timeseries(
+        self,
+        user_id: int,
+        metric_id: int,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        max_points: Optional[int] = None
+    ) -> Optional[Dict]:
+        """
+        Get a single metric's values as columnar arrays
+
+        Args:
+            user_id: User ID
+            metric_id: Metric ID
+            date_from: Start date
+            date_to: End date
+            max_points: Downsample with LTTB to at most this many points
+
+        Returns:
+            Dictionary with dates and values arrays, None if metric not found
+
+        Raises:
+            ValueError: If the metric is a text metric
+        """
+        metric = self.db.query(Metric).filter(
+            Metric.id == metric_id,
+            Metric.user_id == user_id
+        ).first()
+
+        if not metric:
+            return None
+
+        if metric.value_type == 'text':
+            raise ValueError("Text metrics have no time series")
+
+        dates, _, values = load_observations(
+            self.db, user_id, [metric.id], date_from, date_to, order_by_date=True
+        )
+
+        observed = ~np.isnan(values)
+        dates, values = dates[observed], values[observed]
+        total_points = len(values)
+
+        if max_points is not None and total_points > max_points:
+            keep = lttb(dates.astype(np.int64), values, max_points)
+            dates, values = dates[keep], values[keep]
+
+        return {
+            'metric_id': metric.id,
+            'metric_name': metric.name_key,
+            'value_type': metric.value_type,
+            'dates': [str(d) for d in dates],
+            'values': values.tolist(),
+            'total_points': total_points,
+            'downsampled': len(values) < total_points
+        }
+
+    @analytics_duration_seconds.time("group_differences")
+    def get_group_differences(
+        self,
+        user_id: int,
+        metric_ids: Optional[List[int]] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        max_lag: int = 1,
+        min_group_size: int = 3,
+        min_significance: float = 0.05,
+        only_significant: bool = False
+    ) -> List[Dict]:
+        """
+        Compare every numeric metric on days with vs without each boolean metric
+
+        Args:
+            user_id: User ID
+            metric_ids: List of metric IDs to analyze (None = all)
+            date_from: Start date for analysis
+            date_to: End date for analysis
+            max_lag: Maximum lag in days (outcome measured lag days later)
+            min_group_size: Minimum days in each group to report a pair
+            min_significance: P-value threshold
+            only_significant: Only return significant differences
+
+        Returns:
+            List of differences, largest absolute effect size first
+        """
+        metrics = self._get_metrics(user_id, metric_ids, exclude_text=True)
+        matrix = self._load_matrix(user_id, metrics, date_from, date_to)
+
+        if matrix is None:
+            return []
+
+        condition_columns = matrix.columns_of_type('boolean')
+        outcome_columns = matrix.columns_of_type('range', 'number', 'count')
+
+        if not condition_columns or not outcome_columns:
+            return []
+
+        differences = group_differences(
+            matrix.values[:, condition_columns],
+            matrix.values[:, outcome_columns],
+            max_lag=max_lag
+        )
+
+        reportable = (
+            (differences.with_count >= min_group_size)
+            & (differences.without_count >= min_group_size)
+            & np.isfinite(differences.effect_size)
+        )
+        if only_significant:
+            reportable &= differences.p_value < min_significance
+
+        results = []
+        for lag, c, o in zip(*np.nonzero(reportable)):
+            condition = condition_columns[c]
+            outcome = outcome_columns[o]
+            p_value = _optional_float(differences.p_value[lag, c, o])
+
+            results.append({
+                'condition_metric_id': matrix.metric_ids[condition],
+                'condition_metric_name': matrix.metric_names[condition],
+                'outcome_metric_id': matrix.metric_ids[outcome],
+                'outcome_metric_name': matrix.metric_names[outcome],
+                'lag': int(lag),
+                'with_count': int(differences.with_count[lag, c, o]),
+                'with_mean': float(differences.with_mean[lag, c, o]),
+                'without_count': int(differences.without_count[lag, c, o]),
+                'without_mean': float(differences.without_mean[lag, c, o]),
+                'difference': float(differences.difference[lag, c, o]),
+                'effect_size': float(differences.effect_size[lag, c, o]),
+                'p_value': p_value,
+                'significant': p_value is not None and p_value < min_significance
+            })
+
+        results.sort(key=lambda r: abs(r['effect_size']), reverse=True)
+
+        return results
+
+    @analytics_duration_seconds.time("event_study")
+    def get_event_study(
+        self,
+        user_id: int,
+        event_metric_ids: Optional[List[int]] = None,
+        metric_ids: Optional[List[int]] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        window: int = 3,
+        event_value: bool = True,
+        confidence: float = 0.95,
+        min_events: int = 3
+    ) -> List[Dict]:
+        """
+        Mean response curves of metrics around boolean events
+
+        Args:
+            user_id: User ID
+            event_metric_ids: Boolean metrics to treat as events (None = all)
+            metric_ids: Metrics whose responses to report (None = all)
+            date_from: Start date for analysis
+            date_to: End date for analysis
+            window: Days before and after each event
+            event_value: Value marking an event day (False = e.g. missed medication)
+            confidence: Confidence level of the bands
+            min_events: Minimum number of events to report an event metric
+
+        Returns:
+            List of events, each with response curves of the other metrics
+        """
+        metrics = self._get_metrics(user_id, exclude_text=True)
+        matrix = self._load_matrix(user_id, metrics, date_from, date_to)
+
+        if matrix is None:
+            return []
+
+        event_columns = [
+            i for i in matrix.columns_of_type('boolean')
+            if not event_metric_ids or matrix.metric_ids[i] in event_metric_ids
+        ]
+        response_columns = [
+            i for i in range(matrix.n_metrics)
+            if not metric_ids or matrix.metric_ids[i] in metric_ids
+        ]
+
+        if not event_columns or not response_columns:
+            return []
+
+        event_flags = matrix.values[:, event_columns] == (1.0 if event_value else 0.0)
+        responses = event_windows(
+            event_flags.astype(np.float64),
+            matrix.values[:, response_columns],
+            window=window,
+            confidence=confidence
+        )
+
+        _, baselines, _ = nan_moments(matrix.values[:, response_columns])
+
+        results = []
+        for e, event_column in enumerate(event_columns):
+            if responses.event_count[e] < min_events:
+                continue
+
+            curves = []
+            for r, response_column in enumerate(response_columns):
+                if response_column == event_column:
+                    continue
+
+                curves.append({
+                    'metric_id': matrix.metric_ids[response_column],
+                    'metric_name': matrix.metric_names[response_column],
+                    'baseline_mean': _optional_float(baselines[r]),
+                    'mean': [_optional_float(v) for v in responses.mean[e, r]],
+                    'lower': [_optional_float(v) for v in responses.lower[e, r]],
+                    'upper': [_optional_float(v) for v in responses.upper[e, r]],
+                    'count': [int(c) for c in responses.count[e, r]]
+                })
+
+            results.append({
+                'event_metric_id': matrix.metric_ids[event_column],
+                'event_metric_name': matrix.metric_names[event_column],
+                'event_value': event_value,
+                'event_count': int(responses.event_count[e]),
+                'offsets': [int(o) for o in responses.offsets],
+                'responses': curves
+            })
+
+        return results
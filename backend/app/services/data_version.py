@@ -0,0 +1,54 @@
+"""
+Data version service - per-user change counter
+"""
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models import User
+
+
+class DataVersionService:
+    """
+    Monotonic per-user counter of data changes.
+
+    Every mutation of a user's entries or metrics bumps users.data_version
+    inside the same transaction, so caches, ETags and background jobs can
+    tell whether anything changed with a single primary-key lookup.
+    """
+
+    @staticmethod
+    def bump(db: Session, user_id: int) -> None:
+        """
+        Increment the user's data version.
+
+        The increment is done in SQL, so concurrent writers never lose an
+        update. It becomes visible when the caller commits.
+
+        Args:
+            db: Database session
+            user_id: User whose data changed
+        """
+        db.execute(
+            update(User)
+            .where(User.id == user_id)
+            # Keep updated_at: the profile itself did not change
+            .values(data_version=User.data_version + 1, updated_at=User.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def get(db: Session, user_id: int) -> int:
+        """
+        Get the user's current data version.
+
+        Args:
+            db: Database session
+            user_id: User ID
+
+        Returns:
+            Current data version (0 for a user without changes or unknown user)
+        """
+        version = db.execute(
+            select(User.data_version).where(User.id == user_id)
+        ).scalar()
+        return version or 0
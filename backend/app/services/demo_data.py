@@ -10,6 +10,9 @@ from sqlalchemy.orm import Session
 from sqlalchemy import delete
 
 from app.models import User, Metric, Entry, EntryValue
+from app.services.data_version import DataVersionService
+from app.services.tombstone_service import TombstoneService
+from app.services.metric_spec_cache import metric_spec_cache
 
 
 class DemoDataService:
@@ -277,7 +280,9 @@ class DemoDataService:
 
             current_date += timedelta(days=1)
 
+        DataVersionService.bump(db, user.id)
         db.commit()
+        metric_spec_cache.invalidate(user.id)
 
         return {
             "message": "Demo data generated successfully",
@@ -438,10 +443,14 @@ class DemoDataService:
             db: Database session
             user: User to clear data for
         """
+        TombstoneService.record_all(db, user.id)
+
         # Delete all entry values (will cascade from entries)
         db.query(Entry).filter(Entry.user_id == user.id).delete()
 
         # Delete all metrics (will cascade entry values)
         db.query(Metric).filter(Metric.user_id == user.id).delete()
 
+        DataVersionService.bump(db, user.id)
         db.commit()
+        metric_spec_cache.invalidate(user.id)
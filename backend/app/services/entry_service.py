@@ -1,15 +1,25 @@
 """
 Entry service - business logic for daily log entries
 """
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy import and_, or_, insert, delete
+from sqlalchemy.sql import func
 from fastapi import HTTPException, status
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import date
 from decimal import Decimal
+import base64
+import binascii
 
-from app.models import User, Entry, EntryValue, Metric
+from app.models import User, Entry, EntryValue
 from app.schemas import EntryCreate, EntryUpdate, EntryValueCreate
+from app.services.data_version import DataVersionService
+from app.services.tombstone_service import TombstoneService
+from app.services.metric_spec_cache import MetricSpec, metric_spec_cache
+
+# Columns written for an entry value; the first two form the unique key
+VALUE_COLUMNS = ("entry_id", "metric_id", "value_numeric", "value_boolean", "value_text")
 
 
 class EntryService:
@@ -31,40 +41,21 @@ class EntryService:
         Raises:
             HTTPException: If entry for this date already exists or metric validation fails
         """
+        # Validate all values before writing anything
+        specs = metric_spec_cache.get(db, user.id)
+        values = EntryService._build_values(specs, entry_data.values)
+
         # Create entry
         new_entry = Entry(
             user_id=user.id,
             entry_date=entry_data.entry_date,
-            notes=entry_data.notes
+            notes=entry_data.notes,
+            values=values
         )
 
         try:
             db.add(new_entry)
-            db.flush()  # Get the entry ID
-
-            # Create entry values
-            for value_data in entry_data.values:
-                # Verify metric exists and belongs to user
-                metric = db.query(Metric).filter(
-                    Metric.id == value_data.metric_id,
-                    Metric.user_id == user.id,
-                    Metric.archived == False
-                ).first()
-
-                if not metric:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Metric {value_data.metric_id} not found or archived"
-                    )
-
-                # Create entry value based on metric type
-                entry_value = EntryService._create_entry_value(
-                    entry_id=new_entry.id,
-                    metric=metric,
-                    value_data=value_data
-                )
-                db.add(entry_value)
-
+            DataVersionService.bump(db, user.id)
             db.commit()
             db.refresh(new_entry)
             return new_entry
@@ -76,10 +67,142 @@ class EntryService:
                 detail=f"Entry for date {entry_data.entry_date} already exists"
             )
 
+    @staticmethod
+    def create_entries(db: Session, user: User, items: List[EntryCreate]) -> List[Dict]:
+        """
+        Create many entries in a single transaction.
+
+        Metric definitions come from the per-user cache and existing dates
+        are fetched with one query. Every item is validated up front; valid
+        entries and their values are then written with two multi-row INSERTs.
+        Invalid items are reported and skipped without failing the batch.
+
+        Args:
+            db: Database session
+            user: User who owns the entries
+            items: Entries to create
+
+        Returns:
+            List of per-item results in request order
+
+        Raises:
+            HTTPException: If another request created one of the dates concurrently
+        """
+        specs = metric_spec_cache.get(db, user.id)
+
+        taken = {
+            row.entry_date for row in db.query(Entry.entry_date).filter(
+                Entry.user_id == user.id,
+                Entry.entry_date.in_([item.entry_date for item in items])
+            )
+        }
+
+        results: List[Dict] = []
+        valid = []
+
+        for index, item in enumerate(items):
+            result = {"index": index, "entry_date": item.entry_date}
+            results.append(result)
+
+            if item.entry_date in taken:
+                result.update(status="error", detail=f"Entry for date {item.entry_date} already exists")
+                continue
+
+            try:
+                values = EntryService._build_values(specs, item.values)
+            except HTTPException as e:
+                result.update(status="error", detail=e.detail)
+                continue
+
+            taken.add(item.entry_date)
+            valid.append((item, values, result))
+
+        if not valid:
+            return results
+
+        try:
+            # Core INSERTs: one multi-row statement each (dates are unique
+            # per user, so RETURNING rows are matched back by date)
+            inserted = db.execute(
+                insert(Entry.__table__).returning(Entry.__table__.c.id, Entry.__table__.c.entry_date),
+                [
+                    {"user_id": user.id, "entry_date": item.entry_date, "notes": item.notes}
+                    for item, _, _ in valid
+                ]
+            ).all()
+            entry_ids = {entry_date: entry_id for entry_id, entry_date in inserted}
+
+            value_rows = [
+                {
+                    "entry_id": entry_ids[item.entry_date],
+                    "metric_id": v.metric_id,
+                    "value_numeric": v.value_numeric,
+                    "value_boolean": v.value_boolean,
+                    "value_text": v.value_text
+                }
+                for item, values, _ in valid
+                for v in values
+            ]
+            db.execute(insert(EntryValue.__table__), value_rows)
+
+            DataVersionService.bump(db, user.id)
+            db.commit()
+
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Entries were created concurrently for some of these dates, please retry"
+            )
+
+        for item, _, result in valid:
+            result.update(status="created", entry_id=entry_ids[item.entry_date])
+
+        return results
+
+    @staticmethod
+    def _build_values(
+        specs: Dict[int, MetricSpec],
+        values_data: List[EntryValueCreate],
+        entry_id: Optional[int] = None
+    ) -> List[EntryValue]:
+        """
+        Validate submitted values against the user's metrics.
+
+        Args:
+            specs: The user's active metric definitions (metric_spec_cache)
+            values_data: Submitted values
+            entry_id: Entry ID, or None when the entry is not created yet
+
+        Returns:
+            List of unsaved EntryValue objects
+
+        Raises:
+            HTTPException: If a metric is unknown, archived or repeated, or a value is invalid
+        """
+        values = []
+        seen = set()
+        for value_data in values_data:
+            if value_data.metric_id in seen:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Metric {value_data.metric_id} given more than once"
+                )
+            seen.add(value_data.metric_id)
+
+            spec = specs.get(value_data.metric_id)
+            if spec is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Metric {value_data.metric_id} not found or archived"
+                )
+            values.append(EntryService._create_entry_value(entry_id, spec, value_data))
+        return values
+
     @staticmethod
     def _create_entry_value(
-        entry_id: int,
-        metric: Metric,
+        entry_id: Optional[int],
+        metric: MetricSpec,
         value_data: EntryValueCreate
     ) -> EntryValue:
         """
@@ -87,7 +210,7 @@ class EntryService:
 
         Args:
             entry_id: Entry ID
-            metric: Metric object
+            metric: Metric definition
             value_data: Value data
 
         Returns:
@@ -103,28 +226,28 @@ class EntryService:
 
         # Store value in appropriate column based on metric type
         if metric.value_type in ('range', 'number', 'count'):
-            if not isinstance(value_data.value, (int, float, Decimal)):
+            # bool is an int subclass, but True is not a valid reading
+            if not isinstance(value_data.value, (int, float, Decimal)) or isinstance(value_data.value, bool):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Metric {metric.name_key} expects numeric value"
                 )
 
-            numeric_value = Decimal(str(value_data.value))
-
             # Validate range constraints
             if metric.value_type == 'range':
-                if metric.min_value is not None and numeric_value < metric.min_value:
+                number = float(value_data.value)
+                if metric.min_value is not None and number < metric.min_value:
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Value {numeric_value} below minimum {metric.min_value}"
+                        detail=f"Value {value_data.value} below minimum {metric.min_value:g}"
                     )
-                if metric.max_value is not None and numeric_value > metric.max_value:
+                if metric.max_value is not None and number > metric.max_value:
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Value {numeric_value} above maximum {metric.max_value}"
+                        detail=f"Value {value_data.value} above maximum {metric.max_value:g}"
                     )
 
-            entry_value.value_numeric = numeric_value
+            entry_value.value_numeric = Decimal(str(value_data.value))
 
         elif metric.value_type == 'boolean':
             if not isinstance(value_data.value, bool):
@@ -144,6 +267,44 @@ class EntryService:
 
         return entry_value
 
+    @staticmethod
+    def encode_cursor(entry: Entry) -> str:
+        """
+        Encode the keyset position of an entry as an opaque cursor.
+
+        Args:
+            entry: Last entry of a page
+
+        Returns:
+            URL-safe cursor string
+        """
+        raw = f"{entry.entry_date.isoformat()}:{entry.id}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[date, int]:
+        """
+        Decode a cursor produced by encode_cursor.
+
+        Args:
+            cursor: Cursor string
+
+        Returns:
+            Tuple of (entry_date, entry_id)
+
+        Raises:
+            HTTPException: If the cursor is malformed
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            entry_date, entry_id = base64.urlsafe_b64decode(padded).decode().split(":")
+            return date.fromisoformat(entry_date), int(entry_id)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+
     @staticmethod
     def get_user_entries(
         db: Session,
@@ -151,10 +312,17 @@ class EntryService:
         date_from: Optional[date] = None,
         date_to: Optional[date] = None,
         limit: int = 100,
-        offset: int = 0
-    ) -> tuple[List[Entry], int]:
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> Tuple[List[Entry], Optional[int], Optional[str]]:
         """
-        Get entries for a user with optional date filtering.
+        Get entries for a user with optional date filtering, newest first.
+
+        Pages are keyed on (entry_date, id) and served from the
+        idx_entries_user_date index: pass the previous page's next_cursor
+        to continue. OFFSET paging is kept for older clients but gets
+        slower the deeper it goes.
 
         Args:
             db: Database session
@@ -162,10 +330,12 @@ class EntryService:
             date_from: Optional start date filter
             date_to: Optional end date filter
             limit: Maximum number of entries to return
-            offset: Offset for pagination
+            offset: Offset for pagination (deprecated, use cursor)
+            cursor: Cursor returned with the previous page
+            include_total: Whether to run a COUNT for the total
 
         Returns:
-            Tuple of (list of Entry objects, total count)
+            Tuple of (list of Entry objects, total count or None, next cursor or None)
         """
         query = db.query(Entry).filter(Entry.user_id == user.id)
 
@@ -174,10 +344,27 @@ class EntryService:
         if date_to:
             query = query.filter(Entry.entry_date <= date_to)
 
-        total = query.count()
-        entries = query.order_by(Entry.entry_date.desc()).limit(limit).offset(offset).all()
+        total = query.count() if include_total else None
+
+        if cursor:
+            cursor_date, cursor_id = EntryService.decode_cursor(cursor)
+            query = query.filter(or_(
+                Entry.entry_date < cursor_date,
+                and_(Entry.entry_date == cursor_date, Entry.id < cursor_id)
+            ))
+
+        # Load values for the whole page with one batched IN query;
+        # one extra row tells whether there is a next page
+        entries = query.options(selectinload(Entry.values)).order_by(
+            Entry.entry_date.desc(), Entry.id.desc()
+        ).limit(limit + 1).offset(offset).all()
+
+        next_cursor = None
+        if len(entries) > limit:
+            entries = entries[:limit]
+            next_cursor = EntryService.encode_cursor(entries[-1])
 
-        return entries, total
+        return entries, total, next_cursor
 
     @staticmethod
     def get_entry_by_id(db: Session, user: User, entry_id: int) -> Optional[Entry]:
@@ -192,7 +379,7 @@ class EntryService:
         Returns:
             Entry object if found and owned by user, None otherwise
         """
-        return db.query(Entry).filter(
+        return db.query(Entry).options(selectinload(Entry.values)).filter(
             Entry.id == entry_id,
             Entry.user_id == user.id
         ).first()
@@ -210,7 +397,7 @@ class EntryService:
         Returns:
             Entry object if found, None otherwise
         """
-        return db.query(Entry).filter(
+        return db.query(Entry).options(selectinload(Entry.values)).filter(
             Entry.user_id == user.id,
             Entry.entry_date == entry_date
         ).first()
@@ -224,6 +411,10 @@ class EntryService:
         """
         Update an entry.
 
+        If values are given they replace the entry's values, but only the
+        rows that actually differ are written. A request that changes
+        nothing writes nothing.
+
         Args:
             db: Database session
             entry: Entry object to update
@@ -232,38 +423,137 @@ class EntryService:
         Returns:
             Updated Entry object
         """
-        if entry_data.notes is not None:
+        changed = False
+
+        if entry_data.notes is not None and entry_data.notes != entry.notes:
             entry.notes = entry_data.notes
+            changed = True
 
         if entry_data.values is not None:
-            # Delete existing values
-            db.query(EntryValue).filter(EntryValue.entry_id == entry.id).delete()
-
-            # Create new values
-            for value_data in entry_data.values:
-                metric = db.query(Metric).filter(
-                    Metric.id == value_data.metric_id,
-                    Metric.user_id == entry.user_id,
-                    Metric.archived == False
-                ).first()
-
-                if not metric:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Metric {value_data.metric_id} not found or archived"
-                    )
+            specs = metric_spec_cache.get(db, entry.user_id)
+            values = EntryService._build_values(specs, entry_data.values, entry_id=entry.id)
 
-                entry_value = EntryService._create_entry_value(
-                    entry_id=entry.id,
-                    metric=metric,
-                    value_data=value_data
-                )
-                db.add(entry_value)
+            if EntryService._apply_value_diff(db, entry, values):
+                # Value changes don't touch the entry row; mark it changed for sync
+                entry.updated_at = func.now()
+                changed = True
 
-        db.commit()
-        db.refresh(entry)
+        if changed:
+            DataVersionService.bump(db, entry.user_id)
+            db.commit()
+            db.refresh(entry)
         return entry
 
+    @staticmethod
+    def set_entry_value(
+        db: Session,
+        entry: Entry,
+        value_data: EntryValueCreate
+    ) -> EntryValue:
+        """
+        Create or replace a single value of an entry (autosave).
+
+        Args:
+            db: Database session
+            entry: Entry object, with values loaded
+            value_data: Metric ID and new value
+
+        Returns:
+            The stored EntryValue
+
+        Raises:
+            HTTPException: If the metric is unknown or archived, or the value is invalid
+        """
+        specs = metric_spec_cache.get(db, entry.user_id)
+        value, = EntryService._build_values(specs, [value_data], entry_id=entry.id)
+
+        if EntryService._upsert_values(db, entry, [value]):
+            entry.updated_at = func.now()
+            DataVersionService.bump(db, entry.user_id)
+            db.commit()
+
+        return db.query(EntryValue).filter(
+            EntryValue.entry_id == entry.id,
+            EntryValue.metric_id == value_data.metric_id
+        ).one()
+
+    @staticmethod
+    def _apply_value_diff(db: Session, entry: Entry, values: List[EntryValue]) -> bool:
+        """
+        Make the stored values of an entry equal to values.
+
+        Unchanged rows are left alone, changed and new ones are upserted
+        and removed ones are deleted by metric ID.
+
+        Args:
+            db: Database session
+            entry: Entry object, with values loaded
+            values: Complete new set of values
+
+        Returns:
+            True if anything was written
+        """
+        keep = {v.metric_id for v in values}
+        removed = [v.metric_id for v in entry.values if v.metric_id not in keep]
+
+        if removed:
+            db.execute(delete(EntryValue.__table__).where(
+                EntryValue.__table__.c.entry_id == entry.id,
+                EntryValue.__table__.c.metric_id.in_(removed)
+            ))
+
+        return EntryService._upsert_values(db, entry, values) or bool(removed)
+
+    @staticmethod
+    def _upsert_values(db: Session, entry: Entry, values: List[EntryValue]) -> bool:
+        """
+        Write values that differ from the entry's stored ones.
+
+        On PostgreSQL and SQLite this is one multi-row INSERT ... ON
+        CONFLICT (entry_id, metric_id) DO UPDATE. Other databases update
+        the loaded rows through the ORM and add the new ones.
+
+        Args:
+            db: Database session
+            entry: Entry object, with values loaded
+            values: Values to store
+
+        Returns:
+            True if anything was written
+        """
+        stored = {v.metric_id: v for v in entry.values}
+        rows = [
+            {column: getattr(v, column) for column in VALUE_COLUMNS}
+            for v in values
+            if v.metric_id not in stored
+            or any(getattr(v, c) != getattr(stored[v.metric_id], c) for c in VALUE_COLUMNS[2:])
+        ]
+        if not rows:
+            return False
+
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            for row in rows:
+                existing = stored.get(row["metric_id"])
+                if existing is None:
+                    db.add(EntryValue(**row))
+                else:
+                    for column in VALUE_COLUMNS[2:]:
+                        setattr(existing, column, row[column])
+            db.flush()
+            return True
+
+        stmt = dialect_insert(EntryValue.__table__).values(rows)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["entry_id", "metric_id"],
+            set_={c: stmt.excluded[c] for c in VALUE_COLUMNS[2:]}
+        ))
+        return True
+
     @staticmethod
     def delete_entry(db: Session, entry: Entry) -> None:
         """
@@ -273,5 +563,7 @@ class EntryService:
             db: Database session
             entry: Entry object to delete
         """
+        TombstoneService.record_entries(db, entry.user_id, [entry])
         db.delete(entry)
+        DataVersionService.bump(db, entry.user_id)
         db.commit()
@@ -0,0 +1,278 @@
+"""
+Export service - streaming full-account export
+
+Entries and values are read with a single outer-joined SELECT using
+server-side cursors (yield_per) and encoded batch by batch, so memory use
+does not depend on the length of the history and the first bytes are sent
+before the whole result has been read.
+
+Formats:
+    csv     One row per day: date, notes and one column per metric, the
+            same layout accepted by the import endpoint.
+    ndjson  One metric definition per line, followed by one entry per line
+            with its values keyed by metric name_key.
+    parquet One row per value (long format), one row group per batch.
+            Requires pyarrow.
+"""
+from datetime import date
+from decimal import Decimal
+from itertools import groupby
+from operator import itemgetter
+from typing import Iterator, List, Optional, Tuple
+import csv
+import io
+import json
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import User, Entry, EntryValue, Metric
+
+# Rows fetched from the cursor and encoded per batch
+EXPORT_BATCH_SIZE = 5000
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+entries_table = Entry.__table__
+values_table = EntryValue.__table__
+metrics_table = Metric.__table__
+
+
+def _json_number(value: Optional[Decimal]):
+    """Decimal -> int for whole numbers, float otherwise"""
+    if value is None:
+        return None
+    return int(value) if value == value.to_integral_value() else float(value)
+
+
+def _value(numeric, boolean, text):
+    if numeric is not None:
+        return numeric
+    if boolean is not None:
+        return boolean
+    return text
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object whose contents are drained after each row group"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+class ExportService:
+    """Service class for account exports"""
+
+    @staticmethod
+    def parquet_available() -> bool:
+        """Whether pyarrow is installed"""
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    @staticmethod
+    def _metrics(db: Session, user: User) -> List[Metric]:
+        return db.query(Metric).filter(
+            Metric.user_id == user.id
+        ).order_by(Metric.display_order, Metric.id).all()
+
+    @staticmethod
+    def _iter_batches(db: Session, user: User) -> Iterator[List[Tuple]]:
+        """
+        Stream (entry_date, notes, name_key, numeric, boolean, text) rows
+
+        Rows are ordered by date, so all values of an entry are adjacent.
+        Entries without values yield one row with a NULL metric.
+        """
+        stmt = select(
+            entries_table.c.entry_date,
+            entries_table.c.notes,
+            metrics_table.c.name_key,
+            values_table.c.value_numeric,
+            values_table.c.value_boolean,
+            values_table.c.value_text
+        ).select_from(
+            entries_table
+            .outerjoin(values_table, values_table.c.entry_id == entries_table.c.id)
+            .outerjoin(metrics_table, metrics_table.c.id == values_table.c.metric_id)
+        ).where(
+            entries_table.c.user_id == user.id
+        ).order_by(
+            entries_table.c.entry_date, values_table.c.metric_id
+        ).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+        for partition in db.execute(stmt).partitions():
+            yield partition
+
+    @staticmethod
+    def _iter_entries(db: Session, user: User) -> Iterator[List[Tuple[date, Optional[str], dict]]]:
+        """
+        Stream batches of (entry_date, notes, {name_key: value}) per entry
+
+        An entry split across two cursor batches is carried over to the
+        next batch so that it is emitted once.
+        """
+        pending: List[Tuple] = []
+
+        for partition in ExportService._iter_batches(db, user):
+            rows = pending + list(partition)
+            last_date = rows[-1][0]
+            pending = [r for r in rows if r[0] == last_date]
+
+            yield [
+                ExportService._group_entry(entry_date, list(group))
+                for entry_date, group in groupby(
+                    (r for r in rows if r[0] != last_date), key=itemgetter(0)
+                )
+            ]
+
+        if pending:
+            yield [ExportService._group_entry(pending[0][0], pending)]
+
+    @staticmethod
+    def _group_entry(entry_date: date, rows: List[Tuple]) -> Tuple[date, Optional[str], dict]:
+        values = {
+            name_key: _value(numeric, boolean, text)
+            for _, _, name_key, numeric, boolean, text in rows
+            if name_key is not None
+        }
+        return entry_date, rows[0][1], values
+
+    @staticmethod
+    def iter_csv(db: Session, user: User) -> Iterator[bytes]:
+        """
+        Stream a wide CSV export
+
+        Args:
+            db: Database session
+            user: User to export
+
+        Yields:
+            UTF-8 encoded CSV chunks, starting with the header
+        """
+        columns = [m.name_key for m in ExportService._metrics(db, user)]
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(["date", "notes", *columns])
+        yield buffer.getvalue().encode("utf-8")
+
+        for batch in ExportService._iter_entries(db, user):
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for entry_date, notes, values in batch:
+                writer.writerow([
+                    entry_date.isoformat(),
+                    notes or "",
+                    *(values.get(key, "") for key in columns)
+                ])
+            yield buffer.getvalue().encode("utf-8")
+
+    @staticmethod
+    def iter_ndjson(db: Session, user: User) -> Iterator[bytes]:
+        """
+        Stream an NDJSON export: metric definitions, then entries
+
+        Args:
+            db: Database session
+            user: User to export
+
+        Yields:
+            UTF-8 encoded chunks of newline-delimited JSON
+        """
+        lines = [
+            json.dumps({
+                "type": "metric",
+                "name_key": m.name_key,
+                "category": m.category,
+                "value_type": m.value_type,
+                "min_value": _json_number(m.min_value),
+                "max_value": _json_number(m.max_value),
+                "description": m.description,
+                "color": m.color,
+                "icon": m.icon,
+                "archived": m.archived
+            })
+            for m in ExportService._metrics(db, user)
+        ]
+        if lines:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+
+        for batch in ExportService._iter_entries(db, user):
+            yield "".join(
+                json.dumps({
+                    "type": "entry",
+                    "entry_date": entry_date.isoformat(),
+                    "notes": notes,
+                    "values": {
+                        key: _json_number(v) if isinstance(v, Decimal) else v
+                        for key, v in values.items()
+                    }
+                }) + "\n"
+                for entry_date, notes, values in batch
+            ).encode("utf-8")
+
+    @staticmethod
+    def iter_parquet(db: Session, user: User) -> Iterator[bytes]:
+        """
+        Stream a long-format Parquet file, one row group per batch
+
+        Args:
+            db: Database session
+            user: User to export
+
+        Yields:
+            Chunks of the Parquet file
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([
+            ("entry_date", pa.date32()),
+            ("notes", pa.string()),
+            ("metric", pa.string()),
+            ("value_numeric", pa.float64()),
+            ("value_boolean", pa.bool_()),
+            ("value_text", pa.string()),
+        ])
+
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, schema)
+        try:
+            for partition in ExportService._iter_batches(db, user):
+                columns = list(zip(*partition))
+                columns[3] = [None if v is None else float(v) for v in columns[3]]
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(c, type=f.type) for c, f in zip(columns, schema)],
+                    schema=schema
+                ))
+                yield sink.drain()
+        finally:
+            writer.close()
+        yield sink.drain()
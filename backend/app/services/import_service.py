@@ -0,0 +1,395 @@
+"""
+Import service - streaming bulk import of historical data
+
+Accepts "wide" rows: one row per day with a date column, an optional notes
+column and one column per metric, either as CSV or as NDJSON objects with
+the same keys. Rows are read incrementally and processed in fixed-size
+chunks, so memory use does not depend on the file size.
+"""
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import Callable, Dict, IO, Iterable, Iterator, List, Optional, Tuple
+import csv
+import io
+import json
+import re
+
+from fastapi import HTTPException, status
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models import User, Entry, EntryValue, Metric
+from app.schemas import EntryValueCreate, MetricCreate
+from app.services.entry_service import EntryService, VALUE_COLUMNS
+from app.services.metric_service import MetricService
+from app.services.data_version import DataVersionService
+from app.services.metric_spec_cache import MetricSpec, metric_spec_cache
+
+# Rows validated and written per transaction
+IMPORT_CHUNK_SIZE = 1000
+
+# Only the first errors are kept in the report; all are counted
+MAX_REPORTED_ERRORS = 100
+
+DATE_COLUMNS = ("entry_date", "date")
+NOTES_COLUMN = "notes"
+
+TRUE_VALUES = {"true", "yes", "y", "1", "t"}
+FALSE_VALUES = {"false", "no", "n", "0", "f"}
+
+
+@dataclass
+class ImportProgress:
+    """Running totals of an import, reported after every chunk"""
+    rows_read: int = 0
+    entries_created: int = 0
+    values_created: int = 0
+    rows_skipped: int = 0
+    error_count: int = 0
+    errors: List[Dict] = field(default_factory=list)
+    metrics_created: List[str] = field(default_factory=list)
+
+    def add_error(self, row: int, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "detail": message})
+
+
+def iter_csv_rows(stream: IO[str]) -> Iterator[Dict[str, str]]:
+    """Yield CSV rows as dicts, one at a time"""
+    yield from csv.DictReader(stream)
+
+
+def iter_ndjson_rows(stream: IO[str]) -> Iterator[Dict]:
+    """
+    Yield NDJSON objects one line at a time
+
+    Raises:
+        ValueError: If a line is not a JSON object
+    """
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        row = json.loads(line)
+        if not isinstance(row, dict):
+            raise ValueError(f"Line {line_number} is not a JSON object")
+        yield row
+
+
+def normalize_name_key(column: str) -> str:
+    """Turn a column header into a valid metric name_key"""
+    key = re.sub(r"[^a-z0-9_.]+", "_", column.strip().lower()).strip("_")
+    return key[:100] or "metric"
+
+
+def _parse_bool(raw) -> Optional[bool]:
+    if isinstance(raw, bool):
+        return raw
+    text = str(raw).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    return None
+
+
+def _parse_number(raw) -> Optional[Decimal]:
+    if isinstance(raw, bool):
+        return None
+    try:
+        number = Decimal(str(raw).strip())
+    except InvalidOperation:
+        return None
+    return number if number.is_finite() else None
+
+
+def infer_value_type(samples: Iterable) -> str:
+    """
+    Pick a metric type for a new column from its values in the first chunk
+
+    Columns of yes/no or true/false are boolean (0/1 alone stays numeric),
+    all-numeric columns are numbers and anything else is text.
+
+    Args:
+        samples: Raw cell values
+
+    Returns:
+        'boolean', 'number' or 'text'
+    """
+    samples = [s for s in samples if s not in (None, "")]
+    if not samples:
+        return "text"
+    if all(_parse_bool(s) is not None for s in samples) and \
+            any(isinstance(s, bool) or _parse_number(s) is None for s in samples):
+        return "boolean"
+    if all(_parse_number(s) is not None for s in samples):
+        return "number"
+    return "text"
+
+
+def convert_value(raw, spec: MetricSpec):
+    """
+    Convert a raw cell to the Python type expected for a metric
+
+    Returns:
+        Converted value, or the raw value if it cannot be converted (so
+        that validation reports a type error)
+    """
+    if spec.value_type == "boolean":
+        parsed = _parse_bool(raw)
+    elif spec.value_type == "text":
+        parsed = str(raw)
+    else:
+        parsed = _parse_number(raw)
+    return raw if parsed is None else parsed
+
+
+class ImportService:
+    """Service class for bulk imports"""
+
+    @staticmethod
+    def import_rows(
+        db: Session,
+        user: User,
+        rows: Iterable[Dict],
+        column_map: Optional[Dict[str, str]] = None,
+        create_missing: bool = True,
+        category: str = "wellness",
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+        progress: Optional[Callable[[ImportProgress], None]] = None
+    ) -> ImportProgress:
+        """
+        Import wide rows (date, notes, one column per metric).
+
+        Each chunk is validated and committed on its own, so a failed
+        import can simply be re-run: dates that already have an entry
+        are skipped.
+
+        Args:
+            db: Database session
+            user: User to import data for
+            rows: Iterable of dicts, e.g. from iter_csv_rows
+            column_map: Optional column -> metric name_key overrides
+            create_missing: Create metrics for unknown columns
+            category: Category of created metrics
+            chunk_size: Rows per chunk
+            progress: Called with the running totals after every chunk
+
+        Returns:
+            Final ImportProgress
+
+        Raises:
+            HTTPException: If the rows have no date column
+        """
+        report = ImportProgress()
+        columns: Optional[Dict[str, int]] = None
+        chunk: List[Tuple[int, Dict]] = []
+
+        # Rows are numbered from 1, not counting a CSV header
+        for number, row in enumerate(rows, start=1):
+            chunk.append((number, row))
+            if len(chunk) >= chunk_size:
+                columns = ImportService._process_chunk(
+                    db, user, chunk, columns, column_map or {}, create_missing, category, report
+                )
+                chunk = []
+                if progress:
+                    progress(report)
+
+        if chunk:
+            ImportService._process_chunk(
+                db, user, chunk, columns, column_map or {}, create_missing, category, report
+            )
+            if progress:
+                progress(report)
+
+        return report
+
+    @staticmethod
+    def _resolve_columns(
+        db: Session,
+        user: User,
+        chunk: List[Tuple[int, Dict]],
+        column_map: Dict[str, str],
+        create_missing: bool,
+        category: str,
+        report: ImportProgress
+    ) -> Dict[str, int]:
+        """
+        Map metric columns to metric IDs, creating metrics if needed
+
+        Columns are taken from the first chunk; keys that only appear
+        later are ignored.
+        """
+        # Union of the keys in the first chunk, in order of appearance;
+        # csv.DictReader puts surplus fields under a None key
+        headers = list(dict.fromkeys(
+            key for _, row in chunk for key in row if isinstance(key, str)
+        ))
+        if not any(h in DATE_COLUMNS for h in headers):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Missing date column (expected one of: {', '.join(DATE_COLUMNS)})"
+            )
+
+        metrics = {
+            m.name_key: m for m in db.query(Metric).filter(Metric.user_id == user.id)
+        }
+        columns = {}
+
+        for header in headers:
+            if header in DATE_COLUMNS or header == NOTES_COLUMN:
+                continue
+
+            name_key = column_map.get(header) or normalize_name_key(header)
+            metric = metrics.get(name_key)
+
+            if metric is None:
+                if not create_missing:
+                    continue
+                value_type = infer_value_type(row.get(header) for _, row in chunk)
+                metric = MetricService.create_metric(db, user, MetricCreate(
+                    name_key=name_key, category=category, value_type=value_type
+                ))
+                metrics[name_key] = metric
+                report.metrics_created.append(name_key)
+
+            columns[header] = metric.id
+
+        return columns
+
+    @staticmethod
+    def _process_chunk(
+        db: Session,
+        user: User,
+        chunk: List[Tuple[int, Dict]],
+        columns: Optional[Dict[str, int]],
+        column_map: Dict[str, str],
+        create_missing: bool,
+        category: str,
+        report: ImportProgress
+    ) -> Dict[str, int]:
+        """Validate and write one chunk; returns the column mapping"""
+        if columns is None:
+            columns = ImportService._resolve_columns(
+                db, user, chunk, column_map, create_missing, category, report
+            )
+
+        specs = metric_spec_cache.get(db, user.id)
+        report.rows_read += len(chunk)
+
+        parsed: List[Tuple[int, date, Optional[str], Dict]] = []
+        for number, row in chunk:
+            if None in row:
+                report.add_error(number, "Row has more fields than the header")
+                continue
+            raw_date = next((row[c] for c in DATE_COLUMNS if row.get(c)), None)
+            try:
+                entry_date = date.fromisoformat(str(raw_date).strip())
+            except (TypeError, ValueError):
+                report.add_error(number, f"Invalid date: {raw_date!r}")
+                continue
+            if entry_date > date.today():
+                report.add_error(number, "Entry date cannot be in the future")
+                continue
+            notes = row.get(NOTES_COLUMN)
+            parsed.append((number, entry_date, str(notes) if notes else None, row))
+
+        taken = {
+            d for d, in db.query(Entry.entry_date).filter(
+                Entry.user_id == user.id,
+                Entry.entry_date.in_([p[1] for p in parsed])
+            )
+        } if parsed else set()
+
+        entries = []
+        for number, entry_date, notes, row in parsed:
+            if entry_date in taken:
+                report.rows_skipped += 1
+                continue
+
+            values_data = []
+            for header, metric_id in columns.items():
+                raw = row.get(header)
+                spec = specs.get(metric_id)
+                if raw in (None, "") or spec is None:
+                    continue
+                values_data.append(EntryValueCreate.model_construct(
+                    metric_id=metric_id, value=convert_value(raw, spec)
+                ))
+
+            if not values_data:
+                report.add_error(number, "Row has no metric values")
+                continue
+
+            try:
+                values = EntryService._build_values(specs, values_data)
+            except HTTPException as e:
+                report.add_error(number, e.detail)
+                continue
+
+            taken.add(entry_date)
+            entries.append((entry_date, notes, values))
+
+        if entries:
+            ImportService._write_entries(db, user, entries, report)
+
+        return columns
+
+    @staticmethod
+    def _write_entries(
+        db: Session,
+        user: User,
+        entries: List[Tuple[date, Optional[str], List[EntryValue]]],
+        report: ImportProgress
+    ) -> None:
+        """Insert a chunk of validated entries and commit"""
+        entries_table = Entry.__table__
+
+        inserted = db.execute(
+            insert(entries_table).returning(entries_table.c.id, entries_table.c.entry_date),
+            [{"user_id": user.id, "entry_date": d, "notes": notes} for d, notes, _ in entries]
+        ).all()
+        entry_ids = {entry_date: entry_id for entry_id, entry_date in inserted}
+
+        rows = [
+            (entry_ids[d], v.metric_id, v.value_numeric, v.value_boolean, v.value_text)
+            for d, _, values in entries
+            for v in values
+        ]
+
+        if db.get_bind().dialect.name == "postgresql":
+            ImportService._copy_values(db, rows)
+        else:
+            db.execute(insert(EntryValue.__table__), [dict(zip(VALUE_COLUMNS, r)) for r in rows])
+
+        DataVersionService.bump(db, user.id)
+        db.commit()
+
+        report.entries_created += len(entries)
+        report.values_created += len(rows)
+
+    @staticmethod
+    def _copy_values(db: Session, rows: List[Tuple]) -> None:
+        """Load entry values with COPY FROM STDIN (PostgreSQL)"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for entry_id, metric_id, numeric, boolean, text in rows:
+            writer.writerow((
+                entry_id,
+                metric_id,
+                numeric,
+                None if boolean is None else ("t" if boolean else "f"),
+                text
+            ))
+        buffer.seek(0)
+
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY entry_values ({', '.join(VALUE_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+        finally:
+            cursor.close()
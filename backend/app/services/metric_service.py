@@ -8,6 +8,9 @@ from typing import List, Optional
 
 from app.models import User, Metric
 from app.schemas import MetricCreate, MetricUpdate
+from app.services.data_version import DataVersionService
+from app.services.tombstone_service import TombstoneService
+from app.services.metric_spec_cache import metric_spec_cache
 
 
 class MetricService:
@@ -49,8 +52,10 @@ class MetricService:
 
         try:
             db.add(new_metric)
+            DataVersionService.bump(db, user.id)
             db.commit()
             db.refresh(new_metric)
+            metric_spec_cache.invalidate(user.id)
             return new_metric
         except IntegrityError:
             db.rollback()
@@ -127,8 +132,10 @@ class MetricService:
         for field, value in update_data.items():
             setattr(metric, field, value)
 
+        DataVersionService.bump(db, metric.user_id)
         db.commit()
         db.refresh(metric)
+        metric_spec_cache.invalidate(metric.user_id)
         return metric
 
     @staticmethod
@@ -144,8 +151,10 @@ class MetricService:
             Updated Metric object
         """
         metric.archived = True
+        DataVersionService.bump(db, metric.user_id)
         db.commit()
         db.refresh(metric)
+        metric_spec_cache.invalidate(metric.user_id)
         return metric
 
     @staticmethod
@@ -161,8 +170,10 @@ class MetricService:
             Updated Metric object
         """
         metric.archived = False
+        DataVersionService.bump(db, metric.user_id)
         db.commit()
         db.refresh(metric)
+        metric_spec_cache.invalidate(metric.user_id)
         return metric
 
     @staticmethod
@@ -175,5 +186,10 @@ class MetricService:
             db: Database session
             metric: Metric object to delete
         """
+        user_id = metric.user_id
+
+        TombstoneService.record_metric(db, metric)
         db.delete(metric)
+        DataVersionService.bump(db, user_id)
         db.commit()
+        metric_spec_cache.invalidate(user_id)
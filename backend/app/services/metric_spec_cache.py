@@ -0,0 +1,119 @@
+"""
+Per-user cache of metric definitions used to validate entry values
+
+Entry writes only need each metric's type and bounds. They are loaded for
+all of a user's active metrics with one query, kept in process memory and
+dropped whenever MetricService changes a metric. The TTL bounds how long
+another worker process can keep serving a definition changed elsewhere.
+
+A load racing with invalidate() may have read the old definitions, so
+each user has a generation that invalidate() bumps; a load only stores
+its result if the generation did not change while it ran.
+"""
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, Optional, Tuple
+import os
+import time
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Metric
+
+METRIC_SPEC_CACHE_TTL = float(os.getenv("METRIC_SPEC_CACHE_TTL", "60"))
+METRIC_SPEC_CACHE_MAX_USERS = int(os.getenv("METRIC_SPEC_CACHE_MAX_USERS", "10000"))
+
+
+@dataclass(frozen=True)
+class MetricSpec:
+    """What entry validation needs to know about a metric"""
+    id: int
+    name_key: str
+    value_type: str
+    min_value: Optional[float]
+    max_value: Optional[float]
+
+
+class MetricSpecCache:
+    """Thread-safe map of user ID -> {metric ID: MetricSpec} with TTL"""
+
+    def __init__(self, ttl: float = METRIC_SPEC_CACHE_TTL, max_users: int = METRIC_SPEC_CACHE_MAX_USERS):
+        self.ttl = ttl
+        self.max_users = max_users
+        self._entries: Dict[int, Tuple[float, Dict[int, MetricSpec]]] = {}
+        self._generations: Dict[int, int] = {}
+        # Bumped when _generations is reset, so loads started before still see a change
+        self._epoch = 0
+        self._lock = Lock()
+
+    def get(self, db: Session, user_id: int) -> Dict[int, MetricSpec]:
+        """
+        Get the active metric definitions of a user, loading them on a miss
+
+        Args:
+            db: Database session
+            user_id: User ID
+
+        Returns:
+            Dict of metric ID -> MetricSpec for non-archived metrics
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            cached = self._entries.get(user_id)
+            if cached is not None and cached[0] > now:
+                return cached[1]
+            generation = (self._epoch, self._generations.get(user_id, 0))
+
+        specs = self._load(db, user_id)
+
+        with self._lock:
+            if generation != (self._epoch, self._generations.get(user_id, 0)):
+                return specs
+            if len(self._entries) >= self.max_users:
+                self._entries.clear()
+            self._entries[user_id] = (now + self.ttl, specs)
+
+        return specs
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop the cached definitions of a user"""
+        with self._lock:
+            self._entries.pop(user_id, None)
+            if len(self._generations) >= self.max_users:
+                self._generations.clear()
+                self._epoch += 1
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self._epoch += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _load(db: Session, user_id: int) -> Dict[int, MetricSpec]:
+        """Load the user's active metric definitions with one query"""
+        rows = db.execute(
+            select(Metric.id, Metric.name_key, Metric.value_type, Metric.min_value, Metric.max_value)
+            .where(Metric.user_id == user_id, Metric.archived == False)
+        )
+
+        return {
+            row.id: MetricSpec(
+                id=row.id,
+                name_key=row.name_key,
+                value_type=row.value_type,
+                min_value=float(row.min_value) if row.min_value is not None else None,
+                max_value=float(row.max_value) if row.max_value is not None else None
+            )
+            for row in rows
+        }
+
+
+metric_spec_cache = MetricSpecCache()
@@ -0,0 +1,212 @@
+"""
+Sync service - delta sync for offline-first clients
+"""
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql import func
+from fastapi import HTTPException, status
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+import os
+
+from app.models import User, Entry, Metric, Tombstone
+from app.schemas import SyncUpload
+from app.services.entry_service import EntryService
+from app.services.data_version import DataVersionService
+from app.services.tombstone_service import TombstoneService, TOMBSTONE_RETENTION_DAYS
+from app.services.metric_spec_cache import metric_spec_cache
+
+# Each cursor overlaps the previous window by this much, so rows written by
+# transactions that were still in flight at sync time are not missed
+SYNC_OVERLAP_SECONDS = int(os.getenv("SYNC_OVERLAP_SECONDS", "5"))
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes (SQLite) as UTC"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class SyncService:
+    """Service class for delta sync"""
+
+    @staticmethod
+    def get_changes(db: Session, user: User, since: Optional[datetime] = None) -> Dict:
+        """
+        Get metrics, entries and deletions changed since a cursor.
+
+        The cursor is inclusive and overlaps the previous window slightly,
+        so clients may receive an unchanged row twice and must apply
+        changes idempotently (by id). Entries are returned with their full
+        set of values. A metric tombstone also removes that metric's
+        values from every entry.
+
+        Args:
+            db: Database session
+            user: User to sync
+            since: next_cursor from the previous sync (None = full snapshot)
+
+        Returns:
+            Dict with metrics, entries, deleted, next_cursor and reset
+
+        Raises:
+            HTTPException: 400 if since is in the future. The server never
+                issues such a cursor, and following one would skip every
+                change made before it
+        """
+        server_time = _as_utc(db.execute(select(func.now())).scalar())
+        cutoff = server_time - timedelta(days=TOMBSTONE_RETENTION_DAYS)
+
+        if since is not None:
+            since = _as_utc(since)
+            if since > server_time:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Sync cursor is in the future, sync again without since"
+                )
+
+        # Deletions older than the retention period are gone: start over
+        reset = since is None or since < cutoff
+
+        metrics = db.query(Metric).filter(Metric.user_id == user.id)
+        entries = db.query(Entry).options(selectinload(Entry.values)).filter(
+            Entry.user_id == user.id
+        )
+        deleted: List[Tombstone] = []
+
+        if not reset:
+            metrics = metrics.filter(Metric.updated_at >= since)
+            entries = entries.filter(Entry.updated_at >= since)
+            deleted = db.query(Tombstone).filter(
+                Tombstone.user_id == user.id,
+                Tombstone.deleted_at >= since
+            ).order_by(Tombstone.deleted_at, Tombstone.id).all()
+
+        next_cursor = server_time - timedelta(seconds=SYNC_OVERLAP_SECONDS)
+        if since is not None and not reset:
+            next_cursor = max(next_cursor, since)
+
+        return {
+            "metrics": metrics.order_by(Metric.updated_at, Metric.id).all(),
+            "entries": entries.order_by(Entry.updated_at, Entry.id).all(),
+            "deleted": deleted,
+            "next_cursor": next_cursor,
+            "reset": reset
+        }
+
+    @staticmethod
+    def apply_upload(db: Session, user: User, upload: SyncUpload) -> List[Dict]:
+        """
+        Apply a batch of offline changes in one transaction.
+
+        Entries are matched by entry_date: existing entries have their
+        notes and values replaced, others are created. Every item is
+        validated against the cached metric definitions before anything
+        is written, so an invalid item is reported without
+        affecting the others.
+
+        Args:
+            db: Database session
+            user: User uploading the changes
+            upload: Entries to upsert and entry dates to delete
+
+        Returns:
+            List of per-item results in upload order (upserts, then deletions)
+
+        Raises:
+            HTTPException: 409 if an entry for one of the dates was created
+                concurrently; nothing is written
+        """
+        specs = metric_spec_cache.get(db, user.id)
+
+        dates = [e.entry_date for e in upload.entries] + list(upload.deleted_entries)
+        existing = {
+            e.entry_date: e for e in db.query(Entry).options(selectinload(Entry.values)).filter(
+                Entry.user_id == user.id,
+                Entry.entry_date.in_(dates)
+            )
+        } if dates else {}
+
+        results: List[Dict] = []
+        upserts = []
+        seen = set()
+
+        # Validate everything before writing
+        for item in upload.entries:
+            if item.entry_date in seen:
+                results.append({"entry_date": item.entry_date, "status": "error",
+                                "detail": "Duplicate entry_date in batch"})
+                continue
+            seen.add(item.entry_date)
+
+            try:
+                values = EntryService._build_values(specs, item.values)
+            except HTTPException as e:
+                results.append({"entry_date": item.entry_date, "status": "error",
+                                "detail": e.detail})
+                continue
+
+            result = {"entry_date": item.entry_date}
+            results.append(result)
+            upserts.append((item, values, result))
+
+        deletions = []
+        for entry_date in upload.deleted_entries:
+            if entry_date in seen:
+                results.append({"entry_date": entry_date, "status": "error",
+                                "detail": "Duplicate entry_date in batch"})
+                continue
+            seen.add(entry_date)
+
+            entry = existing.get(entry_date)
+            results.append({"entry_date": entry_date,
+                            "status": "deleted" if entry else "not_found",
+                            "entry_id": entry.id if entry else None})
+            if entry:
+                deletions.append(entry)
+
+        for entry in deletions:
+            db.delete(entry)
+
+        for item, values, result in upserts:
+            entry = existing.get(item.entry_date)
+            if entry is None:
+                entry = Entry(user_id=user.id, entry_date=item.entry_date,
+                              notes=item.notes, values=values)
+                db.add(entry)
+                result["status"] = "created"
+            else:
+                # Only write the values that differ
+                for value in values:
+                    value.entry_id = entry.id
+                values_changed = EntryService._apply_value_diff(db, entry, values)
+                if values_changed or entry.notes != item.notes:
+                    entry.notes = item.notes
+                    entry.updated_at = func.now()
+                result["status"] = "updated"
+            result["entry"] = entry
+
+        TombstoneService.record_entries(db, user.id, deletions)
+
+        try:
+            if upserts or deletions:
+                DataVersionService.bump(db, user.id)
+            db.flush()
+
+            for result in results:
+                entry = result.pop("entry", None)
+                if entry is not None:
+                    result["entry_id"] = entry.id
+
+            db.commit()
+
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Entries were created concurrently for some of these dates, please retry"
+            )
+
+        return results
@@ -0,0 +1,88 @@
+"""
+Tombstone service - bookkeeping of deletions for delta sync
+"""
+from sqlalchemy import delete, insert, literal, select
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+import os
+
+from app.models import Entry, Metric, Tombstone
+
+# Clients that have not synced for longer than this get a full reset
+TOMBSTONE_RETENTION_DAYS = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "90"))
+
+
+class TombstoneService:
+    """Service class recording deleted entries and metrics"""
+
+    @staticmethod
+    def record_entries(db: Session, user_id: int, entries: Iterable[Entry]) -> None:
+        """
+        Record tombstones for deleted entries.
+
+        Args:
+            db: Database session
+            user_id: Owner of the entries
+            entries: Entries being deleted
+        """
+        rows = [
+            {"user_id": user_id, "entity_type": "entry",
+             "entity_id": e.id, "entry_date": e.entry_date}
+            for e in entries
+        ]
+        if rows:
+            db.execute(insert(Tombstone), rows)
+            TombstoneService.purge_expired(db, user_id)
+
+    @staticmethod
+    def record_metric(db: Session, metric: Metric) -> None:
+        """
+        Record a tombstone for a deleted metric.
+
+        Args:
+            db: Database session
+            metric: Metric being deleted
+        """
+        db.execute(insert(Tombstone).values(
+            user_id=metric.user_id, entity_type="metric", entity_id=metric.id
+        ))
+        TombstoneService.purge_expired(db, metric.user_id)
+
+    @staticmethod
+    def record_all(db: Session, user_id: int) -> None:
+        """
+        Record tombstones for all of a user's entries and metrics.
+
+        Uses INSERT ... SELECT, so no rows are loaded into Python.
+
+        Args:
+            db: Database session
+            user_id: User whose data is being cleared
+        """
+        columns = ["user_id", "entity_type", "entity_id", "entry_date"]
+
+        db.execute(insert(Tombstone).from_select(columns, select(
+            Entry.user_id, literal("entry"), Entry.id, Entry.entry_date
+        ).where(Entry.user_id == user_id)))
+
+        db.execute(insert(Tombstone).from_select(columns, select(
+            Metric.user_id, literal("metric"), Metric.id, literal(None)
+        ).where(Metric.user_id == user_id)))
+
+        TombstoneService.purge_expired(db, user_id)
+
+    @staticmethod
+    def purge_expired(db: Session, user_id: int) -> None:
+        """
+        Delete the user's tombstones older than the retention period.
+
+        Args:
+            db: Database session
+            user_id: User ID
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=TOMBSTONE_RETENTION_DAYS)
+        db.execute(delete(Tombstone).where(
+            Tombstone.user_id == user_id,
+            Tombstone.deleted_at < cutoff
+        ))
@@ -8,7 +8,10 @@ from typing import Optional
 
 from app.models import User
 from app.schemas import UserRegister, UserUpdate
-from app.security import hash_password, verify_password
+from app.security import hash_password, verify_and_update_password
+from app.security.jwt import REFRESH_TOKEN_EXPIRE_DAYS
+from app.security.principal_cache import principal_cache
+from app.security.refresh_tokens import refresh_token_registry
 
 
 class UserService:
@@ -57,6 +60,8 @@ class UserService:
         """
         Authenticate user by email and password.
 
+        Hashes using an outdated bcrypt cost are upgraded on success.
+
         Args:
             db: Database session
             email: User email
@@ -78,12 +83,17 @@ class UserService:
         if not user:
             return None
 
-        is_valid = verify_password(password, user.password_hash)
+        is_valid, new_hash = verify_and_update_password(password, user.password_hash)
         print(f"[AUTH DEBUG] Password valid: {is_valid}", file=sys.stderr)
 
         if not is_valid:
             return None
 
+        if new_hash:
+            user.password_hash = new_hash
+            db.commit()
+            db.refresh(user)
+
         return user
 
     @staticmethod
@@ -140,6 +150,7 @@ class UserService:
 
         db.commit()
         db.refresh(user)
+        principal_cache.invalidate_user(user.id)
         return user
 
     @staticmethod
@@ -154,3 +165,5 @@ class UserService:
         from datetime import datetime
         user.deleted_at = datetime.utcnow()
         db.commit()
+        principal_cache.invalidate_user(user.id)
+        refresh_token_registry.revoke_user(user.id, ttl=REFRESH_TOKEN_EXPIRE_DAYS * 86400)
@@ -6,6 +6,8 @@ from sqlalchemy.orm import sessionmaker, Session
 from typing import Generator
 import os
 
+from app.utils.telemetry import registry
+
 # Get database URL from environment
 DATABASE_URL = os.getenv(
     "DATABASE_URL",
@@ -29,6 +31,24 @@ SessionLocal = sessionmaker(
 )
 
 
+def _pool_stat(name: str):
+    """Read a QueuePool statistic; other pool classes do not track them"""
+    def read():
+        method = getattr(engine.pool, name, None)
+        return method() if callable(method) else None
+    return read
+
+
+registry.gauge("feelink_db_pool_size", "Connections kept in the pool", _pool_stat("size"))
+registry.gauge("feelink_db_pool_checked_out", "Connections in use", _pool_stat("checkedout"))
+registry.gauge("feelink_db_pool_checked_in", "Idle connections in the pool", _pool_stat("checkedin"))
+registry.gauge(
+    "feelink_db_pool_overflow",
+    "Connections beyond pool_size (negative while the pool is filling)",
+    _pool_stat("overflow")
+)
+
+
 def get_db() -> Generator[Session, None, None]:
     """
     Dependency for getting database session.
@@ -0,0 +1,86 @@
+"""
+Conditional GET support (ETag / If-None-Match)
+
+ETags are derived from the user's data version and the request URL rather
+than from the response body, so a matching If-None-Match is answered with
+304 Not Modified before the endpoint loads or serializes anything.
+"""
+import hashlib
+from typing import Callable
+
+from fastapi import Depends, HTTPException, Request, Response, status
+
+from app.models import User
+from app.security.dependencies import get_current_user
+
+# Revalidate on every use, never store in shared caches
+DEFAULT_CACHE_CONTROL = "private, no-cache"
+
+# Bump when response formats change so clients don't keep stale bodies
+ETAG_SCHEMA_VERSION = "1"
+
+
+def compute_etag(user: User, request: Request) -> str:
+    """
+    Build a strong ETag for a user-scoped GET request.
+
+    Args:
+        user: Authenticated user
+        request: Incoming request
+
+    Returns:
+        Quoted ETag value
+    """
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    key = f"{ETAG_SCHEMA_VERSION}:{user.id}:{user.data_version}:{request.url.path}?{query}"
+    return '"' + hashlib.sha256(key.encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag (weak comparison, RFC 9110)
+
+    Args:
+        if_none_match: Header value, possibly a comma-separated list or "*"
+        etag: Current ETag
+
+    Returns:
+        True if the client's copy is current
+    """
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in (tag.removeprefix("W/") for tag in candidates)
+
+
+def conditional_get(cache_control: str = DEFAULT_CACHE_CONTROL) -> Callable:
+    """
+    Create a route dependency adding ETag and Cache-Control headers.
+
+    Use it in the route's dependencies list so it runs before the endpoint:
+
+        @router.get("", dependencies=[Depends(conditional_get())])
+
+    Args:
+        cache_control: Cache-Control policy for the route
+
+    Returns:
+        Dependency that raises 304 when the client's ETag is current
+    """
+    def dependency(
+        request: Request,
+        response: Response,
+        current_user: User = Depends(get_current_user)
+    ) -> None:
+        etag = compute_etag(current_user, request)
+        headers = {
+            "ETag": etag,
+            "Cache-Control": cache_control,
+            "Vary": "Authorization"
+        }
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        response.headers.update(headers)
+
+    return dependency
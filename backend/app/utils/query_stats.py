@@ -0,0 +1,108 @@
+"""
+Per-request SQL statistics: query count, DB time and N+1 detection
+
+SQLAlchemy cursor events on every Engine add each statement to the
+QueryStats of the current request, held in a context variable. The
+context is copied into the threadpool that runs sync routes, so queries
+made there are attributed to the request that made them. Outside a
+request (CLI, startup) nothing is recorded.
+"""
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import List, Optional
+import os
+import re
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Requests running more statements than this are logged
+SQL_QUERY_BUDGET = int(os.getenv("SQL_QUERY_BUDGET", "20"))
+
+# The same statement this many times in one request suggests an N+1 loop
+SQL_REPEAT_THRESHOLD = int(os.getenv("SQL_REPEAT_THRESHOLD", "5"))
+
+
+@dataclass
+class QueryStats:
+    """Statements executed while handling one request"""
+    count: int = 0
+    duration: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+    def server_timing(self) -> str:
+        """Server-Timing header value"""
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+
+    def problems(self, budget: Optional[int], repeat_threshold: int = SQL_REPEAT_THRESHOLD) -> List[str]:
+        """
+        Describe budget overruns and repeated statements
+
+        Args:
+            budget: Maximum number of statements, None for no limit
+            repeat_threshold: Repetitions of one statement that count as N+1
+
+        Returns:
+            Human-readable problems, empty if none
+        """
+        problems = []
+        if budget is not None and self.count > budget:
+            problems.append(f"{self.count} queries (budget {budget})")
+        for statement, times in self.statements.most_common():
+            if times < repeat_threshold:
+                break
+            problems.append(f"possible N+1, {times}x: {' '.join(statement.split())[:200]}")
+        return problems
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_request() -> QueryStats:
+    """Start recording statements for the current request"""
+    stats = QueryStats()
+    _current.set(stats)
+    return stats
+
+
+def current_stats() -> Optional[QueryStats]:
+    """Stats of the current request, if one is being recorded"""
+    return _current.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current.get() is not None:
+        context.query_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    start = getattr(context, "query_start", None)
+    if stats is None or start is None:
+        return
+    stats.count += 1
+    stats.duration += time.perf_counter() - start
+    stats.statements[statement] += 1
+
+
+SERVER_TIMING_COUNT = re.compile(r'desc="(\d+) queries"')
+
+
+def query_count(server_timing: str) -> int:
+    """
+    Read the query count back from a Server-Timing header
+
+    Args:
+        server_timing: Header value produced by QueryStats.server_timing
+
+    Returns:
+        Number of statements
+    """
+    match = SERVER_TIMING_COUNT.search(server_timing)
+    if match is None:
+        raise ValueError(f"No query count in Server-Timing: {server_timing!r}")
+    return int(match.group(1))
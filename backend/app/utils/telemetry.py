@@ -0,0 +1,250 @@
+"""
+In-process metrics in the Prometheus text exposition format
+
+A small registry of counters, histograms and callback gauges. Recording a
+sample is a dict lookup, a bisect and two additions under a lock, cheap
+enough to run on every request. Values are per process; with several
+workers each one is scraped separately (or through a sidecar).
+"""
+from bisect import bisect_left
+from contextlib import contextmanager
+from threading import Lock
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+import time
+
+# Seconds; spans fast cached reads up to heavy analytics and exports
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            yield f"{self.name}{_labels(self.label_names, labels)} {_number(value)}"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    """Cumulative histogram with labels and fixed bucket bounds"""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self.bounds = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (last is +Inf), sum]
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.bounds) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        """Observe the duration of the block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted((k, (list(c), s[0])) for k, (c, s) in self._series.items())
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.bounds + (float("inf"),), counts):
+                cumulative += count
+                le = _labels(self.label_names, labels, f'le="{_number(bound)}"')
+                yield f"{self.name}_bucket{le} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.label_names, labels)} {_number(total)}"
+            yield f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class Gauge:
+    """
+    Value read from a callback at scrape time
+
+    For state owned elsewhere; type="counter" exposes a total kept by
+    the owner as a counter.
+    """
+
+    def __init__(self, name: str, help: str, read: Callable[[], Optional[float]], type: str = "gauge"):
+        self.name = name
+        self.help = help
+        self.read = read
+        self.type = type
+
+    def samples(self) -> Iterator[str]:
+        value = self.read()
+        if value is not None:
+            yield f"{self.name} {_number(value)}"
+
+    def clear(self) -> None:
+        pass
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, help, labels, buckets))
+
+    def gauge(
+        self,
+        name: str,
+        help: str,
+        read: Callable[[], Optional[float]],
+        type: str = "gauge"
+    ) -> Gauge:
+        return self.register(Gauge(name, help, read, type))
+
+    def render(self) -> str:
+        """
+        Render all metrics
+
+        Returns:
+            Text exposition format (version 0.0.4)
+        """
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """Reset all recorded samples (gauges are read live)"""
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+registry = MetricsRegistry()
+
+http_requests_total = registry.counter(
+    "feelink_http_requests_total",
+    "HTTP requests by route template and status",
+    ("method", "route", "status")
+)
+http_request_duration_seconds = registry.histogram(
+    "feelink_http_request_duration_seconds",
+    "Time until the response body is sent, by route template",
+    ("method", "route")
+)
+rate_limited_requests_total = registry.counter(
+    "feelink_rate_limited_requests_total",
+    "Requests rejected by the rate limiter",
+    ("method", "route")
+)
+analytics_duration_seconds = registry.histogram(
+    "feelink_analytics_duration_seconds",
+    "Analytics computations by operation, excluding cache hits",
+    ("operation",)
+)
+analytics_matrix_load_seconds = registry.histogram(
+    "feelink_analytics_matrix_load_seconds",
+    "Time to load the day x metric matrix from the database"
+)
+analytics_cache_requests_total = registry.counter(
+    "feelink_analytics_cache_requests_total",
+    "Analytics cache lookups",
+    ("result",)
+)
+db_queries_per_request = registry.histogram(
+    "feelink_db_queries_per_request",
+    "SQL statements executed per request, by route template",
+    ("method", "route"),
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100)
+)
+analytics_phase_seconds = registry.histogram(
+    "feelink_analytics_phase_seconds",
+    "Time per analytics pipeline phase (load, pivot, compute, ...)",
+    ("operation", "phase"),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+analytics_work_total = registry.counter(
+    "feelink_analytics_work_total",
+    "Work done by analytics pipelines (pairs evaluated, lags tested, ...)",
+    ("operation", "counter")
+)
@@ -0,0 +1,10 @@
+"""
+Backend benchmarks
+
+Run all benchmarks:    python -m benchmarks
+Run one benchmark:     python -m benchmarks entries
+
+Each bench_<name>.py module exposes main(). By default benchmarks run
+against a temporary SQLite database; set BENCH_DATABASE_URL to measure
+against PostgreSQL.
+"""
@@ -0,0 +1,27 @@
+"""
+Benchmark runner
+"""
+import importlib
+import pkgutil
+import sys
+
+import benchmarks
+
+
+def main(names: list[str]) -> None:
+    available = sorted(
+        m.name.removeprefix("bench_")
+        for m in pkgutil.iter_modules(benchmarks.__path__)
+        if m.name.startswith("bench_")
+    )
+
+    for name in names or available:
+        if name not in available:
+            sys.exit(f"Unknown benchmark '{name}' (available: {', '.join(available)})")
+        print(f"== {name}")
+        importlib.import_module(f"benchmarks.bench_{name}").main()
+        print()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,75 @@
+"""
+Login throughput: logins per second per core under concurrent load, and
+/health latency while the logins run
+"""
+import asyncio
+import logging
+import os
+import time
+
+import httpx
+
+from app.main import app
+from app.security.password import BCRYPT_ROUNDS, password_executor
+from benchmarks.common import bench_app, create_user
+
+CLIENTS = 16
+LOGINS_PER_CLIENT = 5
+PROBE_INTERVAL = 0.005
+
+
+async def login_loop(client: httpx.AsyncClient, statuses: list) -> None:
+    for _ in range(LOGINS_PER_CLIENT):
+        response = await client.post("/api/v1/auth/login", json={
+            "email": "bench@example.com", "password": "benchmark123"
+        })
+        statuses.append(response.status_code)
+
+
+async def probe(client: httpx.AsyncClient, latencies: list, done: asyncio.Event) -> None:
+    while not done.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        await client.get("/health")
+        latencies.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+
+async def run() -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        statuses: list = []
+        latencies: list = []
+        done = asyncio.Event()
+        probe_task = asyncio.create_task(probe(client, latencies, done))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(login_loop(client, statuses) for _ in range(CLIENTS)))
+        elapsed = time.perf_counter() - start
+
+        done.set()
+        await probe_task
+
+    ok = statuses.count(200)
+    cores = os.cpu_count() or 1
+    print(
+        f"bcrypt rounds {BCRYPT_ROUNDS}, {password_executor.workers} hash workers, {cores} cores, "
+        f"{CLIENTS} clients"
+    )
+    print(
+        f"{ok} logins ok, {statuses.count(503)} rejected (503) in {elapsed:.1f} s: "
+        f"{ok / elapsed:.1f} logins/s, {ok / elapsed / cores:.1f} per core"
+    )
+    print(f"/health max latency {max(latencies) * 1000:.1f} ms")
+
+
+def main() -> None:
+    logging.disable(logging.WARNING)
+
+    with bench_app() as (_, SessionLocal):
+        with SessionLocal() as db:
+            create_user(db)
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Concurrent load: request throughput and event-loop responsiveness
+
+Runs concurrent clients against DB-bound endpoints in one event loop while
+a probe polls /health (which does no I/O). If a route runs blocking
+database calls on the event loop, the probe waits behind them.
+
+Keep CLIENTS below the connection pool size: when blocking calls run on
+the event loop, a request waiting for a pooled connection stalls the
+requests that would return one.
+"""
+import asyncio
+import logging
+import statistics
+import time
+from datetime import date, timedelta
+
+import httpx
+
+from app.main import app
+from benchmarks.common import bench_app, create_user
+
+CLIENTS = 10
+REQUESTS_PER_CLIENT = 25
+DAYS = 365
+PROBE_INTERVAL = 0.005
+
+
+async def client_loop(client: httpx.AsyncClient, headers: dict, path: str) -> None:
+    for _ in range(REQUESTS_PER_CLIENT):
+        response = await client.get(path, headers=headers)
+        assert response.status_code == 200
+
+
+async def probe(client: httpx.AsyncClient, latencies: list, done: asyncio.Event) -> None:
+    """Every 5 ms, time how late /health answers (including loop lag)"""
+    while not done.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        await client.get("/health")
+        latencies.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+
+async def run(headers: dict, path: str) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        latencies: list = []
+        done = asyncio.Event()
+        probe_task = asyncio.create_task(probe(client, latencies, done))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(client, headers, path) for _ in range(CLIENTS)))
+        elapsed = time.perf_counter() - start
+
+        done.set()
+        await probe_task
+
+    total = CLIENTS * REQUESTS_PER_CLIENT
+    latencies.sort()
+    print(
+        f"GET {path:<36} {total / elapsed:7.1f} req/s  "
+        f"/health p50 {statistics.median(latencies) * 1000:6.1f} ms  "
+        f"max {latencies[-1] * 1000:7.1f} ms"
+    )
+
+
+def main() -> None:
+    logging.disable(logging.WARNING)
+
+    with bench_app() as (client, SessionLocal):
+        with SessionLocal() as db:
+            _, metric_ids, headers = create_user(db)
+
+        start = date.today() - timedelta(days=DAYS - 1)
+        entries = [
+            {
+                "entry_date": str(start + timedelta(days=i)),
+                "values": [{"metric_id": m, "value": (i + j) % 10} for j, m in enumerate(metric_ids)]
+            }
+            for i in range(DAYS)
+        ]
+        client.post("/api/v1/entries/batch", headers=headers, json={"entries": entries})
+
+        for path in ("/api/v1/entries?limit=100", "/api/v1/metrics", "/api/v1/users/me"):
+            asyncio.run(run(headers, path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Entry write throughput: one POST /entries per day vs POST /entries/batch
+"""
+import logging
+from datetime import date, timedelta
+
+from benchmarks.common import bench_app, create_user, timer
+
+DAYS = 365
+
+
+def payload(metric_ids: list, start: date, days: int) -> list:
+    return [
+        {
+            "entry_date": str(start + timedelta(days=i)),
+            "values": [{"metric_id": m, "value": (i + j) % 10} for j, m in enumerate(metric_ids)]
+        }
+        for i in range(days)
+    ]
+
+
+def main() -> None:
+    logging.disable(logging.WARNING)
+    start = date.today() - timedelta(days=DAYS)
+
+    with bench_app() as (client, SessionLocal):
+        with SessionLocal() as db:
+            _, metric_ids, headers = create_user(db, "single@example.com")
+        entries = payload(metric_ids, start, DAYS)
+
+        with timer(f"POST /entries x {DAYS}", DAYS, "entries"):
+            for entry in entries:
+                assert client.post("/api/v1/entries", headers=headers, json=entry).status_code == 201
+
+    with bench_app() as (client, SessionLocal):
+        with SessionLocal() as db:
+            _, metric_ids, headers = create_user(db, "batch@example.com")
+        entries = payload(metric_ids, start, DAYS)
+
+        with timer(f"POST /entries/batch ({DAYS} entries)", DAYS, "entries"):
+            response = client.post("/api/v1/entries/batch", headers=headers, json={"entries": entries})
+            assert response.json()["created"] == DAYS
+
+        # Backfilling a week at a time
+        with SessionLocal() as db:
+            _, metric_ids, headers = create_user(db, "weekly@example.com")
+        entries = payload(metric_ids, start, DAYS)
+        batches = [entries[i:i + 7] for i in range(0, DAYS, 7)]
+
+        with timer(f"POST /entries/batch x {len(batches)} (7 each)", DAYS, "entries"):
+            for batch in batches:
+                client.post("/api/v1/entries/batch", headers=headers, json={"entries": batch})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Export of a ten-year history: time to first byte, total time and peak
+Python memory, compared with loading every entry as ORM objects
+"""
+import logging
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.orm import selectinload
+
+from app.models import Entry, EntryValue, User
+from app.services.export_service import ExportService
+from benchmarks.common import bench_app, create_user
+
+DAYS = 3650
+
+
+def seed(db, user_id: int, metric_ids: list) -> None:
+    start = date.today() - timedelta(days=DAYS)
+    db.execute(insert(Entry.__table__), [
+        {"user_id": user_id, "entry_date": start + timedelta(days=i)} for i in range(DAYS)
+    ])
+    entry_ids = [e for e, in db.query(Entry.id).filter(Entry.user_id == user_id)]
+    db.execute(insert(EntryValue.__table__), [
+        {"entry_id": e, "metric_id": m, "value_numeric": (e + j) % 10}
+        for e in entry_ids
+        for j, m in enumerate(metric_ids)
+    ])
+    db.commit()
+
+
+def measure(label: str, produce) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    first_byte = None
+    size = 0
+
+    for chunk in produce():
+        if first_byte is None:
+            first_byte = time.perf_counter() - start
+        size += len(chunk)
+
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:<28} first byte {first_byte * 1000:7.1f} ms  total {elapsed * 1000:8.1f} ms  "
+        f"peak {peak / 2**20:6.1f} MiB  ({size / 2**20:.1f} MiB out)"
+    )
+
+
+def main() -> None:
+    logging.disable(logging.WARNING)
+
+    with bench_app() as (_, SessionLocal):
+        with SessionLocal() as db:
+            user, metric_ids, _ = create_user(db)
+            user_id = user.id
+            seed(db, user_id, metric_ids)
+
+        def naive():
+            with SessionLocal() as db:
+                entries = db.query(Entry).options(selectinload(Entry.values)).filter(
+                    Entry.user_id == user_id
+                ).order_by(Entry.entry_date).all()
+                yield b"".join(
+                    f"{e.entry_date},{','.join(str(v.value_numeric) for v in e.values)}\n".encode()
+                    for e in entries
+                )
+
+        measure("ORM load + CSV", naive)
+
+        for format in ("csv", "ndjson", "parquet"):
+            if format == "parquet" and not ExportService.parquet_available():
+                continue
+
+            def stream(format=format):
+                with SessionLocal() as db:
+                    yield from getattr(ExportService, f"iter_{format}")(db, db.get(User, user_id))
+
+            measure(f"ExportService.iter_{format}", stream)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Metrics overhead: time per request through MetricsMiddleware around a
+trivial ASGI app, compared to the bare app, and /metrics render time
+"""
+import asyncio
+import time
+
+from app.middleware.metrics import MetricsMiddleware
+from app.utils.telemetry import registry
+
+REQUESTS = 50_000
+ROUTES = 40
+
+
+class Route:
+    def __init__(self, path_format: str):
+        self.path_format = path_format
+
+
+async def routed_app(scope, receive, send):
+    scope["route"] = scope["_route"]
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message):
+    pass
+
+
+async def measure(app) -> float:
+    routes = [Route(f"/api/v1/route{i}/{{item_id}}") for i in range(ROUTES)]
+    scopes = [
+        {"type": "http", "method": "GET", "path": "/", "_route": routes[i % ROUTES]}
+        for i in range(REQUESTS)
+    ]
+    start = time.perf_counter()
+    for s in scopes:
+        await app(s, receive, send)
+    return (time.perf_counter() - start) / REQUESTS
+
+
+async def run() -> None:
+    bare = await measure(routed_app)
+    instrumented = await measure(MetricsMiddleware(routed_app))
+
+    start = time.perf_counter()
+    text = registry.render()
+    render = time.perf_counter() - start
+
+    print(f"bare app          {bare * 1e6:6.2f} us/request")
+    print(f"metrics           {(instrumented - bare) * 1e6:6.2f} us overhead")
+    print(f"/metrics render   {render * 1000:6.2f} ms ({len(text.splitlines())} lines, {ROUTES} routes)")
+
+
+def main() -> None:
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Rate limiter overhead: time per request through RateLimitMiddleware
+around a trivial ASGI app, compared to the bare app
+"""
+import asyncio
+import time
+
+from app.middleware.rate_limit import InMemoryBucketStore, RateLimit, RateLimitMiddleware
+
+REQUESTS = 50_000
+PATH = "/api/v1/analytics/correlations"
+
+
+async def noop_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message):
+    pass
+
+
+def scope(i: int) -> dict:
+    return {
+        "type": "http",
+        "method": "POST",
+        "path": PATH,
+        "headers": [(b"authorization", f"Bearer token-{i % 1000}".encode())],
+        "client": (f"10.0.{i % 250}.{i % 7}", 1234),
+    }
+
+
+async def measure(app) -> float:
+    scopes = [scope(i) for i in range(REQUESTS)]
+    start = time.perf_counter()
+    for s in scopes:
+        await app(s, receive, send)
+    return (time.perf_counter() - start) / REQUESTS
+
+
+async def run() -> None:
+    limited = RateLimitMiddleware(
+        noop_app,
+        limits={("POST", PATH): RateLimit(1_000_000, 60)},
+        store=InMemoryBucketStore()
+    )
+    passthrough = RateLimitMiddleware(noop_app, limits={}, store=InMemoryBucketStore())
+
+    bare = await measure(noop_app)
+    unlisted = await measure(passthrough)
+    limited_time = await measure(limited)
+
+    print(f"bare app          {bare * 1e6:6.2f} us/request")
+    print(f"unlisted route    {(unlisted - bare) * 1e6:6.2f} us overhead")
+    print(f"rate-limited      {(limited_time - bare) * 1e6:6.2f} us overhead")
+
+
+def main() -> None:
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
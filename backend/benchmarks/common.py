@@ -0,0 +1,83 @@
+"""
+Shared benchmark setup
+"""
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+
+# The app creates its (unused) engine at import time
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/feelink-bench.db")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.main import app
+from app.models import Base, Metric, User
+from app.security.jwt import create_access_token
+from app.security.password import hash_password
+from app.utils.database import get_db
+
+
+@contextmanager
+def bench_app() -> Iterator[Tuple[TestClient, sessionmaker]]:
+    """
+    Yield a test client bound to a fresh benchmark database.
+
+    Uses BENCH_DATABASE_URL if set, otherwise a temporary SQLite file.
+    Tables are dropped afterwards.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        url = os.getenv("BENCH_DATABASE_URL", f"sqlite:///{tmp}/bench.db")
+        engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False} if url.startswith("sqlite") else {}
+        )
+        Base.metadata.create_all(bind=engine)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        def override_get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            yield TestClient(app), SessionLocal
+        finally:
+            app.dependency_overrides.clear()
+            Base.metadata.drop_all(bind=engine)
+            engine.dispose()
+
+
+def create_user(db: Session, email: str = "bench@example.com", n_metrics: int = 8) -> Tuple[User, list, dict]:
+    """
+    Create a user with range metrics and return (user, metric_ids, auth headers).
+    """
+    user = User(email=email, password_hash=hash_password("benchmark123"))
+    db.add(user)
+    db.flush()
+
+    metrics = [
+        Metric(user_id=user.id, name_key=f"metric_{i}", category="physical",
+               value_type="range", min_value=0, max_value=10, display_order=i)
+        for i in range(n_metrics)
+    ]
+    db.add_all(metrics)
+    db.commit()
+
+    token = create_access_token(data={"sub": user.id})
+    return user, [m.id for m in metrics], {"Authorization": f"Bearer {token}"}
+
+
+@contextmanager
+def timer(label: str, operations: int, unit: str = "ops") -> Iterator[None]:
+    """Print wall time and throughput of the enclosed block"""
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed * 1000:9.1f} ms  {operations / elapsed:10.1f} {unit}/s")
@@ -0,0 +1,31 @@
+"""Add data version counter to users
+
+Revision ID: 003_add_user_data_version
+Revises: 002_add_user_name_field
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003_add_user_data_version'
+down_revision: Union[str, None] = '002_add_user_name_field'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Add per-user change counter used for cache invalidation
+    op.add_column(
+        'users',
+        sa.Column('data_version', sa.BigInteger(), server_default='0', nullable=False)
+    )
+
+
+def downgrade() -> None:
+    # Remove data_version column from users table
+    op.drop_column('users', 'data_version')
@@ -0,0 +1,46 @@
+"""Add tombstones table and updated_at indexes for delta sync
+
+Revision ID: 004_add_sync_support
+Revises: 003_add_user_data_version
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004_add_sync_support'
+down_revision: Union[str, None] = '003_add_user_data_version'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create tombstones table
+    op.create_table(
+        'tombstones',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('entity_type', sa.String(length=20), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('entry_date', sa.Date(), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.CheckConstraint("entity_type IN ('entry', 'metric')", name='check_entity_type')
+    )
+    op.create_index('idx_tombstones_user_deleted', 'tombstones', ['user_id', 'deleted_at'])
+
+    # Indexes for "changed since" queries
+    op.create_index('idx_entries_user_updated', 'entries', ['user_id', 'updated_at'])
+    op.create_index('idx_metrics_user_updated', 'metrics', ['user_id', 'updated_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_metrics_user_updated', table_name='metrics')
+    op.drop_index('idx_entries_user_updated', table_name='entries')
+    op.drop_index('idx_tombstones_user_deleted', table_name='tombstones')
+    op.drop_table('tombstones')
@@ -1,9 +1,11 @@
 """
 Pytest configuration and fixtures
 """
+import asyncio
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
 from typing import Generator
 import os
@@ -32,9 +34,12 @@ def test_db() -> Generator[Session, None, None]:
     Creates all tables before test and drops them after.
     """
     # Create test engine
+    # In-memory SQLite needs a single shared connection: sync routes run in
+    # a worker thread and would otherwise see an empty per-thread database
     engine = create_engine(
         TEST_DATABASE_URL,
-        connect_args={"check_same_thread": False} if "sqlite" in TEST_DATABASE_URL else {}
+        connect_args={"check_same_thread": False} if "sqlite" in TEST_DATABASE_URL else {},
+        poolclass=StaticPool if TEST_DATABASE_URL == "sqlite:///:memory:" else None
     )
 
     # Create all tables
@@ -199,3 +204,185 @@ def test_entries(test_db: Session, test_user: User, test_metrics: list[Metric])
         test_db.refresh(entry)
 
     return entries
+
+
+@pytest.fixture(scope="function")
+def user_headers(test_user: User) -> dict:
+    """
+    Authorization headers with a token issued the way /auth/login issues it
+    (user ID as the 'sub' claim).
+    """
+    token = create_access_token(data={"sub": test_user.id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture(scope="function")
+def tracked_metrics(test_db: Session, test_user: User) -> list[Metric]:
+    """
+    Create metrics that satisfy the model constraints:
+    sleep_hours (range), mood (range), exercise (boolean), alcohol (boolean).
+    """
+    metrics = [
+        Metric(user_id=test_user.id, name_key="sleep_hours", category="physical",
+               value_type="range", min_value=0, max_value=12, display_order=0),
+        Metric(user_id=test_user.id, name_key="mood", category="psychological",
+               value_type="range", min_value=1, max_value=10, display_order=1),
+        Metric(user_id=test_user.id, name_key="exercise", category="selfcare",
+               value_type="boolean", display_order=2),
+        Metric(user_id=test_user.id, name_key="alcohol", category="triggers",
+               value_type="boolean", display_order=3),
+    ]
+    test_db.add_all(metrics)
+    test_db.commit()
+
+    for metric in metrics:
+        test_db.refresh(metric)
+
+    return metrics
+
+
+@pytest.fixture(scope="function")
+def daily_entries(test_db: Session, test_user: User, tracked_metrics: list[Metric]) -> list[Entry]:
+    """
+    Create 120 days of deterministic entries for tracked_metrics.
+
+    Mood is two points higher on exercise days and one point lower on the
+    day after alcohol; sleep is longer on weekends.
+    """
+    import random
+    from datetime import date, timedelta
+    from decimal import Decimal
+    from app.models.entry import EntryValue
+
+    rng = random.Random(42)
+    sleep, mood, exercise, alcohol = tracked_metrics
+    today = date.today()
+    entries = []
+    drank_yesterday = False
+
+    for offset in range(119, -1, -1):
+        entry_date = today - timedelta(days=offset)
+        did_exercise = offset % 3 == 0
+        did_drink = offset % 7 == 2
+        weekend = entry_date.weekday() >= 5
+
+        mood_value = 5.0 + 2.0 * did_exercise - 1.0 * drank_yesterday + rng.uniform(-0.5, 0.5)
+        sleep_value = (8.0 if weekend else 7.0) + rng.uniform(-0.5, 0.5)
+
+        entry = Entry(user_id=test_user.id, entry_date=entry_date)
+        entry.values = [
+            EntryValue(metric_id=sleep.id, value_numeric=Decimal(str(round(sleep_value, 2)))),
+            EntryValue(metric_id=mood.id, value_numeric=Decimal(str(round(mood_value, 2)))),
+            EntryValue(metric_id=exercise.id, value_boolean=did_exercise),
+            EntryValue(metric_id=alcohol.id, value_boolean=did_drink),
+        ]
+        test_db.add(entry)
+        entries.append(entry)
+        drank_yesterday = did_drink
+
+    test_db.commit()
+    return entries
+
+
+@pytest.fixture(autouse=True)
+def clear_analytics_cache():
+    """
+    Each test gets a fresh database whose IDs start over, so cached
+    analytics results must not leak between tests.
+    """
+    from app.analytics.cache import analytics_cache
+
+    analytics_cache.clear()
+    yield
+    analytics_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_metric_spec_cache():
+    """
+    Fixtures create metrics directly in the database, bypassing the
+    invalidation done by MetricService.
+    """
+    from app.services.metric_spec_cache import metric_spec_cache
+
+    metric_spec_cache.clear()
+    yield
+    metric_spec_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    """
+    Tokens issued in the same second for the same user ID are identical,
+    so cached principals must not outlive the test database.
+    """
+    from app.security.principal_cache import principal_cache
+
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_refresh_token_store():
+    """
+    User IDs start over with every test database, so revocations must
+    not leak between tests.
+    """
+    from app.security.refresh_tokens import refresh_token_registry
+
+    refresh_token_registry.store.clear()
+    yield
+    refresh_token_registry.store.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_rate_limits():
+    """Every test starts with full rate-limit buckets"""
+    from app.middleware.rate_limit import rate_limit_store
+
+    # Both stores have an async clear()
+    asyncio.run(rate_limit_store.clear())
+    yield
+    asyncio.run(rate_limit_store.clear())
+
+
+@pytest.fixture(autouse=True)
+def clear_telemetry():
+    """Every test starts with empty request and analytics metrics"""
+    from app.utils.telemetry import registry
+
+    registry.clear()
+    yield
+    registry.clear()
+
+
+@pytest.fixture
+def query_count():
+    """
+    Number of SQL statements a request ran, read from its Server-Timing header.
+
+    Usage:
+        assert query_count(client.get(url, headers=user_headers)) <= 3
+    """
+    from app.utils.query_stats import query_count as parse
+
+    return lambda response: parse(response.headers["server-timing"])
+
+
+@pytest.fixture(scope="function")
+def sql_statements(test_db: Session) -> Generator[list, None, None]:
+    """
+    Record every SQL statement executed on the test engine.
+
+    Clear the list before the code under test to count its queries.
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = test_db.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
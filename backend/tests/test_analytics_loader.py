@@ -0,0 +1,225 @@
+"""
+Unit tests for the columnar analytics loader
+"""
+import pytest
+import numpy as np
+from datetime import date, timedelta
+from decimal import Decimal
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.models.metric import Metric
+from app.models.entry import Entry, EntryValue
+from app.analytics.loader import load_observations, load_metric_matrix
+from app.analytics.matrix import ANALYTICS_MAX_RANGE_DAYS
+from app.services.analytics_service import AnalyticsService
+
+
+def _add_days(db: Session, user: User, metrics: list, days: int) -> None:
+    """Add one entry per day with a value for every metric"""
+    today = date.today()
+    for offset in range(days):
+        entry = Entry(user_id=user.id, entry_date=today - timedelta(days=offset))
+        entry.values = [
+            EntryValue(metric_id=m.id, value_boolean=offset % 2 == 0)
+            if m.value_type == 'boolean'
+            else EntryValue(metric_id=m.id, value_numeric=Decimal(offset % 10))
+            for m in metrics
+        ]
+        db.add(entry)
+    db.commit()
+
+
+class TestLoader:
+    """Tests for load_observations and load_metric_matrix"""
+
+    def test_load_observations_types(self, test_db: Session, test_user: User,
+                                     tracked_metrics: list, daily_entries: list):
+        """Test values are floats, booleans 1/0, dates datetime64"""
+        mood, exercise = tracked_metrics[1], tracked_metrics[2]
+
+        dates, ids, values = load_observations(
+            test_db, test_user.id, [mood.id, exercise.id], order_by_date=True
+        )
+
+        assert dates.dtype == np.dtype('datetime64[D]')
+        assert len(dates) == 2 * len(daily_entries)
+        assert np.all(np.diff(dates.astype(np.int64)) >= 0)
+        assert set(values[ids == exercise.id]) == {0.0, 1.0}
+        assert values[ids == mood.id].min() >= 1.0
+
+    def test_load_observations_empty(self, test_db: Session, test_user: User):
+        """Test no metrics and no rows"""
+        dates, ids, values = load_observations(test_db, test_user.id, [])
+
+        assert len(dates) == len(ids) == len(values) == 0
+
+    def test_load_metric_matrix_calendar_aligned(self, test_db: Session, test_user: User,
+                                                 tracked_metrics: list, daily_entries: list):
+        """Test the matrix has one row per day, including days without entries"""
+        # Drop a day in the middle: it must stay a (NaN) row
+        gap = daily_entries[10]
+        test_db.delete(gap)
+        test_db.commit()
+
+        matrix = load_metric_matrix(test_db, test_user.id, tracked_metrics)
+
+        assert matrix.n_days == len(daily_entries)
+        assert np.all(np.isnan(matrix.values[10]))
+        assert matrix.observed_days() == len(daily_entries) - 1
+
+    def test_load_metric_matrix_clamped_to_observations(self, test_db: Session, test_user: User,
+                                                        tracked_metrics: list, daily_entries: list):
+        """Test rows outside the observed days are not allocated"""
+        matrix = load_metric_matrix(
+            test_db, test_user.id, tracked_metrics,
+            date_from=date(1, 1, 1), date_to=date(9999, 12, 31)
+        )
+
+        assert matrix.n_days == len(daily_entries)
+        assert matrix.dates[0] == np.datetime64(daily_entries[0].entry_date, 'D')
+
+    def test_load_metric_matrix_ignores_old_outlier(self, test_db: Session, test_user: User,
+                                                    tracked_metrics: list, daily_entries: list):
+        """Test one ancient entry does not stretch the implied range"""
+        outlier = Entry(user_id=test_user.id, entry_date=date(1, 1, 1))
+        outlier.values = [EntryValue(metric_id=tracked_metrics[1].id, value_numeric=Decimal(5))]
+        test_db.add(outlier)
+        test_db.commit()
+
+        matrix = load_metric_matrix(test_db, test_user.id, tracked_metrics)
+
+        assert matrix.n_days == ANALYTICS_MAX_RANGE_DAYS + 1
+        assert matrix.dates[-1] == np.datetime64(daily_entries[-1].entry_date, 'D')
+        assert matrix.observed_days() == len(daily_entries)
+
+    def test_load_metric_matrix_no_observations_in_range(self, test_db: Session, test_user: User,
+                                                         tracked_metrics: list, daily_entries: list):
+        """Test a range without data gives an empty matrix"""
+        far_past = daily_entries[0].entry_date - timedelta(days=1000)
+
+        matrix = load_metric_matrix(
+            test_db, test_user.id, tracked_metrics,
+            date_from=far_past, date_to=far_past + timedelta(days=10)
+        )
+
+        assert matrix.n_days == 0
+        assert matrix.observed_days() == 0
+
+    def test_text_values_are_missing(self, test_db: Session, test_user: User):
+        """Test text values load as NaN"""
+        metric = Metric(user_id=test_user.id, name_key="note", category="notes", value_type="text")
+        test_db.add(metric)
+        test_db.flush()
+        entry = Entry(user_id=test_user.id, entry_date=date.today())
+        entry.values = [EntryValue(metric_id=metric.id, value_text="hello")]
+        test_db.add(entry)
+        test_db.commit()
+
+        _, _, values = load_observations(test_db, test_user.id, [metric.id])
+
+        assert len(values) == 1 and np.isnan(values[0])
+
+
+class TestConstantQueryCount:
+    """Analytics must not issue per-entry queries"""
+
+    @pytest.mark.parametrize("method, kwargs", [
+        ("get_statistics", {}),
+        ("get_correlations", {"max_lag": 1}),
+        ("get_group_differences", {}),
+    ])
+    def test_query_count_independent_of_range(self, test_db: Session, test_user: User,
+                                              tracked_metrics: list, sql_statements: list,
+                                              method: str, kwargs: dict):
+        """Test the number of queries is the same for 10 and 200 days"""
+        service = AnalyticsService(test_db)
+        user_id = test_user.id
+
+        def count_queries():
+            sql_statements.clear()
+            getattr(service, method)(user_id=user_id, **kwargs)
+            return len(sql_statements)
+
+        _add_days(test_db, test_user, tracked_metrics, 10)
+        short_range = count_queries()
+
+        test_db.query(EntryValue).delete()
+        test_db.query(Entry).delete()
+        test_db.commit()
+        _add_days(test_db, test_user, tracked_metrics, 200)
+        long_range = count_queries()
+
+        assert short_range == long_range
+        assert long_range <= 2
+
+
+class TestServiceOnMatrix:
+    """Correlations and statistics computed from the loaded matrix"""
+
+    def test_correlations_find_exercise_mood(self, test_db: Session, test_user: User,
+                                             tracked_metrics: list, daily_entries: list):
+        """Test the strongest correlation is exercise vs mood"""
+        results = AnalyticsService(test_db).get_correlations(user_id=test_user.id, max_lag=0)
+
+        top = results[0]
+        assert {top.metric_1_name, top.metric_2_name} == {"mood", "exercise"}
+        assert top.coefficient > 0.7
+        assert top.sample_size == len(daily_entries)
+
+    def test_statistics_match_numpy(self, test_db: Session, test_user: User,
+                                    tracked_metrics: list, daily_entries: list):
+        """Test statistics against values read through the ORM"""
+        mood = tracked_metrics[1]
+        stats = AnalyticsService(test_db).get_statistics(user_id=test_user.id, metric_ids=[mood.id])
+
+        expected = [float(v.value_numeric) for e in daily_entries for v in e.values
+                    if v.metric_id == mood.id]
+        [mood_stats] = stats
+        assert mood_stats["count"] == len(expected)
+        assert mood_stats["mean"] == pytest.approx(np.mean(expected))
+        assert mood_stats["median"] == pytest.approx(np.median(expected))
+
+
+class TestExtremeDateRanges:
+    """Requested date ranges must not size the work done"""
+
+    @pytest.mark.parametrize("method, url, body", [
+        ("get", "/api/v1/analytics/statistics?date_from=0001-01-01&date_to=9999-12-31", None),
+        ("post", "/api/v1/analytics/correlations",
+         {"date_from": "0001-01-01", "date_to": "9999-12-31"}),
+        ("get", "/api/v1/analytics/seasonality?date_from=0001-01-01&date_to=9999-12-31", None),
+        ("post", "/api/v1/analytics/group-differences",
+         {"date_from": "0001-01-01", "date_to": "9999-12-31"}),
+    ])
+    def test_too_wide_range_is_rejected(self, client, user_headers: dict, daily_entries: list,
+                                        method: str, url: str, body: dict):
+        """Test explicit ranges over the limit get 400"""
+        response = getattr(client, method)(url, headers=user_headers, **({"json": body} if body else {}))
+
+        assert response.status_code == 400
+        assert "too wide" in response.json()["detail"]
+
+    def test_open_ended_range_is_clamped(self, client, user_headers: dict, daily_entries: list):
+        """Test a far-away bound alone only covers the observed days"""
+        response = client.get(
+            "/api/v1/analytics/statistics?date_from=0001-01-01", headers=user_headers
+        )
+
+        assert response.status_code == 200
+        assert response.json()["statistics"][0]["count"] == len(daily_entries)
+
+    def test_old_outlier_entry_is_ignored(self, client, user_headers: dict, daily_entries: list,
+                                          tracked_metrics: list):
+        """Test an entry dated year 1 only drops out of analyses without a range"""
+        response = client.post("/api/v1/entries", headers=user_headers, json={
+            "entry_date": "0001-01-01",
+            "values": [{"metric_id": tracked_metrics[1].id, "value": 5}]
+        })
+        assert response.status_code == 201
+
+        response = client.get("/api/v1/analytics/statistics", headers=user_headers)
+
+        assert response.status_code == 200
+        mood = next(s for s in response.json()["statistics"] if s["metric_id"] == tracked_metrics[1].id)
+        assert mood["count"] == len(daily_entries)
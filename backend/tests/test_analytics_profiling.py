@@ -0,0 +1,110 @@
+"""
+Tests for phase timings of the correlation pipeline
+"""
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.analytics.correlation import CorrelationEngine
+from app.analytics.profiling import Trace
+from app.utils.telemetry import analytics_phase_seconds, analytics_work_total
+
+PIPELINE_PHASES = {"load", "pivot", "compute", "rank", "serialize"}
+
+
+class TestTrace:
+    """Unit tests for Trace"""
+
+    def test_spans_accumulate(self):
+        """Re-entering a phase adds to its total"""
+        trace = Trace()
+        for _ in range(3):
+            with trace.span("compute"):
+                pass
+        trace.count("pairs_evaluated")
+        trace.count("pairs_evaluated", 2)
+
+        assert list(trace.spans) == ["compute"]
+        assert trace.total == trace.spans["compute"] > 0
+        assert trace.counters == {"pairs_evaluated": 3}
+
+    def test_span_records_on_error(self):
+        """Time spent before an exception is kept"""
+        trace = Trace()
+        try:
+            with trace.span("load"):
+                raise ValueError()
+        except ValueError:
+            pass
+
+        assert "load" in trace.spans
+
+    def test_as_dict(self):
+        """Spans are reported in milliseconds"""
+        trace = Trace()
+        trace.spans["rank"] = 0.0015
+        trace.count("lags_tested", 4)
+
+        assert trace.as_dict() == {"spans_ms": {"rank": 1.5}, "counters": {"lags_tested": 4}}
+        assert trace.summary() == "rank=1.5ms lags_tested=4"
+
+
+class TestCorrelationEngineTrace:
+    """Counters recorded by CorrelationEngine"""
+
+    def test_counters(self):
+        """Pairs, tested lags and skipped pairs are counted"""
+        trace = Trace()
+        engine = CorrelationEngine(trace=trace)
+        metrics_data = {
+            1: {'name': 'Sleep', 'data': [7, 8, 6, 7, 8, 7, 6, 8, 7, 6]},
+            2: {'name': 'Mood', 'data': [7, 8, 6, 7, 9, 7, 6, 8, 8, 6]},
+            3: {'name': 'Sparse', 'data': [1] + [np.nan] * 9},
+        }
+
+        engine.analyze_all_pairs(metrics_data, max_lag=2)
+
+        # (1, 2) has 10, 9 and 8 overlapping days: all three lags are tested;
+        # both pairs with Sparse have one day and are skipped
+        assert trace.counters == {
+            "pairs_evaluated": 3,
+            "lags_tested": 3,
+            "lags_skipped": 6,
+            "pairs_skipped": 2,
+        }
+        assert set(trace.spans) == {"compute", "rank"}
+
+
+class TestCorrelationDebug:
+    """Tests for the debug field of /analytics/correlations"""
+
+    def test_debug_field_is_opt_in(self, client: TestClient, user_headers: dict, daily_entries: list):
+        """Responses carry no timings unless asked"""
+        response = client.post(
+            "/api/v1/analytics/correlations", json={"max_lag": 1}, headers=user_headers
+        )
+
+        assert response.status_code == 200
+        assert response.json()["debug"] is None
+
+    def test_debug_field(self, client: TestClient, user_headers: dict, daily_entries: list):
+        """All pipeline phases and counters are reported"""
+        response = client.post(
+            "/api/v1/analytics/correlations",
+            json={"max_lag": 1, "debug": True},
+            headers=user_headers
+        )
+
+        assert response.status_code == 200
+        debug = response.json()["debug"]
+        assert set(debug["spans_ms"]) == PIPELINE_PHASES
+        # 4 tracked metrics -> 6 pairs, lags 0 and 1 each
+        assert debug["counters"]["pairs_evaluated"] == 6
+        assert debug["counters"]["lags_tested"] == 12
+
+    def test_phases_are_exported(self, client: TestClient, user_headers: dict, daily_entries: list):
+        """Phase timings and counters reach /metrics"""
+        client.post("/api/v1/analytics/correlations", json={"max_lag": 0}, headers=user_headers)
+
+        for phase in PIPELINE_PHASES:
+            assert analytics_phase_seconds.count("correlations", phase) == 1
+        assert analytics_work_total.value("correlations", "pairs_evaluated") == 6
@@ -2,10 +2,19 @@
 Unit tests for authentication (JWT, password hashing)
 """
 import pytest
+import threading
 from datetime import datetime, timedelta
+from fastapi import HTTPException
 from jose import JWTError
-
-from app.security.password import hash_password, verify_password
+from passlib.hash import bcrypt
+
+from app.security.password import (
+    BoundedExecutor,
+    BCRYPT_ROUNDS,
+    hash_password,
+    password_executor,
+    verify_password
+)
 from app.security.jwt import (
     create_access_token,
     create_refresh_token,
@@ -314,3 +323,66 @@ class TestAuthenticationIntegration:
         assert payload1 is not None
         assert payload2 is not None
         assert payload1["sub"] == payload2["sub"]
+
+
+class TestPasswordExecutor:
+    """Tests for the bounded password hashing pool"""
+
+    def test_rejects_when_saturated(self):
+        """Calls beyond max_pending are rejected with 503"""
+        executor = BoundedExecutor(workers=1, max_pending=1)
+        release = threading.Event()
+        started = threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+            return "done"
+
+        result = []
+        worker = threading.Thread(target=lambda: result.append(executor.run(block)))
+        worker.start()
+        started.wait(5)
+
+        with pytest.raises(HTTPException) as exc:
+            executor.run(lambda: None)
+        assert exc.value.status_code == 503
+        assert executor.stats()["pending"] == 1
+
+        release.set()
+        worker.join(5)
+        assert result == ["done"]
+        assert executor.stats() == {
+            "workers": 1, "pending": 0, "queued": 0, "completed": 1, "rejected": 1
+        }
+
+    def test_login_returns_503_when_saturated(self, client, test_user, monkeypatch):
+        """Login is refused instead of queueing without bound"""
+        monkeypatch.setattr(password_executor, "max_pending", 0)
+
+        response = client.post("/api/v1/auth/login", json={
+            "email": test_user.email, "password": "testpassword123"
+        })
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+
+    def test_login_upgrades_outdated_hash(self, client, test_db, test_user):
+        """A hash with a different cost factor is replaced on login"""
+        test_user.password_hash = bcrypt.using(rounds=4).hash("testpassword123")
+        test_db.commit()
+
+        response = client.post("/api/v1/auth/login", json={
+            "email": test_user.email, "password": "testpassword123"
+        })
+
+        assert response.status_code == 200
+        test_db.refresh(test_user)
+        assert test_user.password_hash.startswith(f"$2b${BCRYPT_ROUNDS:02d}$")
+        assert verify_password("testpassword123", test_user.password_hash)
+
+    def test_health_reports_queue_depth(self, client):
+        """Pool statistics are exposed on /health"""
+        data = client.get("/health").json()
+
+        assert data["password_hashing"]["pending"] == 0
@@ -0,0 +1,170 @@
+"""
+Unit tests for period-over-period comparison
+"""
+import pytest
+import numpy as np
+from datetime import date, timedelta
+from fastapi.testclient import TestClient
+from scipy import stats
+
+from app.analytics.comparison import compare_periods
+from app.analytics.effect_size import nan_moments, cohens_d, welch_t_test
+
+
+class TestVectorizedStatistics:
+    """Vectorized statistics must match scipy's per-column results"""
+
+    def test_nan_moments_ignores_nan(self):
+        """Test count, mean and variance with missing values"""
+        values = np.array([[1.0, np.nan], [2.0, 4.0], [3.0, np.nan], [np.nan, np.nan]])
+
+        count, mean, variance = nan_moments(values)
+
+        assert list(count) == [3, 1]
+        assert mean[0] == pytest.approx(2.0)
+        assert mean[1] == pytest.approx(4.0)
+        assert variance[0] == pytest.approx(1.0)
+        assert np.isnan(variance[1])  # Single value has no sample variance
+
+    def test_welch_matches_scipy(self):
+        """Test Welch t-test against scipy.stats.ttest_ind(equal_var=False)"""
+        rng = np.random.default_rng(0)
+        a = rng.normal(5.0, 1.0, size=(30, 4))
+        b = rng.normal(5.5, 2.0, size=(25, 4))
+
+        n1, m1, v1 = nan_moments(a)
+        n2, m2, v2 = nan_moments(b)
+        t, _, p_value = welch_t_test(n1, m1, v1, n2, m2, v2)
+
+        for col in range(4):
+            expected = stats.ttest_ind(a[:, col], b[:, col], equal_var=False)
+            assert t[col] == pytest.approx(expected.statistic)
+            assert p_value[col] == pytest.approx(expected.pvalue)
+
+    def test_cohens_d_known_value(self):
+        """Test Cohen's d with equal variances"""
+        d = cohens_d(
+            np.array([10]), np.array([6.0]), np.array([4.0]),
+            np.array([10]), np.array([5.0]), np.array([4.0])
+        )
+
+        assert d[0] == pytest.approx(0.5)
+
+    def test_constant_columns_are_nan(self):
+        """Test that zero variance yields NaN instead of infinities"""
+        current = np.ones((5, 1))
+        previous = np.ones((5, 1))
+
+        comparison = compare_periods(current, previous)
+
+        assert comparison.delta[0] == 0.0
+        assert np.isnan(comparison.p_value[0])
+        assert np.isnan(comparison.effect_size[0])
+
+
+class TestComparisonAPI:
+    """Tests for the /analytics/comparison endpoint"""
+
+    def test_comparison_default_previous_period(self, client: TestClient, user_headers: dict,
+                                                tracked_metrics: list, daily_entries: list):
+        """Test that the previous period defaults to the preceding window"""
+        today = date.today()
+        response = client.post(
+            "/api/v1/analytics/comparison",
+            json={
+                "current_from": str(today - timedelta(days=29)),
+                "current_to": str(today)
+            },
+            headers=user_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["previous_period"] == {
+            "from": str(today - timedelta(days=59)),
+            "to": str(today - timedelta(days=30))
+        }
+        assert len(data["comparisons"]) == len(tracked_metrics)
+
+        for item in data["comparisons"]:
+            assert item["current_count"] == 30
+            assert item["previous_count"] == 30
+            assert item["delta"] == pytest.approx(item["current_mean"] - item["previous_mean"])
+
+    def test_comparison_matches_scipy(self, client: TestClient, user_headers: dict,
+                                      tracked_metrics: list, daily_entries: list):
+        """Test endpoint results against a direct scipy computation"""
+        today = date.today()
+        mood = tracked_metrics[1]
+        current_from = today - timedelta(days=13)
+        previous_from, previous_to = today - timedelta(days=60), today - timedelta(days=40)
+
+        response = client.post(
+            "/api/v1/analytics/comparison",
+            json={
+                "metric_ids": [mood.id],
+                "current_from": str(current_from),
+                "current_to": str(today),
+                "previous_from": str(previous_from),
+                "previous_to": str(previous_to)
+            },
+            headers=user_headers
+        )
+
+        assert response.status_code == 200
+        [item] = response.json()["comparisons"]
+
+        def mood_values(start, end):
+            return [
+                float(v.value_numeric)
+                for e in daily_entries if start <= e.entry_date <= end
+                for v in e.values if v.metric_id == mood.id
+            ]
+
+        expected = stats.ttest_ind(
+            mood_values(current_from, today),
+            mood_values(previous_from, previous_to),
+            equal_var=False
+        )
+        assert item["p_value"] == pytest.approx(expected.pvalue)
+
+    def test_comparison_invalid_period(self, client: TestClient, user_headers: dict):
+        """Test that an inverted period is rejected"""
+        response = client.post(
+            "/api/v1/analytics/comparison",
+            json={"current_from": "2024-06-30", "current_to": "2024-06-01"},
+            headers=user_headers
+        )
+
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize("body", [
+        {"current_from": "0001-01-01", "current_to": "9999-12-31"},
+        {"current_from": "2024-01-01", "current_to": "2024-01-31",
+         "previous_from": "0001-01-01", "previous_to": "0001-01-31"},
+    ])
+    def test_comparison_range_too_wide(self, client: TestClient, user_headers: dict, body: dict):
+        """Test that periods spanning more than the range limit are rejected"""
+        response = client.post("/api/v1/analytics/comparison", json=body, headers=user_headers)
+
+        assert response.status_code == 400
+        assert "too wide" in response.json()["detail"]
+
+    def test_comparison_no_period_before_year_one(self, client: TestClient, user_headers: dict):
+        """Test that the default previous period cannot underflow the calendar"""
+        response = client.post(
+            "/api/v1/analytics/comparison",
+            json={"current_from": "0001-01-01", "current_to": "0001-01-31"},
+            headers=user_headers
+        )
+
+        assert response.status_code == 400
+
+    def test_comparison_unauthorized(self, client: TestClient):
+        """Test comparison without authentication"""
+        response = client.post(
+            "/api/v1/analytics/comparison",
+            json={"current_from": "2024-06-01", "current_to": "2024-06-30"}
+        )
+
+        assert response.status_code in (401, 403)
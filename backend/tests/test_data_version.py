@@ -0,0 +1,86 @@
+"""
+Tests for the per-user data version counter
+"""
+from datetime import date
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.services import DataVersionService
+
+
+class TestDataVersion:
+    """Tests for DataVersionService bumps on entry and metric mutations"""
+
+    def version(self, db: Session, user: User) -> int:
+        return DataVersionService.get(db, user.id)
+
+    def test_new_user_starts_at_zero(self, test_db: Session, test_user: User):
+        """Test initial version"""
+        assert self.version(test_db, test_user) == 0
+
+    def test_unknown_user(self, test_db: Session):
+        """Test version of a user that does not exist"""
+        assert DataVersionService.get(test_db, 999999) == 0
+
+    def test_entry_mutations_bump_version(self, client: TestClient, test_db: Session,
+                                          test_user: User, user_headers: dict,
+                                          tracked_metrics: list):
+        """Test create, update and delete of an entry each bump the version"""
+        before = self.version(test_db, test_user)
+
+        response = client.post("/api/v1/entries", headers=user_headers, json={
+            "entry_date": str(date(2024, 1, 1)),
+            "values": [{"metric_id": tracked_metrics[0].id, "value": 7}]
+        })
+        entry_id = response.json()["id"]
+        assert self.version(test_db, test_user) == before + 1
+
+        client.patch(f"/api/v1/entries/{entry_id}", headers=user_headers, json={"notes": "ok"})
+        assert self.version(test_db, test_user) == before + 2
+
+        client.delete(f"/api/v1/entries/{entry_id}", headers=user_headers)
+        assert self.version(test_db, test_user) == before + 3
+
+    def test_metric_mutations_bump_version(self, client: TestClient, test_db: Session,
+                                           test_user: User, user_headers: dict):
+        """Test create, update, archive and delete of a metric each bump the version"""
+        response = client.post("/api/v1/metrics", headers=user_headers, json={
+            "name_key": "focus", "category": "psychological", "value_type": "range",
+            "min_value": 1, "max_value": 10
+        })
+        assert response.status_code == 201
+        metric_id = response.json()["id"]
+        assert self.version(test_db, test_user) == 1
+
+        client.patch(f"/api/v1/metrics/{metric_id}", headers=user_headers, json={"color": "#ffffff"})
+        client.delete(f"/api/v1/metrics/{metric_id}", headers=user_headers)
+        client.post(f"/api/v1/metrics/{metric_id}/unarchive", headers=user_headers)
+
+        assert self.version(test_db, test_user) == 4
+
+    def test_failed_mutation_does_not_bump(self, client: TestClient, test_db: Session,
+                                           test_user: User, user_headers: dict,
+                                           tracked_metrics: list, daily_entries: list):
+        """Test a rejected duplicate entry leaves the version unchanged"""
+        before = self.version(test_db, test_user)
+
+        response = client.post("/api/v1/entries", headers=user_headers, json={
+            "entry_date": str(daily_entries[0].entry_date),
+            "values": [{"metric_id": tracked_metrics[0].id, "value": 7}]
+        })
+
+        assert response.status_code == 400
+        assert self.version(test_db, test_user) == before
+
+    def test_bump_does_not_touch_profile_timestamp(self, test_db: Session, test_user: User):
+        """Test bumping keeps users.updated_at"""
+        user_id = test_user.id
+        updated_at = test_user.updated_at
+
+        DataVersionService.bump(test_db, user_id)
+        test_db.commit()
+
+        user = test_db.get(User, user_id)
+        assert user.data_version == 1
+        assert user.updated_at == updated_at
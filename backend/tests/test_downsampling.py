@@ -0,0 +1,89 @@
+"""
+Unit tests for LTTB downsampling and the timeseries endpoint
+"""
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.analytics.downsampling import lttb
+
+
+class TestLTTB:
+    """Tests for the lttb function"""
+
+    def test_returns_all_points_below_threshold(self):
+        """Test short series are returned unchanged"""
+        x = np.arange(10)
+
+        assert list(lttb(x, x * 2.0, 20)) == list(range(10))
+
+    def test_keeps_endpoints_and_size(self):
+        """Test output size and first/last points"""
+        x = np.arange(1000)
+        y = np.sin(x / 30.0)
+
+        keep = lttb(x, y, 100)
+
+        assert len(keep) == 100
+        assert keep[0] == 0
+        assert keep[-1] == 999
+        assert np.all(np.diff(keep) > 0)
+
+    def test_preserves_spike(self):
+        """Test a single outlier survives downsampling"""
+        x = np.arange(500)
+        y = np.zeros(500)
+        y[250] = 10.0
+
+        keep = lttb(x, y, 20)
+
+        assert 250 in keep
+
+
+class TestTimeSeriesAPI:
+    """Tests for the /analytics/timeseries endpoint"""
+
+    def test_timeseries_columnar(self, client: TestClient, user_headers: dict,
+                                 tracked_metrics: list, daily_entries: list):
+        """Test full series as columnar arrays"""
+        mood = tracked_metrics[1]
+
+        response = client.get(f"/api/v1/analytics/timeseries/{mood.id}", headers=user_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_points"] == len(daily_entries)
+        assert len(data["dates"]) == len(data["values"]) == len(daily_entries)
+        assert data["dates"] == sorted(data["dates"])
+        assert data["downsampled"] is False
+
+    def test_timeseries_downsampled(self, client: TestClient, user_headers: dict,
+                                    tracked_metrics: list, daily_entries: list):
+        """Test max_points applies LTTB"""
+        mood = tracked_metrics[1]
+
+        response = client.get(
+            f"/api/v1/analytics/timeseries/{mood.id}?max_points=30",
+            headers=user_headers
+        )
+
+        data = response.json()
+        assert len(data["values"]) == 30
+        assert data["total_points"] == len(daily_entries)
+        assert data["downsampled"] is True
+        assert data["dates"][0] == str(daily_entries[0].entry_date)
+        assert data["dates"][-1] == str(daily_entries[-1].entry_date)
+
+    def test_timeseries_boolean_metric(self, client: TestClient, user_headers: dict,
+                                       tracked_metrics: list, daily_entries: list):
+        """Test boolean values are returned as 0/1"""
+        exercise = tracked_metrics[2]
+
+        response = client.get(f"/api/v1/analytics/timeseries/{exercise.id}", headers=user_headers)
+
+        assert set(response.json()["values"]) == {0.0, 1.0}
+
+    def test_timeseries_metric_not_found(self, client: TestClient, user_headers: dict):
+        """Test unknown metric"""
+        response = client.get("/api/v1/analytics/timeseries/9999", headers=user_headers)
+
+        assert response.status_code == 404
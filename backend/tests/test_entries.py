@@ -355,3 +355,295 @@ class TestEntriesAPI:
 
         # Should return validation error
         assert response.status_code == 400
+
+
+class TestEntriesQueryCount:
+    """Read paths must not issue one query per entry"""
+
+    def _count(self, client: TestClient, url: str, headers: dict, sql_statements: list,
+               test_db: Session) -> int:
+        # Warm the principal cache, then measure as a fresh session would
+        client.get(url, headers=headers)
+        test_db.expire_all()
+        sql_statements.clear()
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        return len(sql_statements)
+
+    def test_list_query_count_independent_of_page_size(self, client: TestClient, user_headers: dict,
+                                                       daily_entries: list, sql_statements: list,
+                                                       test_db: Session):
+        """Test a page of 5 and a page of 100 entries cost the same number of queries"""
+        small_page = self._count(client, "/api/v1/entries?limit=5", user_headers, sql_statements, test_db)
+        large_page = self._count(client, "/api/v1/entries?limit=100", user_headers, sql_statements, test_db)
+
+        assert small_page == large_page
+
+    def test_list_returns_values(self, client: TestClient, user_headers: dict,
+                                 tracked_metrics: list, daily_entries: list):
+        """Test eagerly loaded values are serialized"""
+        response = client.get("/api/v1/entries?limit=10", headers=user_headers)
+
+        for entry in response.json()["entries"]:
+            assert len(entry["values"]) == len(tracked_metrics)
+
+    def test_get_entry_query_count(self, client: TestClient, user_headers: dict,
+                                   daily_entries: list, sql_statements: list, test_db: Session):
+        """Test single-entry reads load values with a bounded number of queries"""
+        entry = daily_entries[-1]
+        entry_id, entry_date = entry.id, entry.entry_date
+
+        by_id = self._count(client, f"/api/v1/entries/{entry_id}", user_headers, sql_statements, test_db)
+        by_date = self._count(client, f"/api/v1/entries/date/{entry_date}",
+                              user_headers, sql_statements, test_db)
+
+        # Data version (ETag), entry, values
+        assert by_id == by_date == 3
+
+
+class TestEntriesCursorPagination:
+    """Tests for keyset pagination on GET /entries"""
+
+    def test_cursor_walks_all_entries(self, client: TestClient, user_headers: dict,
+                                      daily_entries: list):
+        """Test following next_cursor returns every entry exactly once, newest first"""
+        seen = []
+        url = "/api/v1/entries?limit=25"
+
+        while True:
+            data = client.get(url, headers=user_headers).json()
+            seen.extend(e["entry_date"] for e in data["entries"])
+            if not data["next_cursor"]:
+                assert data["has_more"] is False
+                break
+            assert data["has_more"] is True
+            url = f"/api/v1/entries?limit=25&cursor={data['next_cursor']}"
+
+        assert seen == sorted(seen, reverse=True)
+        assert len(seen) == len(set(seen)) == len(daily_entries)
+
+    def test_first_page_includes_total(self, client: TestClient, user_headers: dict,
+                                       daily_entries: list):
+        """Test total is returned without cursor and skipped with one"""
+        first = client.get("/api/v1/entries?limit=10", headers=user_headers).json()
+        assert first["total"] == len(daily_entries)
+
+        second = client.get(f"/api/v1/entries?limit=10&cursor={first['next_cursor']}",
+                            headers=user_headers).json()
+        assert second["total"] is None
+
+    def test_cursor_skips_count_query(self, client: TestClient, user_headers: dict,
+                                      daily_entries: list, sql_statements: list):
+        """Test cursor pages do not run COUNT"""
+        first = client.get("/api/v1/entries?limit=10", headers=user_headers).json()
+
+        sql_statements.clear()
+        client.get(f"/api/v1/entries?limit=10&cursor={first['next_cursor']}", headers=user_headers)
+
+        assert not any("count(" in s.lower() for s in sql_statements)
+
+    def test_offset_still_supported(self, client: TestClient, user_headers: dict,
+                                    daily_entries: list):
+        """Test deprecated offset paging"""
+        data = client.get("/api/v1/entries?limit=10&offset=110", headers=user_headers).json()
+
+        assert len(data["entries"]) == len(daily_entries) - 110
+        assert data["has_more"] is False
+
+    def test_invalid_cursor(self, client: TestClient, user_headers: dict):
+        """Test malformed cursor"""
+        response = client.get("/api/v1/entries?cursor=not-a-cursor", headers=user_headers)
+
+        assert response.status_code == 400
+
+
+class TestEntriesBatch:
+    """Tests for POST /entries/batch"""
+
+    def week(self, metrics: list, start=None) -> list:
+        start = start or datetime.now().date() - timedelta(days=30)
+        return [
+            {
+                "entry_date": str(start + timedelta(days=i)),
+                "notes": f"day {i}",
+                "values": [
+                    {"metric_id": metrics[0].id, "value": 7 + i % 2},
+                    {"metric_id": metrics[2].id, "value": i % 2 == 0}
+                ]
+            }
+            for i in range(7)
+        ]
+
+    def test_batch_create(self, client: TestClient, test_db: Session, user_headers: dict,
+                          tracked_metrics: list):
+        """Test creating a week of entries in one request"""
+        response = client.post("/api/v1/entries/batch", headers=user_headers,
+                               json={"entries": self.week(tracked_metrics)})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created"] == 7
+        assert data["failed"] == 0
+
+        listed = client.get("/api/v1/entries", headers=user_headers).json()
+        assert listed["total"] == 7
+        assert all(len(e["values"]) == 2 for e in listed["entries"])
+        assert {e["id"] for e in listed["entries"]} == {r["entry_id"] for r in data["results"]}
+
+    def test_batch_per_item_errors(self, client: TestClient, user_headers: dict,
+                                   tracked_metrics: list, daily_entries: list):
+        """Test invalid items are reported while valid ones are created"""
+        items = self.week(tracked_metrics, start=daily_entries[0].entry_date - timedelta(days=3))
+        items[1]["values"][0]["metric_id"] = 999999
+        items[2]["values"][0]["value"] = 99  # Above sleep_hours max
+
+        data = client.post("/api/v1/entries/batch", headers=user_headers,
+                           json={"entries": items}).json()
+
+        statuses = [r["status"] for r in data["results"]]
+        # Days 3..6 already exist in daily_entries
+        assert statuses == ["created", "error", "error", "error", "error", "error", "error"]
+        assert "not found" in data["results"][1]["detail"]
+        assert "already exists" in data["results"][3]["detail"]
+
+    def test_batch_duplicate_dates(self, client: TestClient, user_headers: dict,
+                                   tracked_metrics: list):
+        """Test the same date twice in one batch"""
+        items = self.week(tracked_metrics)[:1] * 2
+
+        data = client.post("/api/v1/entries/batch", headers=user_headers,
+                           json={"entries": items}).json()
+
+        assert [r["status"] for r in data["results"]] == ["created", "error"]
+
+    def test_batch_query_count(self, client: TestClient, user_headers: dict,
+                               tracked_metrics: list, sql_statements: list):
+        """Test the number of statements does not grow with the batch size"""
+        today = datetime.now().date()
+        warm_up = self.week(tracked_metrics, today - timedelta(days=90))[:1]
+        small = self.week(tracked_metrics, today - timedelta(days=60))[:2]
+        large = self.week(tracked_metrics, today - timedelta(days=30))
+
+        # Load metric definitions into the cache first
+        client.post("/api/v1/entries/batch", headers=user_headers, json={"entries": warm_up})
+
+        counts = []
+        for items in (small, large):
+            sql_statements.clear()
+            client.post("/api/v1/entries/batch", headers=user_headers, json={"entries": items})
+            counts.append(len(sql_statements))
+
+        assert counts[0] == counts[1]
+
+
+class TestEntryValueUpserts:
+    """Tests for diff-based entry updates and PUT /entries/{id}/values/{metric_id}"""
+
+    def test_update_writes_only_changes(self, client: TestClient, user_headers: dict,
+                                        tracked_metrics: list, daily_entries: list,
+                                        sql_statements: list):
+        """Test unchanged values keep their rows and removed ones are deleted"""
+        entry = daily_entries[3]
+        before = {v["metric_id"]: v for v in
+                  client.get(f"/api/v1/entries/{entry.id}", headers=user_headers).json()["values"]}
+        sleep, mood, exercise, alcohol = (m.id for m in tracked_metrics)
+
+        sql_statements.clear()
+        response = client.patch(f"/api/v1/entries/{entry.id}", headers=user_headers, json={
+            "values": [
+                {"metric_id": sleep, "value": float(before[sleep]["value_numeric"])},
+                {"metric_id": mood, "value": 1},
+                {"metric_id": exercise, "value": before[exercise]["value_boolean"]},
+            ]
+        })
+
+        assert response.status_code == 200
+        after = {v["metric_id"]: v for v in response.json()["values"]}
+        assert set(after) == {sleep, mood, exercise}
+        assert after[sleep]["id"] == before[sleep]["id"]
+        assert after[mood]["id"] == before[mood]["id"]
+        assert float(after[mood]["value_numeric"]) == 1
+
+        writes = [s for s in sql_statements if s.startswith(("INSERT", "DELETE"))]
+        assert len(writes) == 2  # One upsert, one targeted delete
+        assert "ON CONFLICT" in writes[0] or "ON CONFLICT" in writes[1]
+
+    def test_noop_update(self, client: TestClient, test_db: Session, user_headers: dict,
+                         daily_entries: list, sql_statements: list):
+        """Test resubmitting identical values writes nothing"""
+        entry = daily_entries[3]
+        values = [
+            {"metric_id": v["metric_id"],
+             "value": v["value_boolean"] if v["value_boolean"] is not None else float(v["value_numeric"])}
+            for v in client.get(f"/api/v1/entries/{entry.id}", headers=user_headers).json()["values"]
+        ]
+
+        sql_statements.clear()
+        client.patch(f"/api/v1/entries/{entry.id}", headers=user_headers, json={"values": values})
+
+        assert not any(s.startswith(("INSERT", "UPDATE", "DELETE")) for s in sql_statements)
+
+    def test_duplicate_metric_rejected(self, client: TestClient, user_headers: dict,
+                                       tracked_metrics: list, daily_entries: list):
+        """Test the same metric twice in one update"""
+        metric_id = tracked_metrics[0].id
+        response = client.patch(f"/api/v1/entries/{daily_entries[0].id}", headers=user_headers, json={
+            "values": [{"metric_id": metric_id, "value": 7}, {"metric_id": metric_id, "value": 8}]
+        })
+
+        assert response.status_code == 400
+
+    def test_put_single_value(self, client: TestClient, user_headers: dict,
+                              tracked_metrics: list, daily_entries: list):
+        """Test autosave updates one value in place and creates missing ones"""
+        entry = daily_entries[5]
+        mood = tracked_metrics[1].id
+        before = client.get(f"/api/v1/entries/{entry.id}", headers=user_headers).json()
+        mood_id = next(v["id"] for v in before["values"] if v["metric_id"] == mood)
+
+        response = client.put(f"/api/v1/entries/{entry.id}/values/{mood}",
+                              headers=user_headers, json={"value": 9})
+
+        assert response.status_code == 200
+        assert response.json()["id"] == mood_id
+        assert float(response.json()["value_numeric"]) == 9
+
+        after = client.get(f"/api/v1/entries/{entry.id}", headers=user_headers).json()
+        assert len(after["values"]) == len(before["values"])
+        assert after["updated_at"] >= before["updated_at"]
+
+    def test_put_invalid_value(self, client: TestClient, user_headers: dict,
+                               tracked_metrics: list, daily_entries: list):
+        """Test autosave validation and ownership"""
+        entry_id = daily_entries[5].id
+        mood = tracked_metrics[1].id
+
+        assert client.put(f"/api/v1/entries/{entry_id}/values/{mood}", headers=user_headers,
+                          json={"value": 11}).status_code == 400
+        assert client.put(f"/api/v1/entries/{entry_id}/values/999999", headers=user_headers,
+                          json={"value": 1}).status_code == 400
+        assert client.put(f"/api/v1/entries/999999/values/{mood}", headers=user_headers,
+                          json={"value": 1}).status_code == 404
+
+    def test_update_without_upsert_dialect(self, client: TestClient, test_db: Session,
+                                           user_headers: dict, tracked_metrics: list,
+                                           daily_entries: list, monkeypatch):
+        """Test the ORM fallback on databases without ON CONFLICT"""
+        entry = daily_entries[3]
+        sleep, mood, exercise, alcohol = (m.id for m in tracked_metrics)
+        before = {v["metric_id"]: v for v in
+                  client.get(f"/api/v1/entries/{entry.id}", headers=user_headers).json()["values"]}
+        monkeypatch.setattr(test_db.get_bind().dialect, "name", "mssql")
+
+        client.patch(f"/api/v1/entries/{entry.id}", headers=user_headers,
+                     json={"values": [{"metric_id": mood, "value": 2}]})
+        response = client.patch(f"/api/v1/entries/{entry.id}", headers=user_headers, json={
+            "values": [{"metric_id": mood, "value": 3}, {"metric_id": sleep, "value": 8}]
+        })
+
+        assert response.status_code == 200
+        after = {v["metric_id"]: v for v in response.json()["values"]}
+        assert set(after) == {mood, sleep}
+        assert after[mood]["id"] == before[mood]["id"]
+        assert float(after[mood]["value_numeric"]) == 3
+        assert float(after[sleep]["value_numeric"]) == 8
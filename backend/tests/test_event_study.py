@@ -0,0 +1,97 @@
+"""
+Unit tests for event-study analysis
+"""
+import pytest
+import numpy as np
+from fastapi.testclient import TestClient
+from scipy import stats
+
+from app.analytics.event_study import event_windows
+
+
+class TestEventWindows:
+    """Tests for the event_windows function"""
+
+    def test_matches_per_event_loop(self):
+        """Test strided einsum reduction against an explicit loop over events"""
+        rng = np.random.default_rng(4)
+        n, window = 50, 2
+        events = (rng.random((n, 2)) < 0.2).astype(float)
+        values = rng.normal(size=(n, 3))
+        values[rng.random((n, 3)) < 0.1] = np.nan
+
+        result = event_windows(events, values, window=window)
+
+        for e in range(2):
+            event_days = np.nonzero(events[:, e] == 1)[0]
+            for m in range(3):
+                for i, offset in enumerate(range(-window, window + 1)):
+                    days = event_days + offset
+                    days = days[(days >= 0) & (days < n)]
+                    samples = values[days, m]
+                    samples = samples[~np.isnan(samples)]
+
+                    assert result.count[e, m, i] == len(samples)
+                    if len(samples) > 1:
+                        margin = stats.t.ppf(0.975, len(samples) - 1) * stats.sem(samples)
+                        assert result.mean[e, m, i] == pytest.approx(samples.mean())
+                        assert result.upper[e, m, i] == pytest.approx(samples.mean() + margin)
+
+    def test_offsets_and_event_count(self):
+        """Test offsets and number of events"""
+        events = np.zeros((10, 1))
+        events[[2, 5]] = 1.0
+
+        result = event_windows(events, np.ones((10, 1)), window=3)
+
+        assert list(result.offsets) == [-3, -2, -1, 0, 1, 2, 3]
+        assert result.event_count[0] == 2
+        # Offset -3 from day 2 falls before the first day
+        assert list(result.count[0, 0]) == [1, 2, 2, 2, 2, 2, 2]
+
+
+class TestEventStudyAPI:
+    """Tests for the /analytics/event-study endpoint"""
+
+    def test_event_study_alcohol(self, client: TestClient, user_headers: dict,
+                                 tracked_metrics: list, daily_entries: list):
+        """Test the next-day mood dip after alcohol"""
+        alcohol, mood = tracked_metrics[3], tracked_metrics[1]
+
+        response = client.post(
+            "/api/v1/analytics/event-study",
+            json={"event_metric_ids": [alcohol.id], "window": 2},
+            headers=user_headers
+        )
+
+        assert response.status_code == 200
+        [event] = response.json()["events"]
+        assert event["event_metric_name"] == "alcohol"
+        assert event["offsets"] == [-2, -1, 0, 1, 2]
+        assert event["event_count"] == sum(
+            1 for e in daily_entries for v in e.values
+            if v.metric_id == alcohol.id and v.value_boolean
+        )
+        assert alcohol.id not in [r["metric_id"] for r in event["responses"]]
+
+        [curve] = [r for r in event["responses"] if r["metric_id"] == mood.id]
+        assert curve["mean"][3] < curve["baseline_mean"]
+        assert curve["lower"][3] <= curve["mean"][3] <= curve["upper"][3]
+
+    def test_event_study_missed_value(self, client: TestClient, user_headers: dict,
+                                      tracked_metrics: list, daily_entries: list):
+        """Test event_value=false treats 'no' days as events"""
+        exercise = tracked_metrics[2]
+
+        response = client.post(
+            "/api/v1/analytics/event-study",
+            json={"event_metric_ids": [exercise.id], "event_value": False, "window": 1},
+            headers=user_headers
+        )
+
+        [event] = response.json()["events"]
+        assert event["event_value"] is False
+        assert event["event_count"] == sum(
+            1 for e in daily_entries for v in e.values
+            if v.metric_id == exercise.id and not v.value_boolean
+        )
@@ -0,0 +1,136 @@
+"""
+Tests for the streaming account export
+"""
+import csv
+import io
+import json
+import pytest
+from datetime import date, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models import User, Entry, EntryValue
+from app.services import ExportService
+from app.services import export_service
+
+
+def export(client: TestClient, headers: dict, format: str = "csv"):
+    return client.get("/api/v1/export", headers=headers, params={"format": format})
+
+
+class TestExportAPI:
+    """Tests for GET /export"""
+
+    def test_csv_export(self, client: TestClient, user_headers: dict, daily_entries: list):
+        """CSV has one row per day and one column per metric"""
+        response = export(client, user_headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert "attachment" in response.headers["content-disposition"]
+
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 120
+        assert list(rows[0]) == ["date", "notes", "sleep_hours", "mood", "exercise", "alcohol"]
+        assert rows[0]["date"] == (date.today() - timedelta(days=119)).isoformat()
+        assert rows[-1]["exercise"] == "True"
+
+    def test_ndjson_export(self, client: TestClient, user_headers: dict, daily_entries: list):
+        """NDJSON lists metric definitions before the entries"""
+        response = export(client, user_headers, "ndjson")
+
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        metrics = [l for l in lines if l["type"] == "metric"]
+        entries = [l for l in lines if l["type"] == "entry"]
+
+        assert [m["name_key"] for m in metrics] == ["sleep_hours", "mood", "exercise", "alcohol"]
+        assert metrics[1]["max_value"] == 10
+        assert lines[:4] == metrics
+        assert len(entries) == 120
+        assert set(entries[0]["values"]) == {"sleep_hours", "mood", "exercise", "alcohol"}
+        assert isinstance(entries[0]["values"]["mood"], float)
+
+    def test_entries_without_values(
+        self, client: TestClient, user_headers: dict, test_db: Session, test_user: User,
+        tracked_metrics: list
+    ):
+        """Entries with only notes are exported too"""
+        test_db.add(Entry(user_id=test_user.id, entry_date=date.today(), notes="rest day"))
+        test_db.commit()
+
+        response = export(client, user_headers, "ndjson")
+
+        entry = json.loads(response.text.splitlines()[-1])
+        assert entry["notes"] == "rest day"
+        assert entry["values"] == {}
+
+    def test_export_round_trips_through_import(
+        self, client: TestClient, user_headers: dict, daily_entries: list, test_db: Session
+    ):
+        """A CSV export re-imports without errors"""
+        content = export(client, user_headers).content
+        test_db.query(EntryValue).delete()
+        test_db.query(Entry).delete()
+        test_db.commit()
+
+        response = client.post(
+            "/api/v1/import", headers=user_headers,
+            files={"file": ("export.csv", content, "text/csv")}
+        )
+
+        data = response.json()
+        assert data["error_count"] == 0
+        assert data["entries_created"] == 120
+        assert data["metrics_created"] == []
+
+    def test_batches_split_entries(
+        self, test_db: Session, test_user: User, daily_entries: list, monkeypatch
+    ):
+        """Entries spanning two cursor batches are emitted once, complete"""
+        monkeypatch.setattr(export_service, "EXPORT_BATCH_SIZE", 7)
+
+        chunks = list(ExportService.iter_ndjson(test_db, test_user))
+        entries = [json.loads(l) for c in chunks for l in c.decode().splitlines()][4:]
+
+        assert len(chunks) > 10
+        assert len(entries) == 120
+        assert all(len(e["values"]) == 4 for e in entries)
+        assert len({e["entry_date"] for e in entries}) == 120
+
+    def test_parquet_unavailable(self, client: TestClient, user_headers: dict, monkeypatch):
+        """Parquet requires pyarrow"""
+        monkeypatch.setattr(ExportService, "parquet_available", staticmethod(lambda: False))
+
+        response = export(client, user_headers, "parquet")
+
+        assert response.status_code == 501
+
+    def test_parquet_export(self, client: TestClient, user_headers: dict, daily_entries: list):
+        """Parquet has one row per value"""
+        pq = pytest.importorskip("pyarrow.parquet")
+
+        response = export(client, user_headers, "parquet")
+
+        table = pq.read_table(io.BytesIO(response.content))
+        assert table.num_rows == 480
+        assert table.column_names[:3] == ["entry_date", "notes", "metric"]
+
+    def test_other_users_data_is_not_exported(
+        self, client: TestClient, daily_entries: list, test_db: Session
+    ):
+        """Exports are scoped to the current user"""
+        from app.security.jwt import create_access_token
+
+        other = User(email="other@example.com", password_hash="x")
+        test_db.add(other)
+        test_db.commit()
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': str(other.id)})}"}
+
+        response = export(client, headers)
+
+        assert response.text.strip() == "date,notes"
+
+    def test_invalid_format(self, client: TestClient, user_headers: dict):
+        """Unknown formats are rejected"""
+        assert export(client, user_headers, "xml").status_code == 422
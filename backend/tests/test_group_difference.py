@@ -0,0 +1,97 @@
+"""
+Unit tests for with-vs-without group difference analysis
+"""
+import pytest
+import numpy as np
+from fastapi.testclient import TestClient
+from scipy import stats
+
+from app.analytics.group_difference import group_differences
+
+
+class TestGroupDifferences:
+    """Tests for the group_differences function"""
+
+    def test_matches_scipy_per_pair(self):
+        """Test masked matrix reductions against per-pair scipy calls"""
+        rng = np.random.default_rng(3)
+        n = 80
+        conditions = (rng.random((n, 2)) < 0.4).astype(float)
+        conditions[rng.random((n, 2)) < 0.1] = np.nan
+        outcomes = rng.normal(5, 1, size=(n, 3)) + 1.5 * np.nan_to_num(conditions[:, :1])
+        outcomes[rng.random((n, 3)) < 0.15] = np.nan
+
+        result = group_differences(conditions, outcomes, max_lag=2)
+
+        for lag in range(3):
+            for c in range(2):
+                for o in range(3):
+                    cond = conditions[:n - lag, c]
+                    out = outcomes[lag:, o]
+                    with_values = out[(cond == 1) & ~np.isnan(out)]
+                    without_values = out[(cond == 0) & ~np.isnan(out)]
+                    expected = stats.ttest_ind(with_values, without_values, equal_var=False)
+
+                    assert result.with_count[lag, c, o] == len(with_values)
+                    assert result.without_count[lag, c, o] == len(without_values)
+                    assert result.difference[lag, c, o] == pytest.approx(
+                        with_values.mean() - without_values.mean()
+                    )
+                    assert result.p_value[lag, c, o] == pytest.approx(expected.pvalue)
+
+    def test_lag_detects_next_day_effect(self):
+        """Test an effect that appears one day after the condition"""
+        n = 60
+        conditions = (np.arange(n) % 4 == 0).astype(float)[:, None]
+        outcomes = np.full((n, 1), 5.0) + np.linspace(0, 0.1, n)[:, None]
+        outcomes[1:, 0] -= 2.0 * conditions[:-1, 0]
+
+        result = group_differences(conditions, outcomes, max_lag=1)
+
+        assert abs(result.difference[1, 0, 0]) > abs(result.difference[0, 0, 0])
+        assert result.difference[1, 0, 0] == pytest.approx(-2.0, abs=0.1)
+
+
+class TestGroupDifferenceAPI:
+    """Tests for the /analytics/group-differences endpoint"""
+
+    def test_group_differences_ranked(self, client: TestClient, user_headers: dict,
+                                      tracked_metrics: list, daily_entries: list):
+        """Test exercise -> mood is found and ranking is by effect size"""
+        response = client.post(
+            "/api/v1/analytics/group-differences",
+            json={"max_lag": 1},
+            headers=user_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        differences = data["differences"]
+        assert data["total_differences"] == len(differences)
+
+        effect_sizes = [abs(d["effect_size"]) for d in differences]
+        assert effect_sizes == sorted(effect_sizes, reverse=True)
+
+        top = differences[0]
+        assert top["condition_metric_name"] == "exercise"
+        assert top["outcome_metric_name"] == "mood"
+        assert top["lag"] == 0
+        assert top["difference"] == pytest.approx(2.0, abs=0.3)
+        assert top["significant"] is True
+
+        alcohol_next_day = [
+            d for d in differences
+            if d["condition_metric_name"] == "alcohol" and d["outcome_metric_name"] == "mood"
+            and d["lag"] == 1
+        ]
+        assert alcohol_next_day and alcohol_next_day[0]["difference"] < 0
+
+    def test_group_differences_invalid_lag(self, client: TestClient, user_headers: dict):
+        """Test lag validation"""
+        response = client.post(
+            "/api/v1/analytics/group-differences",
+            json={"max_lag": -1},
+            headers=user_headers
+        )
+
+        assert response.status_code == 422
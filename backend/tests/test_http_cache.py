@@ -0,0 +1,84 @@
+"""
+Tests for ETag / conditional GET support
+"""
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.utils.http_cache import etag_matches
+
+
+class TestEtagMatching:
+    """Tests for If-None-Match parsing"""
+
+    def test_exact_list_and_wildcard(self):
+        """Test single tags, lists, weak prefixes and *"""
+        assert etag_matches('"abc"', '"abc"')
+        assert etag_matches('"x", "abc"', '"abc"')
+        assert etag_matches('W/"abc"', '"abc"')
+        assert etag_matches('*', '"abc"')
+        assert not etag_matches('"abd"', '"abc"')
+
+
+class TestConditionalGet:
+    """Tests for ETag headers and 304 responses on GET routes"""
+
+    ROUTES = [
+        "/api/v1/metrics",
+        "/api/v1/entries?limit=10",
+        "/api/v1/analytics/statistics",
+        "/api/v1/analytics/seasonality",
+    ]
+
+    def test_etag_and_cache_control(self, client: TestClient, user_headers: dict,
+                                    daily_entries: list):
+        """Test responses carry a strong ETag and a private cache policy"""
+        for url in self.ROUTES:
+            response = client.get(url, headers=user_headers)
+
+            assert response.status_code == 200
+            assert response.headers["etag"].startswith('"')
+            assert response.headers["cache-control"].startswith("private")
+
+    def test_not_modified(self, client: TestClient, user_headers: dict, daily_entries: list):
+        """Test matching If-None-Match returns an empty 304"""
+        for url in self.ROUTES:
+            etag = client.get(url, headers=user_headers).headers["etag"]
+
+            response = client.get(url, headers={**user_headers, "If-None-Match": etag})
+
+            assert response.status_code == 304
+            assert response.content == b""
+            assert response.headers["etag"] == etag
+
+    def test_not_modified_skips_queries(self, client: TestClient, user_headers: dict,
+                                        daily_entries: list, sql_statements: list,
+                                        test_db: Session):
+        """Test a 304 only costs the data version lookup"""
+        etag = client.get("/api/v1/entries", headers=user_headers).headers["etag"]
+
+        # Requests normally get a fresh session; the test client shares one
+        test_db.expire_all()
+        sql_statements.clear()
+        client.get("/api/v1/entries", headers={**user_headers, "If-None-Match": etag})
+
+        assert len(sql_statements) == 1
+
+    def test_etag_changes_with_data(self, client: TestClient, user_headers: dict,
+                                    tracked_metrics: list, daily_entries: list):
+        """Test a mutation invalidates the ETag"""
+        etag = client.get("/api/v1/metrics", headers=user_headers).headers["etag"]
+
+        client.patch(f"/api/v1/metrics/{tracked_metrics[0].id}", headers=user_headers,
+                     json={"color": "#000000"})
+        response = client.get("/api/v1/metrics", headers={**user_headers, "If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    def test_etag_depends_on_parameters(self, client: TestClient, user_headers: dict,
+                                        daily_entries: list):
+        """Test different query parameters produce different ETags"""
+        first = client.get("/api/v1/entries?limit=10", headers=user_headers).headers["etag"]
+        second = client.get("/api/v1/entries?limit=20", headers=user_headers).headers["etag"]
+
+        assert first != second
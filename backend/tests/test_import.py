@@ -0,0 +1,203 @@
+"""
+Tests for the bulk import pipeline
+"""
+import io
+import json
+import pytest
+from datetime import date, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models import User, Entry, EntryValue, Metric
+from app.services import DataVersionService
+from app.services.import_service import ImportService, infer_value_type, iter_csv_rows
+
+
+def upload(client: TestClient, headers: dict, content: str, filename: str = "data.csv", **params):
+    return client.post(
+        "/api/v1/import",
+        headers=headers,
+        params=params,
+        files={"file": (filename, content.encode("utf-8"), "text/plain")}
+    )
+
+
+def days_ago(n: int) -> str:
+    return (date.today() - timedelta(days=n)).isoformat()
+
+
+class TestImportAPI:
+    """Tests for POST /import"""
+
+    def test_csv_import_creates_metrics_and_entries(
+        self, client: TestClient, user_headers: dict, test_db: Session, test_user: User
+    ):
+        """Unknown columns become metrics with an inferred type"""
+        content = (
+            "date,Mood,Exercise,Journal,notes\n"
+            f"{days_ago(2)},7,yes,good day,first\n"
+            f"{days_ago(1)},5.5,no,,\n"
+        )
+
+        response = upload(client, user_headers, content)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["rows_read"] == 2
+        assert data["entries_created"] == 2
+        assert data["values_created"] == 5
+        assert data["error_count"] == 0
+        assert data["metrics_created"] == ["mood", "exercise", "journal"]
+
+        types = dict(test_db.query(Metric.name_key, Metric.value_type).filter(
+            Metric.user_id == test_user.id
+        ))
+        assert types == {"mood": "number", "exercise": "boolean", "journal": "text"}
+
+        entry = test_db.query(Entry).filter(Entry.entry_date == date.today() - timedelta(days=2)).one()
+        assert entry.notes == "first"
+        assert DataVersionService.get(test_db, test_user.id) > 0
+
+    def test_existing_metrics_are_matched(
+        self, client: TestClient, user_headers: dict, tracked_metrics: list
+    ):
+        """Columns matching an existing name_key reuse that metric"""
+        content = f"entry_date,mood,exercise\n{days_ago(1)},8,true\n"
+
+        response = upload(client, user_headers, content)
+
+        assert response.status_code == 200
+        assert response.json()["metrics_created"] == []
+        assert response.json()["values_created"] == 2
+
+    def test_rerun_skips_imported_days(self, client: TestClient, user_headers: dict):
+        """Importing the same file twice creates nothing the second time"""
+        content = f"date,mood\n{days_ago(3)},4\n{days_ago(2)},6\n"
+
+        upload(client, user_headers, content)
+        response = upload(client, user_headers, content)
+
+        data = response.json()
+        assert data["entries_created"] == 0
+        assert data["rows_skipped"] == 2
+
+    def test_row_errors_are_reported(
+        self, client: TestClient, user_headers: dict, tracked_metrics: list, test_db: Session
+    ):
+        """Invalid rows are reported and the valid ones still imported"""
+        future = (date.today() + timedelta(days=3)).isoformat()
+        content = (
+            "date,mood\n"
+            f"{days_ago(1)},5\n"
+            "not-a-date,5\n"
+            f"{days_ago(2)},50\n"
+            f"{future},5\n"
+        )
+
+        response = upload(client, user_headers, content)
+
+        data = response.json()
+        assert data["entries_created"] == 1
+        assert data["error_count"] == 3
+        errors = {e["row"]: e["detail"] for e in data["errors"]}
+        assert sorted(errors) == [2, 3, 4]
+        assert "maximum" in errors[3]
+        assert test_db.query(Entry).count() == 1
+
+    def test_extra_fields_are_a_row_error(
+        self, client: TestClient, user_headers: dict, tracked_metrics: list, test_db: Session
+    ):
+        """Rows with more fields than the header are reported, not a 500"""
+        content = f"date,mood\n{days_ago(1)},7,extra\n{days_ago(2)},5\n"
+
+        response = upload(client, user_headers, content)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["entries_created"] == 1
+        assert [e["row"] for e in data["errors"]] == [1]
+        assert "more fields" in data["errors"][0]["detail"]
+
+    def test_no_create_ignores_unknown_columns(
+        self, client: TestClient, user_headers: dict, tracked_metrics: list, test_db: Session
+    ):
+        """With create_missing=false unknown columns are skipped"""
+        content = f"date,mood,caffeine\n{days_ago(1)},5,3\n"
+
+        response = upload(client, user_headers, content, create_missing="false")
+
+        assert response.json()["values_created"] == 1
+        assert test_db.query(Metric).filter(Metric.name_key == "caffeine").count() == 0
+
+    def test_ndjson_import(self, client: TestClient, user_headers: dict, test_db: Session):
+        """NDJSON files are detected from the extension"""
+        lines = [
+            {"date": days_ago(2), "sleep": 7.5, "alcohol": False},
+            {"date": days_ago(1), "sleep": 6, "alcohol": True},
+        ]
+        content = "\n".join(json.dumps(line) for line in lines) + "\n"
+
+        response = upload(client, user_headers, content, filename="export.ndjson")
+
+        assert response.status_code == 200
+        assert response.json()["values_created"] == 4
+        assert test_db.query(EntryValue).filter(EntryValue.value_boolean == True).count() == 1
+
+    def test_missing_date_column(self, client: TestClient, user_headers: dict):
+        """A file without a date column is rejected"""
+        response = upload(client, user_headers, "mood\n5\n")
+
+        assert response.status_code == 400
+
+    def test_malformed_ndjson(self, client: TestClient, user_headers: dict):
+        """Invalid JSON lines reject the upload"""
+        response = upload(client, user_headers, "[1, 2]\n", format="ndjson")
+
+        assert response.status_code == 400
+
+    def test_requires_auth(self, client: TestClient):
+        """Import requires authentication"""
+        response = upload(client, {}, "date,mood\n")
+
+        assert response.status_code in [401, 403]
+
+
+class TestImportService:
+    """Tests for chunked processing"""
+
+    def test_rows_are_processed_in_chunks(self, test_db: Session, test_user: User):
+        """Every chunk is committed and reported separately"""
+        content = "date,mood\n" + "".join(f"{days_ago(n)},{n % 10}\n" for n in range(1, 26))
+        reports = []
+
+        report = ImportService.import_rows(
+            test_db, test_user, iter_csv_rows(io.StringIO(content)),
+            chunk_size=10,
+            progress=lambda r: reports.append((r.rows_read, r.entries_created))
+        )
+
+        assert reports == [(10, 10), (20, 20), (25, 25)]
+        assert report.metrics_created == ["mood"]
+        assert test_db.query(Entry).count() == 25
+
+    def test_column_map(self, test_db: Session, test_user: User, tracked_metrics: list):
+        """Columns can be mapped to existing metrics explicitly"""
+        rows = [{"date": days_ago(1), "Hours slept": "7"}]
+
+        report = ImportService.import_rows(
+            test_db, test_user, rows, column_map={"Hours slept": "sleep_hours"}
+        )
+
+        assert report.metrics_created == []
+        assert report.values_created == 1
+
+    @pytest.mark.parametrize("samples,expected", [
+        (["1", "0", "1"], "number"),
+        (["yes", "no"], "boolean"),
+        ([True, False], "boolean"),
+        (["3", "high"], "text"),
+        (["", None], "text"),
+    ])
+    def test_infer_value_type(self, samples, expected):
+        """Types are inferred from the sample values"""
+        assert infer_value_type(samples) == expected
@@ -0,0 +1,119 @@
+"""
+Tests for the per-user metric definition cache used by entry validation
+"""
+from datetime import date, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.services.metric_spec_cache import MetricSpecCache, metric_spec_cache
+
+
+def entry(metrics: list, day: date, sleep=7) -> dict:
+    return {
+        "entry_date": str(day),
+        "values": [
+            {"metric_id": metrics[0].id, "value": sleep},
+            {"metric_id": metrics[1].id, "value": 6},
+            {"metric_id": metrics[2].id, "value": True},
+        ]
+    }
+
+
+class TestMetricSpecCache:
+    """Tests for MetricSpecCache loading and expiry"""
+
+    def test_loads_active_metrics(self, test_db: Session, test_user: User,
+                                  tracked_metrics: list):
+        """Test only non-archived metrics with float bounds are loaded"""
+        tracked_metrics[3].archived = True
+        test_db.commit()
+        ids = [m.id for m in tracked_metrics]
+
+        specs = MetricSpecCache().get(test_db, test_user.id)
+
+        assert set(specs) == set(ids[:3])
+        assert specs[ids[0]].max_value == 12.0
+        assert isinstance(specs[ids[0]].max_value, float)
+        assert specs[ids[2]].min_value is None
+
+    def test_ttl(self, test_db: Session, test_user: User, tracked_metrics: list):
+        """Test an expired entry is reloaded"""
+        cache = MetricSpecCache(ttl=0)
+        user_id = test_user.id
+
+        first = cache.get(test_db, user_id)
+        second = cache.get(test_db, user_id)
+
+        assert first == second
+        assert first is not second
+
+    def test_load_racing_invalidate_is_not_stored(self, test_db: Session, test_user: User,
+                                                  tracked_metrics: list):
+        """Test definitions loaded before an invalidation are not cached"""
+        cache = MetricSpecCache()
+        user_id = test_user.id
+        load = cache._load
+
+        def racing_load(db, uid):
+            specs = load(db, uid)
+            cache.invalidate(uid)
+            return specs
+
+        cache._load = racing_load
+        cache.get(test_db, user_id)
+        assert len(cache) == 0
+
+        cache._load = load
+        cache.get(test_db, user_id)
+        assert len(cache) == 1
+
+
+class TestEntryValidation:
+    """Tests for entry writes using cached metric definitions"""
+
+    def test_no_metric_queries_when_cached(self, client: TestClient, user_headers: dict,
+                                           tracked_metrics: list, sql_statements: list):
+        """Test saving an entry does not query metrics once they are cached"""
+        today = date.today()
+        first, second = entry(tracked_metrics, today - timedelta(days=2)), entry(tracked_metrics, today)
+
+        client.post("/api/v1/entries", headers=user_headers, json=first)
+        sql_statements.clear()
+        response = client.post("/api/v1/entries", headers=user_headers, json=second)
+
+        assert response.status_code == 201
+        assert not any("FROM metrics" in s for s in sql_statements)
+
+    def test_archived_metric_invalidates(self, client: TestClient, user_headers: dict,
+                                         tracked_metrics: list):
+        """Test archiving a metric through the API is seen by the next save"""
+        payload = entry(tracked_metrics, date.today())
+        metric_id = tracked_metrics[1].id
+
+        client.post("/api/v1/entries", headers=user_headers,
+                    json=entry(tracked_metrics, date.today() - timedelta(days=1)))
+        assert len(metric_spec_cache) == 1
+
+        client.delete(f"/api/v1/metrics/{metric_id}", headers=user_headers)
+        response = client.post("/api/v1/entries", headers=user_headers, json=payload)
+
+        assert response.status_code == 400
+        assert "not found or archived" in response.json()["detail"]
+
+    def test_range_bounds(self, client: TestClient, user_headers: dict, tracked_metrics: list):
+        """Test range validation against cached bounds"""
+        response = client.post("/api/v1/entries", headers=user_headers,
+                               json=entry(tracked_metrics, date.today(), sleep=12.5))
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Value 12.5 above maximum 12"
+
+    def test_invalid_value_writes_nothing(self, client: TestClient, user_headers: dict,
+                                          tracked_metrics: list):
+        """Test a rejected entry leaves no partial rows behind"""
+        client.post("/api/v1/entries", headers=user_headers,
+                    json=entry(tracked_metrics, date.today(), sleep=-1))
+
+        listed = client.get("/api/v1/entries", headers=user_headers).json()
+        assert listed["total"] == 0
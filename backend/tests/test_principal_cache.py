@@ -0,0 +1,106 @@
+"""
+Tests for the authenticated-principal cache
+"""
+import time
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models import User
+from app.security.jwt import create_access_token
+from app.security.principal_cache import Principal, PrincipalCache, principal_cache
+
+
+class TestPrincipalCache:
+    """Unit tests for PrincipalCache"""
+
+    def test_expires_at_token_exp(self):
+        """Entries do not outlive the token"""
+        cache = PrincipalCache(ttl=300)
+        principal = Principal(id=1, deleted=False, language="en", timezone="UTC")
+
+        cache.put("live", principal, expires_at=time.time() + 60)
+        cache.put("expired", principal, expires_at=time.time() - 1)
+
+        assert cache.get("live") == principal
+        assert cache.get("expired") is None
+
+    def test_invalidate_user(self):
+        """All tokens of a user are dropped"""
+        cache = PrincipalCache()
+        cache.put("a", Principal(id=1, deleted=False, language="en", timezone="UTC"))
+        cache.put("b", Principal(id=1, deleted=False, language="en", timezone="UTC"))
+        cache.put("c", Principal(id=2, deleted=False, language="en", timezone="UTC"))
+
+        cache.invalidate_user(1)
+
+        assert cache.get("a") is None and cache.get("b") is None
+        assert cache.get("c") is not None
+
+    def test_bounded(self):
+        """The cache never exceeds max_entries"""
+        cache = PrincipalCache(max_entries=2)
+        for i in range(5):
+            cache.put(str(i), Principal(id=i, deleted=False, language="en", timezone="UTC"))
+
+        assert len(cache) <= 2
+
+
+class TestCachedAuthentication:
+    """Tests for get_current_user with the principal cache"""
+
+    def test_cached_request_skips_user_query(
+        self, client: TestClient, user_headers: dict, tracked_metrics: list, sql_statements: list
+    ):
+        """Only the first request authenticates against the database"""
+        client.get("/api/v1/metrics", headers=user_headers)
+        first = len(sql_statements)
+        sql_statements.clear()
+
+        response = client.get("/api/v1/metrics", headers=user_headers)
+
+        assert response.status_code == 200
+        assert len(sql_statements) == first - 1
+        assert not any("FROM users" in s for s in sql_statements)
+
+    def test_profile_loads_remaining_columns(
+        self, client: TestClient, user_headers: dict, test_user: User
+    ):
+        """Columns outside the principal are loaded on access"""
+        client.get("/api/v1/users/me", headers=user_headers)
+
+        response = client.get("/api/v1/users/me", headers=user_headers)
+
+        assert response.status_code == 200
+        assert response.json()["email"] == test_user.email
+
+    def test_profile_update_invalidates(
+        self, client: TestClient, user_headers: dict, test_user: User
+    ):
+        """Updating the profile drops the cached principal"""
+        client.get("/api/v1/users/me", headers=user_headers)
+        assert len(principal_cache) == 1
+
+        client.patch("/api/v1/users/me", headers=user_headers, json={"language": "pl"})
+
+        assert len(principal_cache) == 0
+        assert client.get("/api/v1/users/me", headers=user_headers).json()["language"] == "pl"
+
+    def test_deleted_account_is_rejected(
+        self, client: TestClient, user_headers: dict, test_db: Session, test_user: User
+    ):
+        """A cached token stops working once the account is deleted"""
+        assert client.get("/api/v1/users/me", headers=user_headers).status_code == 200
+
+        client.delete("/api/v1/users/me", headers=user_headers)
+        test_db.expire_all()
+
+        assert client.get("/api/v1/users/me", headers=user_headers).status_code == 401
+
+    def test_invalid_token_is_not_cached(self, client: TestClient):
+        """Failed authentication leaves the cache empty"""
+        token = create_access_token({"sub": "999"})
+
+        response = client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 401
+        assert len(principal_cache) == 0
@@ -0,0 +1,116 @@
+"""
+Tests for on-demand request profiling
+"""
+import threading
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.main import app as main_app
+from app.middleware.profiling import ProfilingMiddleware
+from app.security.jwt import create_access_token
+from app.utils.sampling_profiler import SamplingProfiler
+
+ADMIN_ID = 42
+
+
+def slow_endpoint():
+    deadline = time.perf_counter() + 0.1
+    while time.perf_counter() < deadline:
+        pass
+    return {"status": "done"}
+
+
+def make_client(tmp_path=None) -> TestClient:
+    app = FastAPI()
+    app.get("/slow")(slow_endpoint)
+    return TestClient(ProfilingMiddleware(
+        app, admin_ids={ADMIN_ID}, interval=0.005,
+        output_dir=str(tmp_path) if tmp_path else ""
+    ))
+
+
+def bearer(user_id: int) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': user_id})}"}
+
+
+class TestSamplingProfiler:
+    """Unit tests for SamplingProfiler"""
+
+    def test_samples_selected_thread(self):
+        """Only stacks accepted by the filter are recorded"""
+        current = threading.get_ident()
+
+        with SamplingProfiler(0.005, lambda ident, frame: ident == current) as profiler:
+            slow_endpoint()
+
+        assert profiler.samples >= 5
+        assert "slow_endpoint (test_profiling.py" in profiler.collapsed()
+        top = profiler.top()
+        assert top[0]["function"].startswith("slow_endpoint")
+        assert top[0]["self"] <= top[0]["total"] <= profiler.samples
+
+    def test_collapsed_format(self):
+        """Each line is a root-first stack and a count"""
+        current = threading.get_ident()
+
+        with SamplingProfiler(0.005, lambda ident, frame: ident == current) as profiler:
+            slow_endpoint()
+
+        for line in profiler.collapsed().splitlines():
+            stack, count = line.rsplit(" ", 1)
+            assert int(count) > 0
+            assert ";" in stack
+
+
+class TestProfilingMiddleware:
+    """Tests for the ?__profile=1 switch"""
+
+    def test_admin_gets_profile(self):
+        """The response is replaced by a report covering the endpoint thread"""
+        response = make_client().get("/slow?__profile=1", headers=bearer(ADMIN_ID))
+
+        assert response.status_code == 200
+        report = response.json()
+        assert report["profile"]["status"] == 200
+        assert report["profile"]["path"] == "/slow"
+        assert report["profile"]["samples"] >= 5
+        assert any(row["function"].startswith("slow_endpoint") for row in report["top"])
+        assert report["file"] is None
+
+    def test_flag_is_ignored_for_other_users(self):
+        """Non-admins and anonymous requests get the normal response"""
+        client = make_client()
+
+        for headers in (bearer(7), {}, {"Authorization": "Bearer not-a-token"}):
+            response = client.get("/slow?__profile=1", headers=headers)
+            assert response.json() == {"status": "done"}
+
+    def test_flag_must_match_exactly(self):
+        """Other parameters starting with __profile do not trigger profiling"""
+        response = make_client().get("/slow?__profile=10", headers=bearer(ADMIN_ID))
+
+        assert response.json() == {"status": "done"}
+
+    def test_collapsed_stacks_are_saved(self, tmp_path):
+        """With an output directory the report points to the saved stacks"""
+        report = make_client(tmp_path).get("/slow?x=1&__profile=1", headers=bearer(ADMIN_ID)).json()
+
+        saved = tmp_path / report["file"].rsplit("/", 1)[1]
+        assert saved.name.endswith(f"-GET-slow-u{ADMIN_ID}.folded")
+        assert saved.read_text() == report["collapsed"]
+
+    def test_profiles_api_routes(self, client: TestClient, test_user, user_headers: dict,
+                                 daily_entries: list):
+        """Reports carry the status of the wrapped route"""
+        profiled = TestClient(ProfilingMiddleware(main_app, admin_ids={test_user.id}))
+
+        response = profiled.get("/api/v1/analytics/statistics?__profile=1", headers=user_headers)
+
+        assert response.status_code == 200
+        assert response.json()["profile"]["status"] == 200
+
+    def test_disabled_by_default(self):
+        """Without PROFILING_ENABLED the middleware is not installed"""
+        assert not any(m.cls is ProfilingMiddleware for m in main_app.user_middleware)
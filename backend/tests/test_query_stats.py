@@ -0,0 +1,91 @@
+"""
+Tests for per-request SQL statistics and query budgets
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models import Entry
+from app.utils.query_stats import QueryStats, _current, start_request, query_count
+from app.utils.telemetry import db_queries_per_request
+
+# Statements each read endpoint may run with a warm principal cache; the
+# first one of most routes loads the user's data version for the ETag
+QUERY_COUNTS = {
+    "/api/v1/users/me": 1,
+    "/api/v1/metrics": 2,
+    "/api/v1/entries?limit=10": 4,
+    "/api/v1/analytics/statistics": 3,
+    "/api/v1/analytics/seasonality": 4,
+}
+
+
+class TestQueryStats:
+    """Unit tests for statement recording"""
+
+    def test_statements_are_recorded_in_context(self, test_db: Session):
+        """Queries count only while a request is being recorded"""
+        test_db.query(Entry).all()
+
+        token = _current.set(None)
+        try:
+            stats = start_request()
+            test_db.query(Entry).all()
+            test_db.query(Entry).count()
+        finally:
+            _current.reset(token)
+        test_db.query(Entry).all()
+
+        assert stats.count == 2
+        assert stats.duration > 0
+        assert len(stats.statements) == 2
+
+    def test_budget_and_repeats(self):
+        """Budget overruns and repeated statements are reported"""
+        stats = QueryStats(count=7)
+        stats.statements["SELECT * FROM users"] = 1
+        stats.statements["SELECT *\n  FROM metrics WHERE id = ?"] = 6
+
+        problems = stats.problems(budget=5, repeat_threshold=5)
+
+        assert problems == [
+            "7 queries (budget 5)",
+            "possible N+1, 6x: SELECT * FROM metrics WHERE id = ?"
+        ]
+        assert stats.problems(budget=None, repeat_threshold=10) == []
+
+    def test_server_timing_round_trip(self):
+        """The header carries DB time and count"""
+        stats = QueryStats(count=4, duration=0.0123)
+
+        assert stats.server_timing() == 'db;dur=12.3;desc="4 queries"'
+        assert query_count(stats.server_timing()) == 4
+        with pytest.raises(ValueError):
+            query_count("app;dur=1")
+
+
+class TestQueryBudgets:
+    """Query counts of read endpoints, to catch N+1 regressions"""
+
+    @pytest.mark.parametrize("url,expected", QUERY_COUNTS.items())
+    def test_read_endpoint_query_count(
+        self, client: TestClient, user_headers: dict, daily_entries: list,
+        test_db: Session, query_count, url: str, expected: int
+    ):
+        """Each endpoint runs a fixed number of statements, whatever the data size"""
+        # Warm the principal cache; requests get a fresh session in production
+        client.get("/api/v1/users/me", headers=user_headers)
+        test_db.expunge_all()
+
+        response = client.get(url, headers=user_headers)
+
+        assert response.status_code == 200
+        assert query_count(response) <= expected
+
+    def test_queries_per_request_metric(
+        self, client: TestClient, user_headers: dict, daily_entries: list
+    ):
+        """Statement counts are exported per route template"""
+        client.get("/api/v1/entries?limit=10", headers=user_headers)
+
+        assert db_queries_per_request.count("GET", "/api/v1/entries") == 1
@@ -0,0 +1,132 @@
+"""
+Tests for the token-bucket rate limiter
+"""
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+
+from app.middleware.rate_limit import (
+    InMemoryBucketStore,
+    RateLimit,
+    RATE_LIMITS,
+    rate_limit_headers
+)
+from app.models import User
+from app.security.jwt import create_access_token
+
+LOGIN = ("POST", "/api/v1/auth/login")
+CORRELATIONS = ("POST", "/api/v1/analytics/correlations")
+
+
+def login(client: TestClient, email: str = "nobody@example.com"):
+    return client.post("/api/v1/auth/login", json={"email": email, "password": "wrongpassword"})
+
+
+class TestTokenBucket:
+    """Unit tests for InMemoryBucketStore"""
+
+    def test_burst_then_refill(self):
+        """Capacity is available at once and refills at capacity / per_seconds"""
+        store = InMemoryBucketStore()
+        limit = RateLimit(capacity=3, per_seconds=30)
+
+        results = [store.take_at("k", limit, now=100.0)[0] for _ in range(4)]
+        assert results == [True, True, True, False]
+
+        # One token every 10 seconds
+        assert store.take_at("k", limit, now=105.0)[0] is False
+        assert store.take_at("k", limit, now=110.5) == (True, pytest.approx(0.05))
+
+    def test_refill_is_capped(self):
+        """Idle buckets do not accumulate more than capacity"""
+        store = InMemoryBucketStore()
+        limit = RateLimit(capacity=2, per_seconds=10)
+        store.take_at("k", limit, now=0.0)
+
+        allowed, tokens = store.take_at("k", limit, now=1000.0)
+
+        assert allowed and tokens == 1
+
+    def test_keys_are_independent(self):
+        """Each key has its own bucket"""
+        store = InMemoryBucketStore()
+        limit = RateLimit(capacity=1, per_seconds=60)
+
+        assert store.take_at("a", limit, now=0.0)[0]
+        assert store.take_at("b", limit, now=0.0)[0]
+        assert not store.take_at("a", limit, now=0.0)[0]
+
+    def test_clear(self):
+        """clear() is a coroutine like RedisBucketStore.clear and empties the store"""
+        store = InMemoryBucketStore()
+        store.take_at("k", RateLimit(capacity=1, per_seconds=60), now=0.0)
+
+        asyncio.run(store.clear())
+
+        assert len(store) == 0
+
+    def test_headers(self):
+        """RateLimit-* headers describe the bucket"""
+        headers = dict(rate_limit_headers(RateLimit(10, 60), tokens=7.5))
+
+        assert headers[b"ratelimit-limit"] == b"10"
+        assert headers[b"ratelimit-remaining"] == b"7"
+        assert headers[b"ratelimit-reset"] == b"15"
+
+
+class TestRateLimitMiddleware:
+    """Tests for rate limiting through the API"""
+
+    def test_login_is_limited_per_ip(self, client: TestClient, monkeypatch):
+        """Requests beyond the burst get 429 with Retry-After"""
+        monkeypatch.setitem(RATE_LIMITS, LOGIN, RateLimit(2, 60, key="ip"))
+
+        responses = [login(client) for _ in range(3)]
+
+        assert [r.status_code for r in responses] == [401, 401, 429]
+        assert responses[0].headers["ratelimit-limit"] == "2"
+        assert responses[0].headers["ratelimit-remaining"] == "1"
+        assert responses[2].headers["retry-after"] == "30"
+        assert responses[2].json()["detail"].startswith("Rate limit exceeded")
+
+    def test_unlimited_routes_have_no_headers(self, client: TestClient):
+        """Only configured routes are limited"""
+        response = client.get("/health")
+
+        assert "ratelimit-limit" not in response.headers
+
+    def test_limits_are_per_user(
+        self, client: TestClient, test_db, test_user: User, user_headers: dict, monkeypatch
+    ):
+        """Authenticated users get separate buckets"""
+        monkeypatch.setitem(RATE_LIMITS, CORRELATIONS, RateLimit(1, 60))
+        other = User(email="other@example.com", password_hash="x")
+        test_db.add(other)
+        test_db.commit()
+        other_headers = {"Authorization": f"Bearer {create_access_token({'sub': other.id})}"}
+
+        # Verify both tokens so the limiter knows their users
+        client.get("/api/v1/users/me", headers=user_headers)
+        client.get("/api/v1/users/me", headers=other_headers)
+
+        first = client.post("/api/v1/analytics/correlations", headers=user_headers, json={})
+        second = client.post("/api/v1/analytics/correlations", headers=user_headers, json={})
+        other_user = client.post("/api/v1/analytics/correlations", headers=other_headers, json={})
+
+        assert first.status_code != 429
+        assert second.status_code == 429
+        assert other_user.status_code != 429
+
+    def test_unverified_tokens_share_the_ip_bucket(self, client: TestClient, monkeypatch):
+        """Made-up tokens cannot be used to get fresh buckets"""
+        monkeypatch.setitem(RATE_LIMITS, CORRELATIONS, RateLimit(1, 60))
+
+        statuses = [
+            client.post(
+                "/api/v1/analytics/correlations",
+                headers={"Authorization": f"Bearer fake-{i}"}, json={}
+            ).status_code
+            for i in range(2)
+        ]
+
+        assert statuses[1] == 429
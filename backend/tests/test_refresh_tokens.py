@@ -0,0 +1,230 @@
+"""
+Tests for refresh-token rotation and revocation
+"""
+import pytest
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from app.models import User
+from app.security.jwt import ALGORITHM, SECRET_KEY, create_refresh_token, verify_token
+from app.security.refresh_tokens import (
+    InMemoryTokenStore,
+    RedisTokenStore,
+    RefreshTokenRegistry,
+    TokenRevokedError
+)
+
+
+class FakeRedis:
+    """The subset of redis.Redis used by RedisTokenStore"""
+
+    def __init__(self):
+        self.data = {}
+        self.lock = threading.Lock()
+
+    def set(self, name, value, nx=False, ex=None):
+        with self.lock:
+            if nx and name in self.data:
+                return None
+            self.data[name] = str(value).encode()
+            return True
+
+    def get(self, name):
+        return self.data.get(name)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def registry(request) -> RefreshTokenRegistry:
+    store = InMemoryTokenStore() if request.param == "memory" else RedisTokenStore(FakeRedis())
+    return RefreshTokenRegistry(store, reuse_grace_seconds=10)
+
+
+def payload(user_id: int = 1, family: str = None) -> dict:
+    return verify_token(create_refresh_token({"sub": user_id}, family=family), token_type="refresh")
+
+
+def login(client: TestClient, user: User) -> dict:
+    response = client.post("/api/v1/auth/login", json={
+        "email": user.email, "password": "testpassword123"
+    })
+    return response.json()["tokens"]
+
+
+def refresh(client: TestClient, token: str):
+    return client.post("/api/v1/auth/refresh", json={"refresh_token": token})
+
+
+class TestRefreshTokenRegistry:
+    """Unit tests for rotation rules"""
+
+    def test_token_can_be_used_once(self, registry: RefreshTokenRegistry):
+        """The second exchange of a token fails"""
+        token = payload()
+
+        assert registry.consume(token) == token["fam"]
+        with pytest.raises(TokenRevokedError):
+            registry.consume(token)
+
+    def test_reuse_within_grace_keeps_family(self, registry: RefreshTokenRegistry):
+        """A racing duplicate refresh does not log the user out"""
+        token = payload()
+        registry.consume(token)
+        successor = payload(family=token["fam"])
+
+        with pytest.raises(TokenRevokedError):
+            registry.consume(token)
+
+        assert registry.consume(successor) == token["fam"]
+
+    def test_reuse_after_grace_revokes_family(self, registry: RefreshTokenRegistry):
+        """Replaying a rotated token revokes its successors"""
+        registry.reuse_grace_seconds = 0
+        token = payload()
+        registry.consume(token)
+        successor = payload(family=token["fam"])
+        time.sleep(0.01)
+
+        with pytest.raises(TokenRevokedError):
+            registry.consume(token)
+        with pytest.raises(TokenRevokedError):
+            registry.consume(successor)
+
+        # Other logins are unaffected
+        assert registry.consume(payload())
+
+    def test_family_revocation_outlives_revoked_token(self, monkeypatch):
+        """Descendants stay revoked after the revoked token itself expired"""
+        clock = [time.time()]
+        monkeypatch.setattr("app.security.refresh_tokens.time.time", lambda: clock[0])
+        registry = RefreshTokenRegistry(InMemoryTokenStore())
+        family = "f" * 32
+        old = {"sub": "1", "jti": "old", "fam": family, "iat": clock[0] - 60, "exp": clock[0] + 60}
+        descendant = {"sub": "1", "jti": "new", "fam": family, "iat": clock[0],
+                      "exp": clock[0] + registry.family_ttl}
+
+        registry.revoke_family(old)
+        clock[0] += 3600
+
+        with pytest.raises(TokenRevokedError):
+            registry.consume(descendant)
+
+    def test_revoke_user(self, registry: RefreshTokenRegistry):
+        """Tokens issued before a user revocation are rejected"""
+        old = payload(user_id=1)
+        other_user = payload(user_id=2)
+
+        registry.revoke_user(1, ttl=60)
+
+        with pytest.raises(TokenRevokedError):
+            registry.consume(old)
+        assert registry.consume(other_user)
+
+    def test_tokens_without_rotation_claims(self, registry: RefreshTokenRegistry):
+        """Tokens issued before rotation existed are accepted once into a new family"""
+        legacy = {"sub": "1", "type": "refresh", "exp": int(time.time()) + 60}
+
+        family = registry.consume(legacy)
+
+        assert family
+        assert family != registry.consume({**legacy, "exp": legacy["exp"] + 1})
+        with pytest.raises(TokenRevokedError):
+            registry.consume(legacy)
+
+    def test_revoke_user_covers_legacy_tokens(self, registry: RefreshTokenRegistry):
+        """Tokens without iat are older than any user revocation"""
+        registry.revoke_user(1, ttl=60)
+
+        with pytest.raises(TokenRevokedError):
+            registry.consume({"sub": "1", "type": "refresh", "exp": int(time.time()) + 60})
+
+    def test_concurrent_refresh_storm(self, registry: RefreshTokenRegistry):
+        """Of many concurrent exchanges of one token exactly one succeeds"""
+        tokens = [payload(user_id=i) for i in range(50)]
+        barrier = threading.Barrier(8)
+
+        def exchange(token):
+            barrier.wait()
+            try:
+                registry.consume(token)
+                return True
+            except TokenRevokedError:
+                return False
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            for token in tokens:
+                results = list(pool.map(exchange, [token] * 8))
+                assert results.count(True) == 1
+
+
+class TestRefreshEndpoint:
+    """Tests for /auth/refresh and /auth/logout"""
+
+    def test_refresh_rotates_token(self, client: TestClient, test_user: User):
+        """A refreshed token is replaced and cannot be exchanged again"""
+        tokens = login(client, test_user)
+
+        first = refresh(client, tokens["refresh_token"])
+        second = refresh(client, first.json()["refresh_token"])
+        replay = refresh(client, tokens["refresh_token"])
+
+        assert first.status_code == 200
+        assert first.json()["refresh_token"] != tokens["refresh_token"]
+        assert second.status_code == 200
+        assert replay.status_code == 401
+
+    def test_rotated_tokens_stay_in_family(self, client: TestClient, test_user: User):
+        """Successor tokens belong to the login's family"""
+        tokens = login(client, test_user)
+        rotated = refresh(client, tokens["refresh_token"]).json()["refresh_token"]
+
+        original = verify_token(tokens["refresh_token"], token_type="refresh")
+        successor = verify_token(rotated, token_type="refresh")
+        assert successor["fam"] == original["fam"]
+        assert successor["jti"] != original["jti"]
+
+    def test_logout_revokes_family(self, client: TestClient, test_user: User):
+        """Logging out invalidates the token and its successors"""
+        tokens = login(client, test_user)
+        rotated = refresh(client, tokens["refresh_token"]).json()["refresh_token"]
+        other_device = login(client, test_user)
+
+        response = client.post("/api/v1/auth/logout", json={"refresh_token": rotated})
+
+        assert response.status_code == 204
+        assert refresh(client, rotated).status_code == 401
+        assert refresh(client, other_device["refresh_token"]).status_code == 200
+
+    def test_account_deletion_revokes_tokens(
+        self, client: TestClient, test_user: User, user_headers: dict
+    ):
+        """Refresh tokens stop working when the account is deleted"""
+        tokens = login(client, test_user)
+
+        client.delete("/api/v1/users/me", headers=user_headers)
+
+        assert refresh(client, tokens["refresh_token"]).status_code == 401
+
+    def test_legacy_token_is_rotated(self, client: TestClient, test_user: User):
+        """A token issued before rotation is exchanged once for a rotating one"""
+        legacy = jwt.encode(
+            {"sub": str(test_user.id), "type": "refresh",
+             "exp": datetime.utcnow() + timedelta(days=1)},
+            SECRET_KEY, algorithm=ALGORITHM
+        )
+
+        response = refresh(client, legacy)
+        rotated = verify_token(response.json()["refresh_token"], token_type="refresh")
+
+        assert response.status_code == 200
+        assert "jti" in rotated and "fam" in rotated
+        assert refresh(client, legacy).status_code == 401
+
+    def test_access_token_is_not_a_refresh_token(self, client: TestClient, test_user: User):
+        """Access tokens cannot be exchanged"""
+        tokens = login(client, test_user)
+
+        assert refresh(client, tokens["access_token"]).status_code == 401
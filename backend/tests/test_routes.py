@@ -0,0 +1,42 @@
+"""
+Tests for route conventions
+"""
+import inspect
+
+from fastapi.dependencies.models import Dependant
+from fastapi.routing import APIRoute
+
+from app.main import app
+from app.utils.database import get_db
+
+
+def blocking_callables(dependant: Dependant) -> list:
+    """
+    Callables in a dependency tree that receive a database session and
+    would run on the event loop
+    """
+    found = []
+    for sub in dependant.dependencies:
+        if any(d.call is get_db for d in sub.dependencies) and inspect.iscoroutinefunction(sub.call):
+            found.append(sub.call.__qualname__)
+        found.extend(blocking_callables(sub))
+    return found
+
+
+class TestRouteConventions:
+    """The Session is synchronous, so DB-bound code must run in the threadpool"""
+
+    def test_db_routes_are_sync(self):
+        """Endpoints and dependencies using get_db are plain functions"""
+        offenders = []
+        for route in app.routes:
+            if not isinstance(route, APIRoute):
+                continue
+            offenders.extend(
+                f"{route.path}: {name}" for name in blocking_callables(route.dependant)
+            )
+            uses_db = any(d.call is get_db for d in route.dependant.dependencies)
+            if uses_db and inspect.iscoroutinefunction(route.endpoint):
+                offenders.append(f"{route.path}: {route.endpoint.__qualname__}")
+
+        assert offenders == []
@@ -0,0 +1,113 @@
+"""
+Unit tests for seasonality profiles
+"""
+import pytest
+import numpy as np
+from datetime import timedelta
+from fastapi.testclient import TestClient
+
+from app.analytics.seasonality import weekday_index, month_index, grouped_means, autocorrelation
+from app.analytics.cache import analytics_cache
+
+
+class TestSeasonalityFunctions:
+    """Tests for grouped reductions and autocorrelation"""
+
+    def test_weekday_and_month_index(self):
+        """Test calendar indices against the datetime module"""
+        dates = np.arange(np.datetime64('2024-01-01'), np.datetime64('2024-12-31'))
+
+        weekdays = weekday_index(dates)
+        months = month_index(dates)
+
+        for d, wd, m in zip(dates.astype(object), weekdays, months):
+            assert wd == d.weekday()
+            assert m == d.month - 1
+
+    def test_grouped_means_matches_loop(self):
+        """Test bincount reduction against a per-group loop"""
+        rng = np.random.default_rng(1)
+        values = rng.normal(size=(50, 3))
+        values[rng.random((50, 3)) < 0.2] = np.nan
+        groups = np.arange(50) % 7
+
+        counts, means = grouped_means(values, groups, 7)
+
+        for g in range(7):
+            for col in range(3):
+                column = values[groups == g, col]
+                column = column[~np.isnan(column)]
+                assert counts[g, col] == len(column)
+                assert means[g, col] == pytest.approx(column.mean())
+
+    def test_autocorrelation_matches_direct_computation(self):
+        """Test FFT autocorrelation against a direct lagged computation"""
+        rng = np.random.default_rng(2)
+        x = np.sin(np.arange(70) * 2 * np.pi / 7) + rng.normal(0, 0.1, 70)
+        x[[3, 10, 40]] = np.nan
+
+        acf = autocorrelation(x[:, None], max_lag=7)
+
+        centered = x - np.nanmean(x)
+        def lagged(k):
+            a, b = centered[:len(x) - k], centered[k:]
+            mask = ~np.isnan(a) & ~np.isnan(b)
+            return np.mean(a[mask] * b[mask])
+
+        for k in range(8):
+            assert acf[k, 0] == pytest.approx(lagged(k) / lagged(0))
+        assert acf[7, 0] > 0.9  # Strong weekly rhythm
+
+    def test_autocorrelation_all_missing(self):
+        """Test that an empty column yields NaN"""
+        acf = autocorrelation(np.full((20, 1), np.nan), max_lag=7)
+
+        assert np.all(np.isnan(acf))
+
+
+class TestSeasonalityAPI:
+    """Tests for the /analytics/seasonality endpoint"""
+
+    def test_seasonality_profiles(self, client: TestClient, user_headers: dict,
+                                  tracked_metrics: list, daily_entries: list):
+        """Test weekday profile reflects longer weekend sleep"""
+        sleep = tracked_metrics[0]
+
+        response = client.get(
+            f"/api/v1/analytics/seasonality?metric_ids={sleep.id}",
+            headers=user_headers
+        )
+
+        assert response.status_code == 200
+        [profile] = response.json()["profiles"]
+        assert len(profile["weekday_means"]) == 7
+        assert len(profile["month_means"]) == 12
+        assert sum(profile["weekday_counts"]) == len(daily_entries)
+        assert sum(profile["month_counts"]) == len(daily_entries)
+        assert min(profile["weekday_means"][5:]) > max(profile["weekday_means"][:5])
+
+    def test_seasonality_cached_until_data_changes(self, client: TestClient, user_headers: dict,
+                                                   tracked_metrics: list,
+                                                   daily_entries: list):
+        """Test results are cached and invalidated by new data"""
+        first = client.get("/api/v1/analytics/seasonality", headers=user_headers).json()
+        assert len(analytics_cache) == 1
+
+        assert client.get("/api/v1/analytics/seasonality", headers=user_headers).json() == first
+        assert len(analytics_cache) == 1
+
+        response = client.post("/api/v1/entries", headers=user_headers, json={
+            "entry_date": str(daily_entries[0].entry_date - timedelta(days=1)),
+            "values": [{"metric_id": tracked_metrics[0].id, "value": 12}]
+        })
+        assert response.status_code == 201
+
+        second = client.get("/api/v1/analytics/seasonality", headers=user_headers).json()
+        assert len(analytics_cache) == 2
+        assert second != first
+
+    def test_seasonality_invalid_metric_ids(self, client: TestClient, user_headers: dict):
+        """Test malformed metric_ids"""
+        response = client.get("/api/v1/analytics/seasonality?metric_ids=a,b", headers=user_headers)
+
+        assert response.status_code == 400
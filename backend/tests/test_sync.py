@@ -0,0 +1,177 @@
+"""
+Tests for the delta sync endpoints
+"""
+import pytest
+from datetime import date, datetime, timedelta, timezone
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models import User, Entry, Metric, Tombstone
+from app.services import DataVersionService, EntryService, MetricService
+
+
+@pytest.fixture
+def aged_data(test_db: Session, tracked_metrics: list, daily_entries: list) -> datetime:
+    """
+    Backdate all fixture rows by a day and return a cursor after them.
+    """
+    yesterday = datetime.now(timezone.utc) - timedelta(days=1)
+    test_db.query(Entry).update({Entry.updated_at: yesterday}, synchronize_session=False)
+    test_db.query(Metric).update({Metric.updated_at: yesterday}, synchronize_session=False)
+    test_db.commit()
+    return datetime.now(timezone.utc) - timedelta(hours=1)
+
+
+def sync(client: TestClient, headers: dict, since: datetime = None) -> dict:
+    params = {"since": since.isoformat()} if since else {}
+    response = client.get("/api/v1/sync", headers=headers, params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+class TestSyncChanges:
+    """Tests for GET /sync"""
+
+    def test_full_snapshot(self, client: TestClient, user_headers: dict,
+                           tracked_metrics: list, daily_entries: list):
+        """Test sync without cursor returns everything"""
+        data = sync(client, user_headers)
+
+        assert data["reset"] is True
+        assert len(data["metrics"]) == len(tracked_metrics)
+        assert len(data["entries"]) == len(daily_entries)
+        assert data["deleted"] == []
+        assert data["next_cursor"]
+
+    def test_no_changes(self, client: TestClient, user_headers: dict, aged_data: datetime):
+        """Test an up-to-date client receives nothing"""
+        data = sync(client, user_headers, aged_data)
+
+        assert data["reset"] is False
+        assert data["metrics"] == data["entries"] == data["deleted"] == []
+
+    def test_changed_entry(self, client: TestClient, user_headers: dict,
+                           tracked_metrics: list, daily_entries: list, aged_data: datetime):
+        """Test replacing an entry's values marks only that entry changed"""
+        entry = daily_entries[10]
+        client.patch(f"/api/v1/entries/{entry.id}", headers=user_headers, json={
+            "values": [{"metric_id": tracked_metrics[0].id, "value": 9}]
+        })
+
+        data = sync(client, user_headers, aged_data)
+
+        assert [e["id"] for e in data["entries"]] == [entry.id]
+        assert len(data["entries"][0]["values"]) == 1
+        assert data["metrics"] == []
+
+    def test_deletions_have_tombstones(self, client: TestClient, user_headers: dict,
+                                       test_db: Session, tracked_metrics: list,
+                                       daily_entries: list, aged_data: datetime):
+        """Test deleted entries and metrics are reported"""
+        entry_id, entry_date = daily_entries[0].id, daily_entries[0].entry_date
+        metric_id = tracked_metrics[3].id
+        client.delete(f"/api/v1/entries/{entry_id}", headers=user_headers)
+        MetricService.delete_metric(test_db, tracked_metrics[3])
+
+        data = sync(client, user_headers, aged_data)
+
+        assert [(t["entity_type"], t["entity_id"]) for t in data["deleted"]] == [
+            ("entry", entry_id), ("metric", metric_id)
+        ]
+        assert data["deleted"][0]["entry_date"] == str(entry_date)
+
+    def test_archived_metric_is_changed(self, client: TestClient, user_headers: dict,
+                                        tracked_metrics: list, aged_data: datetime):
+        """Test archiving a metric reports it as changed"""
+        metric_id = tracked_metrics[1].id
+        client.delete(f"/api/v1/metrics/{metric_id}", headers=user_headers)
+
+        data = sync(client, user_headers, aged_data)
+
+        assert [(m["id"], m["archived"]) for m in data["metrics"]] == [(metric_id, True)]
+
+    def test_expired_cursor_resets(self, client: TestClient, user_headers: dict,
+                                   daily_entries: list):
+        """Test a cursor older than the tombstone retention forces a full snapshot"""
+        data = sync(client, user_headers, datetime.now(timezone.utc) - timedelta(days=3650))
+
+        assert data["reset"] is True
+        assert len(data["entries"]) == len(daily_entries)
+
+    def test_future_cursor_rejected(self, client: TestClient, user_headers: dict):
+        """Test a cursor ahead of the server clock is not echoed back"""
+        since = datetime.now(timezone.utc) + timedelta(days=1)
+
+        response = client.get("/api/v1/sync", headers=user_headers,
+                              params={"since": since.isoformat()})
+
+        assert response.status_code == 400
+
+
+class TestSyncUpload:
+    """Tests for POST /sync"""
+
+    def test_batch_upload(self, client: TestClient, test_db: Session, test_user: User,
+                          user_headers: dict, tracked_metrics: list, daily_entries: list):
+        """Test upserts and deletions by date with per-item errors"""
+        user_id = test_user.id
+        version = DataVersionService.get(test_db, user_id)
+        sleep = tracked_metrics[0].id
+        new_date = daily_entries[0].entry_date - timedelta(days=1)
+
+        response = client.post("/api/v1/sync", headers=user_headers, json={
+            "entries": [
+                {"entry_date": str(new_date), "values": [{"metric_id": sleep, "value": 6}]},
+                {"entry_date": str(daily_entries[5].entry_date), "notes": "edited offline",
+                 "values": [{"metric_id": sleep, "value": 5}]},
+                {"entry_date": str(daily_entries[6].entry_date),
+                 "values": [{"metric_id": 999999, "value": 5}]},
+            ],
+            "deleted_entries": [str(daily_entries[7].entry_date), "2000-01-01"]
+        })
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["status"] for r in results] == ["created", "updated", "error", "deleted", "not_found"]
+        assert results[0]["entry_id"] is not None
+
+        test_db.expire_all()
+        updated = test_db.get(Entry, daily_entries[5].id)
+        assert updated.notes == "edited offline"
+        assert [v.value_numeric for v in updated.values] == [5]
+        assert len(test_db.get(Entry, daily_entries[6].id).values) == 4
+        assert test_db.get(Entry, daily_entries[7].id) is None
+        assert test_db.query(Tombstone).filter(Tombstone.entity_id == daily_entries[7].id).count() == 1
+        assert DataVersionService.get(test_db, user_id) == version + 1
+
+    def test_concurrent_create_conflicts(self, client: TestClient, test_db: Session,
+                                         test_user: User, user_headers: dict,
+                                         tracked_metrics: list, monkeypatch):
+        """Test an entry created between lookup and insert gives 409, not 500"""
+        user_id = test_user.id
+        entry_date = date(2024, 3, 1)
+        build_values = EntryService._build_values
+
+        def racing_build_values(*args, **kwargs):
+            # Another request inserts the same date after the existing-entry lookup
+            test_db.execute(Entry.__table__.insert().values(user_id=user_id, entry_date=entry_date))
+            return build_values(*args, **kwargs)
+
+        monkeypatch.setattr(EntryService, "_build_values", staticmethod(racing_build_values))
+        response = client.post("/api/v1/sync", headers=user_headers, json={"entries": [
+            {"entry_date": str(entry_date), "values": [{"metric_id": tracked_metrics[0].id, "value": 7}]}
+        ]})
+
+        assert response.status_code == 409
+        assert test_db.query(Entry).filter(Entry.user_id == user_id).count() == 0
+
+    def test_duplicate_dates_rejected(self, client: TestClient, user_headers: dict,
+                                      tracked_metrics: list):
+        """Test the same date twice in one batch"""
+        item = {"entry_date": str(date(2024, 3, 1)),
+                "values": [{"metric_id": tracked_metrics[0].id, "value": 7}]}
+
+        response = client.post("/api/v1/sync", headers=user_headers,
+                               json={"entries": [item, item]})
+
+        assert [r["status"] for r in response.json()["results"]] == ["created", "error"]
@@ -0,0 +1,139 @@
+"""
+Tests for request metrics and the /metrics endpoint
+"""
+from fastapi.testclient import TestClient
+
+from app.middleware.rate_limit import RATE_LIMITS, RateLimit
+from app.utils.telemetry import (
+    MetricsRegistry,
+    analytics_cache_requests_total,
+    analytics_duration_seconds,
+    analytics_matrix_load_seconds,
+    http_request_duration_seconds,
+    http_requests_total
+)
+
+
+class TestRegistry:
+    """Tests for the text exposition format"""
+
+    def test_counter(self):
+        """Counters render one sample per label set"""
+        registry = MetricsRegistry()
+        counter = registry.counter("requests_total", "Requests", ("status",))
+        counter.inc("200")
+        counter.inc("200")
+        counter.inc("500", amount=3)
+
+        text = registry.render()
+
+        assert "# TYPE requests_total counter" in text
+        assert 'requests_total{status="200"} 2' in text
+        assert 'requests_total{status="500"} 3' in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Samples fall into the first bucket whose bound is >= the value"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+
+        lines = registry.render().splitlines()
+
+        assert 'latency_seconds_bucket{le="0.1"} 2' in lines
+        assert 'latency_seconds_bucket{le="1"} 3' in lines
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in lines
+        assert "latency_seconds_sum 2.65" in lines
+        assert "latency_seconds_count 4" in lines
+
+    def test_label_values_are_escaped(self):
+        """Quotes and backslashes cannot break the format"""
+        registry = MetricsRegistry()
+        registry.counter("c", "C", ("path",)).inc('a"b\\c')
+
+        assert 'c{path="a\\"b\\\\c"} 1' in registry.render()
+
+    def test_gauge_reads_callback(self):
+        """Gauges are read at render time and skipped when unavailable"""
+        registry = MetricsRegistry()
+        values = {"pool": 3}
+        registry.gauge("pool", "Pool", lambda: values["pool"])
+        registry.gauge("missing", "Missing", lambda: None)
+
+        assert "pool 3" in registry.render()
+        values["pool"] = 5
+        text = registry.render()
+        assert "pool 5" in text
+        assert "\nmissing " not in text
+
+
+class TestMetricsMiddleware:
+    """Tests for per-route request metrics"""
+
+    def test_requests_are_labelled_by_route_template(
+        self, client: TestClient, user_headers: dict
+    ):
+        """Path parameters do not create new series"""
+        for entry_id in (1, 2, 3):
+            client.get(f"/api/v1/entries/{entry_id}", headers=user_headers)
+
+        assert http_requests_total.value("GET", "/api/v1/entries/{entry_id}", "404") == 3
+        assert http_request_duration_seconds.count("GET", "/api/v1/entries/{entry_id}") == 3
+
+    def test_unknown_paths_share_one_label(self, client: TestClient):
+        """Unrouted requests are grouped together"""
+        client.get("/does-not-exist")
+        client.get("/also-missing")
+
+        assert http_requests_total.value("GET", "unmatched", "404") == 2
+
+    def test_rate_limited_requests_keep_their_route(self, client: TestClient, monkeypatch):
+        """429s answered before routing are labelled with the limited route"""
+        monkeypatch.setitem(RATE_LIMITS, ("POST", "/api/v1/auth/login"), RateLimit(1, 60, key="ip"))
+        credentials = {"email": "nobody@example.com", "password": "wrongpassword"}
+
+        client.post("/api/v1/auth/login", json=credentials)
+        client.post("/api/v1/auth/login", json=credentials)
+
+        assert http_requests_total.value("POST", "/api/v1/auth/login", "401") == 1
+        assert http_requests_total.value("POST", "/api/v1/auth/login", "429") == 1
+        assert http_requests_total.value("POST", "unmatched", "429") == 0
+
+    def test_metrics_endpoint(self, client: TestClient):
+        """The endpoint serves the text format including DB pool gauges"""
+        client.get("/health")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'feelink_http_requests_total{method="GET",route="/health",status="200"} 1' in response.text
+        assert "# TYPE feelink_db_pool_checked_out gauge" in response.text
+        assert "feelink_password_hash_pending" in response.text
+
+
+class TestAnalyticsMetrics:
+    """Tests for analytics timings"""
+
+    def test_correlations_are_timed(
+        self, client: TestClient, user_headers: dict, daily_entries: list
+    ):
+        """Analytics operations and matrix loads are observed"""
+        response = client.post(
+            "/api/v1/analytics/correlations", json={"max_lag": 0}, headers=user_headers
+        )
+
+        assert response.status_code == 200
+        assert analytics_duration_seconds.count("correlations") == 1
+        assert analytics_matrix_load_seconds.count() == 1
+
+    def test_cache_hits_are_counted(
+        self, client: TestClient, user_headers: dict, daily_entries: list
+    ):
+        """Cached seasonality results are not timed as computations"""
+        for _ in range(2):
+            client.get("/api/v1/analytics/seasonality", headers=user_headers)
+
+        assert analytics_cache_requests_total.value("miss") == 1
+        assert analytics_cache_requests_total.value("hit") == 1
+        assert analytics_duration_seconds.count("seasonality") == 1
@@ -41,6 +41,26 @@ api.interceptors.request.use(
   (error) => Promise.reject(error)
 );
 
+// Refresh tokens are single-use: concurrent 401s share one refresh call
+let refreshInFlight: Promise<string> | null = null;
+
+function refreshAccessToken(refreshToken: string): Promise<string> {
+  if (!refreshInFlight) {
+    refreshInFlight = axios
+      .post(`${API_URL}/api/v1/auth/refresh`, { refresh_token: refreshToken })
+      .then((response) => {
+        const { access_token, refresh_token: newRefreshToken } = response.data;
+        localStorage.setItem('access_token', access_token);
+        localStorage.setItem('refresh_token', newRefreshToken);
+        return access_token as string;
+      })
+      .finally(() => {
+        refreshInFlight = null;
+      });
+  }
+  return refreshInFlight;
+}
+
 // Response interceptor - handle token refresh
 api.interceptors.response.use(
   (response) => response,
@@ -54,13 +74,7 @@ api.interceptors.response.use(
       try {
         const refreshToken = localStorage.getItem('refresh_token');
         if (refreshToken) {
-          const response = await axios.post(`${API_URL}/api/v1/auth/refresh`, {
-            refresh_token: refreshToken,
-          });
-
-          const { access_token, refresh_token: newRefreshToken } = response.data;
-          localStorage.setItem('access_token', access_token);
-          localStorage.setItem('refresh_token', newRefreshToken);
+          const access_token = await refreshAccessToken(refreshToken);
 
           originalRequest.headers.Authorization = `Bearer ${access_token}`;
           return api(originalRequest);
@@ -95,8 +109,13 @@ export const authApi = {
     api.post('/api/v1/auth/refresh', { refresh_token: refreshToken }),
 
   logout: () => {
+    const refreshToken = localStorage.getItem('refresh_token');
     localStorage.removeItem('access_token');
     localStorage.removeItem('refresh_token');
+    // Revoke the token server-side; signing out locally does not wait for it
+    if (refreshToken) {
+      api.post('/api/v1/auth/logout', { refresh_token: refreshToken }).catch(() => {});
+    }
   },
 };
 
@@ -126,7 +145,7 @@ export const metricsApi = {
 
 // Entries API
 export const entriesApi = {
-  list: (params?: { date_from?: string; date_to?: string; limit?: number; offset?: number }) =>
+  list: (params?: { date_from?: string; date_to?: string; limit?: number; cursor?: string; offset?: number }) =>
     api.get('/api/v1/entries', { params }),
 
   create: (data: any) => api.post('/api/v1/entries', data),
@@ -145,7 +145,8 @@ export const authActions = {
 
   // Logout user
   logout() {
-    // Clear local storage and auth state
+    // Revoke the refresh token, clear local storage and auth state
+    authApi.logout();
     localStorage.removeItem('access_token');
     localStorage.removeItem('refresh_token');
 